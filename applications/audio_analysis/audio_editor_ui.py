@@ -944,8 +944,9 @@ class AudioEditorMainWindow(QMainWindow):
         """更新重构音频"""
         if self.frequency_components and self.frequency_analyzer:
             try:
-                # 重构音频 - 不传递参数，使用默认时长
-                self.reconstructed_audio = self.frequency_analyzer.reconstruct_audio()
+                # 重构音频 - 使用默认时长；分量集合不变时只增量更新变化的分量
+                # 编辑器会一直持有结果，取副本而不是分析器下次重构时原地更新的内部缓存
+                self.reconstructed_audio = self.frequency_analyzer.reconstruct_audio(copy=True)
 
                 print(f"重构音频成功: {len(self.reconstructed_audio)} 样本")
 
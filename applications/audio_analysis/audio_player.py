@@ -4,13 +4,20 @@
 负责音频的播放、暂停、停止等控制功能
 """
 
+import os
+import sys
 import numpy as np
 import sounddevice as sd
-import threading
-import time
 from typing import Optional, Callable
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QMetaObject, Qt
 
+try:
+    from audio_common import OutputStreamManager
+except ImportError:
+    # 以脚本方式运行时applications目录不在搜索路径中
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from audio_common import OutputStreamManager
+
 class AudioPlayer(QObject):
     """音频播放器 - 支持原始音频和重构音频的播放控制"""
     
@@ -35,8 +42,20 @@ class AudioPlayer(QObject):
         self.current_audio = None
         self.current_position = 0.0
         self.total_duration = 0.0
-        self.playback_thread = None
-        self.stop_event = threading.Event()
+        
+        # 播放缓冲与读取位置，由共享输出流的回调消费
+        self._buffer = None
+        self._read_frame = 0          # 回调已消费的帧数，即实际播放位置
+        self._reached_end = False
+        self._seek_request = (0, 0)   # (序号, 目标帧)，由主线程发布
+        self._seek_applied = 0        # 回调已处理的跳转序号
+        self._output = None
+        
+        # 增益：主线程设置目标音量，回调在块内线性过渡，避免咔嗒声
+        self._volume = 1.0
+        self._gain = 1.0              # 回调上一块结束时的增益
+        self._ramp = np.zeros(0, dtype=np.float32)
+        self._gain_buffer = np.zeros(0, dtype=np.float32)
         
         # 位置更新定时器
         self.position_timer = QTimer()
@@ -72,6 +91,8 @@ class AudioPlayer(QObject):
             audio_data: 音频数据
         """
         self.current_audio = audio_data.copy()
+        # 加载时一次性转换为输出格式，播放和跳转不再复制整段音频
+        self._buffer = np.clip(self.current_audio, -1.0, 1.0).astype(np.float32)
         self.total_duration = len(audio_data) / self.sample_rate
         self.current_position = 0.0
         
@@ -92,14 +113,22 @@ class AudioPlayer(QObject):
             self.stop()
         
         self.current_position = start_position
+        self._read_frame = int(start_position * self.sample_rate)
+        self._seek_applied = self._seek_request[0]  # 忽略尚未处理的旧跳转
+        self._reached_end = False
+        self._gain = self._volume
+        
+        try:
+            # 挂接到常驻输出流，下一个回调周期即开始发声
+            if self._output is None:
+                self._output = OutputStreamManager.get(self.sample_rate, device=self.output_device)
+            self._output.attach(self._audio_callback, self._on_replaced)
+        except Exception as e:
+            print(f"❌ 播放错误: {e}")
+            return
+        
         self.is_playing = True
         self.is_paused = False
-        self.stop_event.clear()
-        
-        # 启动播放线程
-        self.playback_thread = threading.Thread(target=self._playback_worker)
-        self.playback_thread.daemon = True
-        self.playback_thread.start()
         
         # 启动位置更新定时器
         self.position_timer.start()
@@ -108,7 +137,7 @@ class AudioPlayer(QObject):
         print(f"▶️  开始播放，从 {start_position:.2f} 秒开始")
     
     def pause(self):
-        """暂停播放"""
+        """暂停播放 - 输出流保持运行，回调淡出后输出静音并保持读取位置"""
         if self.is_playing and not self.is_paused:
             self.is_paused = True
             # 使用QMetaObject.invokeMethod确保在主线程中停止定时器
@@ -130,13 +159,9 @@ class AudioPlayer(QObject):
         if self.is_playing:
             self.is_playing = False
             self.is_paused = False
-            self.stop_event.set()
+            self._output.detach(self._audio_callback)
             # 使用QMetaObject.invokeMethod确保在主线程中停止定时器
             QMetaObject.invokeMethod(self.position_timer, "stop", Qt.ConnectionType.QueuedConnection)
-
-            # 等待播放线程结束
-            if self.playback_thread and self.playback_thread.is_alive():
-                self.playback_thread.join(timeout=1.0)
             
             self.current_position = 0.0
             self.playback_stopped.emit()
@@ -146,6 +171,8 @@ class AudioPlayer(QObject):
         """
         跳转到指定位置
         
+        播放中只移动回调的读取位置，输出流不中断，下一个回调块即从新位置开始。
+        
         Args:
             position: 目标位置 (秒)
         """
@@ -154,14 +181,13 @@ class AudioPlayer(QObject):
         
         position = max(0.0, min(position, self.total_duration))
         
-        was_playing = self.is_playing
-        if was_playing:
-            self.stop()
+        if self.is_playing:
+            serial = self._seek_request[0] + 1
+            self._seek_request = (serial, int(position * self.sample_rate))
+            self._reached_end = False
         
         self.current_position = position
-        
-        if was_playing:
-            self.play(position)
+        self.position_changed.emit(position)
         
         print(f"⏭️  跳转到 {position:.2f} 秒")
     
@@ -169,66 +195,95 @@ class AudioPlayer(QObject):
         """
         设置音量
         
+        在下一个回调块内平滑过渡到新音量，不修改音频数据。
+        
         Args:
             volume: 音量 (0.0-1.0)
         """
         volume = max(0.0, min(1.0, volume))
-        if self.current_audio is not None:
-            # 这里可以实现音量控制逻辑
-            pass
+        self._volume = volume
         print(f"🔊 音量设置为 {volume:.1%}")
     
-    def _playback_worker(self):
-        """播放工作线程"""
-        try:
-            # 计算开始样本位置
-            start_sample = int(self.current_position * self.sample_rate)
-            audio_to_play = self.current_audio[start_sample:]
-            
-            if len(audio_to_play) == 0:
-                return
-            
-            # 确保音频数据在有效范围内
-            audio_to_play = np.clip(audio_to_play, -1.0, 1.0)
-            
-            # 播放音频
-            sd.play(audio_to_play, samplerate=self.sample_rate, device=self.output_device)
-            
-            # 等待播放完成或停止信号
-            while sd.get_stream().active and not self.stop_event.is_set():
-                if not self.is_paused:
-                    time.sleep(0.01)
-                else:
-                    # 暂停时停止当前播放
-                    sd.stop()
-                    break
-            
-            # 播放完成
-            if not self.stop_event.is_set():
-                self.is_playing = False
-                self.current_position = 0.0
-                # 使用QMetaObject.invokeMethod确保在主线程中停止定时器
-                QMetaObject.invokeMethod(self.position_timer, "stop", Qt.ConnectionType.QueuedConnection)
-                self.playback_stopped.emit()
-                
-        except Exception as e:
-            print(f"❌ 播放错误: {e}")
-            self.is_playing = False
-            self.playback_stopped.emit()
+    def _audio_callback(self, outdata, frames, time, status):
+        """
+        输出流回调 - 从读取位置复制下一块音频
+        
+        Args:
+            outdata: 输出缓冲区
+            frames: 要填充的帧数
+            time: 时间戳
+            status: 状态标志
+        """
+        out = outdata[:, 0]
+        gain_start = self._gain
+        gain_end = 0.0 if self.is_paused else self._volume
+        if self.is_paused and gain_start == 0.0:
+            # 暂停且已淡出：输出静音，读取位置保持不变
+            out.fill(0)
+            return
+        
+        start = self._read_frame
+        serial, target = self._seek_request
+        if serial != self._seek_applied:
+            self._seek_applied = serial
+            start = target
+        chunk = self._buffer[start:start + frames]
+        count = len(chunk)
+        out[:count] = chunk
+        out[count:] = 0
+        self._read_frame = start + count
+        if count < frames:
+            self._reached_end = True
+        
+        self._apply_gain(out, gain_start, gain_end)
+        self._gain = gain_end
+    
+    def _apply_gain(self, out: np.ndarray, gain_start: float, gain_end: float):
+        """
+        在输出块上原地应用增益，增益变化时在块内线性过渡
+        
+        Args:
+            out: 输出块
+            gain_start: 块起始增益
+            gain_end: 块结束增益
+        """
+        if gain_start == gain_end:
+            if gain_end != 1.0:
+                out *= gain_end
+            return
+        
+        frames = len(out)
+        if len(self._ramp) != frames:
+            # 块大小变化时才重新分配
+            self._ramp = np.arange(1, frames + 1, dtype=np.float32) / frames
+            self._gain_buffer = np.empty(frames, dtype=np.float32)
+        np.multiply(self._ramp, gain_end - gain_start, out=self._gain_buffer)
+        self._gain_buffer += gain_start
+        out *= self._gain_buffer
+    
+    def _on_replaced(self):
+        """共享输出流被其他播放方占用时停止本播放器"""
+        self.stop()
+    
+    def _finish_playback(self):
+        """播放到结尾后的状态复位"""
+        self._output.detach(self._audio_callback)
+        self.is_playing = False
+        self.is_paused = False
+        self.current_position = 0.0
+        self.position_timer.stop()
+        self.playback_stopped.emit()
     
     def _update_position(self):
         """更新播放位置"""
         if self.is_playing and not self.is_paused:
-            # 估算当前播放位置
-            if hasattr(sd, 'get_stream') and sd.get_stream().active:
-                # 这里可以实现更精确的位置计算
-                self.current_position += 0.1  # 简单的时间递增
-                
-                if self.current_position >= self.total_duration:
-                    self.current_position = self.total_duration
-                    self.stop()
-                
-                self.position_changed.emit(self.current_position)
+            if self._reached_end:
+                self._finish_playback()
+                return
+            
+            # 按回调实际消费的帧数计算位置，不随定时器抖动累积误差
+            self.current_position = min(self._read_frame / self.sample_rate, self.total_duration)
+            self.position_changed.emit(self.current_position)
     
     def get_playback_info(self) -> dict:
         """
@@ -7,8 +7,111 @@
 import numpy as np
 import librosa
 import soundfile as sf
-from typing import Tuple, Optional, Union
+from scipy import signal
+from scipy.io import wavfile
+from math import gcd
+from typing import Tuple, Optional, Union, Iterator
 import os
+import sys
+
+try:
+    from audio_common.period_table import PeriodTable
+except ImportError:
+    # 以脚本方式运行时applications目录不在搜索路径中
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from audio_common.period_table import PeriodTable
+
+class StreamingResampler:
+    """流式多相重采样器 - 逐块输入，输出与整段重采样一致"""
+    
+    def __init__(self, orig_sr: int, target_sr: int, block_size: int = 16384):
+        """
+        初始化重采样器
+        
+        Args:
+            orig_sr: 原始采样率
+            target_sr: 目标采样率
+            block_size: 每次向量化计算的输出点数
+        """
+        divisor = gcd(int(orig_sr), int(target_sr))
+        self.up = int(target_sr) // divisor
+        self.down = int(orig_sr) // divisor
+        self.block_size = block_size
+        
+        # 与scipy.signal.resample_poly相同的Kaiser窗低通滤波器
+        max_rate = max(self.up, self.down)
+        half_len = 10 * max_rate
+        taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0)) * self.up
+        self._delay = half_len
+        # 多相分解：第p相的第k个系数为 taps[p + k*up]
+        self._num_phase_taps = -(-len(taps) // self.up)
+        padded = np.zeros(self._num_phase_taps * self.up)
+        padded[:len(taps)] = taps
+        self._phases = padded.reshape(self._num_phase_taps, self.up).T.astype(np.float32)
+        
+        self._buffer = None       # 尚需保留的输入样本
+        self._buffer_start = 0    # 缓冲区第一个样本的输入序号
+        self._input_count = 0     # 已输入的样本总数
+        self._output_count = 0    # 已输出的样本总数
+    
+    def process(self, chunk: np.ndarray, last: bool = False) -> np.ndarray:
+        """
+        输入一块音频，返回当前可以确定的输出
+        
+        Args:
+            chunk: 输入音频，形状为 (样本数,) 或 (样本数, 声道数)
+            last: 是否为最后一块，为True时输出剩余的全部样本
+            
+        Returns:
+            重采样后的音频
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        if self._buffer is None:
+            self._buffer = chunk[:0]
+        self._buffer = np.concatenate([self._buffer, chunk])
+        self._input_count += len(chunk)
+        
+        if last:
+            # 末尾补零，使最后的输出所需的输入全部可用
+            total = -(-self._input_count * self.up // self.down)
+            tail = np.zeros((self._num_phase_taps + self._delay // self.up + 1,) + chunk.shape[1:], dtype=np.float32)
+            self._buffer = np.concatenate([self._buffer, tail])
+        else:
+            # 输出n需要的最新输入为 (n*down + delay) // up
+            total = (self._input_count * self.up - self._delay - 1) // self.down + 1
+        total = max(total, self._output_count)
+        
+        blocks = []
+        while self._output_count < total:
+            count = min(self.block_size, total - self._output_count)
+            blocks.append(self._compute(self._output_count, count))
+            self._output_count += count
+        
+        # 丢弃之后不再需要的输入
+        first_needed = (self._output_count * self.down + self._delay) // self.up - self._num_phase_taps + 1
+        drop = min(max(0, first_needed - self._buffer_start), len(self._buffer))
+        self._buffer = self._buffer[drop:]
+        self._buffer_start += drop
+        
+        if not blocks:
+            return np.zeros((0,) + chunk.shape[1:], dtype=np.float32)
+        return np.concatenate(blocks)
+    
+    def _compute(self, start: int, count: int) -> np.ndarray:
+        """计算输出序号 [start, start+count) 的样本"""
+        positions = np.arange(start, start + count) * self.down + self._delay
+        base = positions // self.up - self._buffer_start
+        phase = positions % self.up
+        output = np.zeros((count,) + self._buffer.shape[1:], dtype=np.float32)
+        for k in range(self._num_phase_taps):
+            index = base - k
+            valid = index >= 0  # 信号开始之前视为零
+            weights = self._phases[phase[valid], k]
+            if self._buffer.ndim > 1:
+                weights = weights[:, None]
+            output[valid] += weights * self._buffer[index[valid]]
+        return output
+
 
 class AudioProcessor:
     """音频处理器 - 处理音频文件的读取、预处理和保存"""
@@ -26,6 +129,7 @@ class AudioProcessor:
         self.duration = 0
         self.channels = 1
         self.file_path = None
+        self._period_table = None
         
     def load_audio(self, file_path: str, mono: bool = True) -> Tuple[np.ndarray, int]:
         """
@@ -43,18 +147,16 @@ class AudioProcessor:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"音频文件不存在: {file_path}")
             
-            # 使用librosa加载音频
-            audio_data, sr = librosa.load(
-                file_path, 
-                sr=self.target_sr,  # 重采样到目标采样率
-                mono=mono,          # 转换为单声道
-                dtype=np.float32    # 使用float32格式
-            )
+            audio_data = self._read_all(file_path, mono)
+            if not mono:
+                # 与librosa一致：多声道为 (声道数, 样本数)，单声道文件仍为一维
+                audio_data = audio_data.T if audio_data.shape[1] > 1 else audio_data[:, 0]
+            sr = self.target_sr
             
             # 存储音频信息
             self.audio_data = audio_data
             self.original_sr = sr
-            self.duration = len(audio_data) / sr
+            self.duration = audio_data.shape[-1] / sr
             self.channels = 1 if mono else 2
             self.file_path = file_path
             
@@ -63,7 +165,7 @@ class AudioProcessor:
             print(f"   采样率: {sr} Hz")
             print(f"   时长: {self.duration:.2f} 秒")
             print(f"   声道: {'单声道' if mono else '立体声'}")
-            print(f"   数据点数: {len(audio_data)}")
+            print(f"   数据点数: {audio_data.shape[-1]}")
             
             return audio_data, sr
             
@@ -71,6 +173,179 @@ class AudioProcessor:
             print(f"❌ 音频加载失败: {e}")
             raise
     
+    def _read_all(self, file_path: str, mono: bool) -> np.ndarray:
+        """
+        分块解码整个文件并重采样到目标采样率
+        
+        文件头给出长度时先按重采样后的长度分配结果，各块直接写入，
+        峰值内存约为结果加一个块；否则只能先收集各块再拼接，峰值约为结果的两倍。
+        
+        Args:
+            file_path: 音频文件路径
+            mono: 是否转换为单声道
+            
+        Returns:
+            float32音频，单声道为 (样本数,)，多声道为 (样本数, 声道数)
+        """
+        try:
+            info = sf.info(file_path)
+            frames, channels = info.frames, info.channels
+            if info.samplerate != self.target_sr:
+                divisor = gcd(int(info.samplerate), int(self.target_sr))
+                frames = -(-frames * (self.target_sr // divisor) // (info.samplerate // divisor))
+        except (RuntimeError, sf.LibsndfileError):
+            frames, channels = None, 1
+        
+        chunks = self.iter_chunks(file_path, mono=mono)
+        if frames is None:
+            collected = list(chunks)
+            if collected:
+                return np.concatenate(collected)
+            return np.zeros((0,) if mono else (0, channels), dtype=np.float32)
+        
+        audio_data = np.empty((frames,) if mono else (frames, channels), dtype=np.float32)
+        filled = 0
+        extra = []
+        for chunk in chunks:
+            count = min(len(chunk), frames - filled)
+            audio_data[filled:filled + count] = chunk[:count]
+            filled += count
+            if count < len(chunk):
+                # 文件头的长度偏短时，多出的部分最后再拼接
+                extra.append(chunk[count:])
+        if extra:
+            return np.concatenate([audio_data] + extra)
+        return audio_data[:filled]
+    
+    def iter_chunks(self, file_path: str, mono: bool = True, chunk_size: int = 65536) -> Iterator[np.ndarray]:
+        """
+        逐块读取音频文件并重采样到目标采样率
+        
+        WAV文件通过内存映射读取，其他格式由soundfile分块解码，
+        都无法处理时才回退到librosa整段解码。
+        
+        Args:
+            file_path: 音频文件路径
+            mono: 是否转换为单声道
+            chunk_size: 每块读取的原始样本数
+            
+        Yields:
+            float32音频块，单声道为 (样本数,)，多声道为 (样本数, 声道数)
+        """
+        source, sr = self._open_source(file_path, mono, chunk_size)
+        if sr == self.target_sr:
+            yield from source
+            return
+        
+        resampler = StreamingResampler(sr, self.target_sr)
+        previous = None
+        for chunk in source:
+            if previous is not None:
+                yield resampler.process(previous)
+            previous = chunk
+        if previous is not None:
+            yield resampler.process(previous, last=True)
+    
+    def iter_frames(self, file_path: str, frame_size: int = 2048, mono: bool = True) -> Iterator[np.ndarray]:
+        """
+        以固定长度的帧流式读取音频，无需先加载整个文件
+        
+        Args:
+            file_path: 音频文件路径
+            frame_size: 每帧样本数（目标采样率下）
+            mono: 是否转换为单声道
+            
+        Yields:
+            float32音频帧，最后一帧不足部分补零
+        """
+        pending = []
+        pending_count = 0
+        for chunk in self.iter_chunks(file_path, mono=mono):
+            pending.append(chunk)
+            pending_count += len(chunk)
+            if pending_count < frame_size:
+                continue
+            
+            buffer = np.concatenate(pending)
+            full = len(buffer) // frame_size * frame_size
+            for start in range(0, full, frame_size):
+                yield buffer[start:start + frame_size]
+            pending = [buffer[full:]]
+            pending_count = len(buffer) - full
+        
+        if pending_count > 0:
+            buffer = np.concatenate(pending)
+            frame = np.zeros((frame_size,) + buffer.shape[1:], dtype=np.float32)
+            frame[:len(buffer)] = buffer
+            yield frame
+    
+    def _open_source(self, file_path: str, mono: bool, chunk_size: int) -> Tuple[Iterator[np.ndarray], int]:
+        """
+        打开音频文件，返回原始采样率下的分块迭代器
+        
+        Args:
+            file_path: 音频文件路径
+            mono: 是否转换为单声道
+            chunk_size: 每块样本数
+            
+        Returns:
+            Tuple[分块迭代器, 原始采样率]
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"音频文件不存在: {file_path}")
+        
+        if file_path.lower().endswith('.wav'):
+            try:
+                sr, mapped = wavfile.read(file_path, mmap=True)
+                return self._iter_mapped(mapped, mono, chunk_size), sr
+            except ValueError:
+                pass  # 24位等scipy不支持内存映射的编码，交给soundfile
+        
+        try:
+            sound_file = sf.SoundFile(file_path)
+        except (RuntimeError, sf.LibsndfileError):
+            # soundfile不支持的格式（如部分MP3），回退到librosa整段解码
+            audio_data, sr = librosa.load(file_path, sr=None, mono=mono, dtype=np.float32)
+            if audio_data.ndim > 1:
+                audio_data = audio_data.T
+            return self._iter_mapped(audio_data, mono, chunk_size), sr
+        return self._iter_sound_file(sound_file, mono, chunk_size), sound_file.samplerate
+    
+    def _iter_mapped(self, mapped: np.ndarray, mono: bool, chunk_size: int) -> Iterator[np.ndarray]:
+        """从内存映射（或已加载）的数组中逐块转换为float32"""
+        if mapped.dtype == np.uint8:
+            scale, offset = 1.0 / 128, 128.0
+        elif np.issubdtype(mapped.dtype, np.integer):
+            scale, offset = 1.0 / (np.iinfo(mapped.dtype).max + 1), 0.0
+        else:
+            scale, offset = 1.0, 0.0
+        
+        for start in range(0, len(mapped), chunk_size):
+            chunk = np.asarray(mapped[start:start + chunk_size], dtype=np.float32)
+            if offset:
+                chunk = chunk - offset
+            if scale != 1.0:
+                chunk = chunk * scale
+            yield self._to_channels(chunk, mono)
+    
+    def _iter_sound_file(self, sound_file: sf.SoundFile, mono: bool, chunk_size: int) -> Iterator[np.ndarray]:
+        """用soundfile分块解码"""
+        with sound_file:
+            while True:
+                chunk = sound_file.read(chunk_size, dtype='float32', always_2d=True)
+                if len(chunk) == 0:
+                    break
+                yield self._to_channels(chunk, mono)
+    
+    @staticmethod
+    def _to_channels(chunk: np.ndarray, mono: bool) -> np.ndarray:
+        """按需把多声道块混合为单声道"""
+        if chunk.ndim == 1:
+            return chunk if mono else chunk[:, None]
+        if mono:
+            return chunk.mean(axis=1) if chunk.shape[1] > 1 else chunk[:, 0]
+        return chunk
+    
     def normalize_audio(self, audio_data: np.ndarray, method: str = 'peak') -> np.ndarray:
         """
         音频标准化处理
@@ -202,8 +477,7 @@ class AudioProcessor:
         Returns:
             生成的音频数据
         """
-        t = np.linspace(0, duration, int(self.target_sr * duration), False)
-        audio_data = amplitude * np.sin(2 * np.pi * frequency * t)
+        audio_data = self._get_period_table().render([frequency], [amplitude], int(self.target_sr * duration))
         
         # 应用淡入淡出效果
         fade_samples = int(0.01 * self.target_sr)  # 10ms淡入淡出
@@ -233,15 +507,16 @@ class AudioProcessor:
         if len(amplitudes) != len(frequencies):
             raise ValueError("频率和振幅列表长度必须相同")
         
-        # 生成时间轴
-        t = np.linspace(0, duration, int(self.target_sr * duration), False)
-        
-        # 叠加所有频率分量
-        audio_data = np.zeros_like(t)
-        for freq, amp in zip(frequencies, amplitudes):
-            audio_data += amp * np.sin(2 * np.pi * freq * t)
+        # 叠加所有频率分量，有公共周期时只计算一个周期
+        audio_data = self._get_period_table().render(frequencies, amplitudes, int(self.target_sr * duration))
         
         # 标准化
         audio_data = self.normalize_audio(audio_data, method='peak')
         
         return audio_data
+    
+    def _get_period_table(self) -> PeriodTable:
+        """获取与当前目标采样率匹配的周期表"""
+        if self._period_table is None or self._period_table.sample_rate != self.target_sr:
+            self._period_table = PeriodTable(self.target_sr)
+        return self._period_table
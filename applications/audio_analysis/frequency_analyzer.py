@@ -4,12 +4,30 @@
 负责音频信号的频域分解、FFT处理和频率分量提取
 """
 
+import os
+import sys
 import numpy as np
 import librosa
 from scipy import signal
 from typing import List, Tuple, Dict, Optional
 import matplotlib.pyplot as plt
 
+try:
+    from audio_common.period_table import PeriodTable
+except ImportError:
+    # 以脚本方式运行时applications目录不在搜索路径中
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from audio_common.period_table import PeriodTable
+try:
+    from .sinusoidal_model import SinusoidalModel, PartialTrack
+except ImportError:
+    # 以脚本方式运行时不在包内，按模块名导入
+    from sinusoidal_model import SinusoidalModel, PartialTrack
+try:
+    from .spectrogram_pyramid import SpectrogramPyramid, content_hash
+except ImportError:
+    from spectrogram_pyramid import SpectrogramPyramid, content_hash
+
 class FrequencyComponent:
     """频率分量类 - 表示单个简谐波分量"""
     
@@ -26,20 +44,45 @@ class FrequencyComponent:
 class FrequencyAnalyzer:
     """频率分析器 - 分析音频信号的频率成分"""
     
-    def __init__(self, sample_rate: int = 22050):
+    def __init__(self, sample_rate: int = 22050, real_fft: bool = True):
         """
         初始化频率分析器
         
         Args:
             sample_rate: 采样率
+            real_fft: 是否使用实数FFT，只保存单边频谱，分析状态的内存约减半
         """
         self.sample_rate = sample_rate
+        self.real_fft = real_fft
         self.frequency_components = []
         self.fft_data = None
         self.frequencies = None
         self.magnitude_spectrum = None
         self.phase_spectrum = None
         
+        # 正频率部分在fft_data/frequencies中的位置，分析时计算一次
+        self.n_samples = 0
+        self.positive_frequencies = None
+        self._positive = slice(1, None)
+        
+        # 重构缓存：分量集合不变时只按振幅变化量增量更新
+        self.max_unit_wave_bytes = 256 * 1024 * 1024
+        self._period_table = None
+        self._reconstruction = None
+        self._reconstruction_key = None
+        self._applied_amplitudes = []   # 缓存结果中各分量实际使用的振幅
+        self._unit_waves = {}           # 分量序号 -> 单位振幅波形
+        self._scratch = None            # 增量更新用的临时缓冲区
+        
+        # 正弦建模结果：随时间变化的分量轨迹
+        self.partial_tracks = []
+        self._partial_samples = 0
+        self._sinusoidal_model = None
+        
+        # 最近一次计算的频谱图金字塔，同一段音频和参数重复调用时直接复用
+        self.spectrogram_pyramid = None
+        self._spectrogram_key = None
+        
     def analyze_audio(self, audio_data: np.ndarray, n_components: int = 5, 
                      min_frequency: float = 80.0, max_frequency: float = 2000.0) -> List[FrequencyComponent]:
         """
@@ -55,23 +98,33 @@ class FrequencyAnalyzer:
             频率分量列表
         """
         # 执行FFT
-        self.fft_data = np.fft.fft(audio_data)
-        self.frequencies = np.fft.fftfreq(len(audio_data), 1/self.sample_rate)
+        n_samples = len(audio_data)
+        self.n_samples = n_samples
+        if self.real_fft:
+            # 实数信号的负频率部分与正频率共轭对称，只计算和保存单边频谱
+            self.fft_data = np.fft.rfft(audio_data)
+            self.frequencies = np.fft.rfftfreq(n_samples, 1/self.sample_rate)
+            self._positive = slice(1, None)
+        else:
+            self.fft_data = np.fft.fft(audio_data)
+            self.frequencies = np.fft.fftfreq(n_samples, 1/self.sample_rate)
+            self._positive = slice(1, (n_samples + 1) // 2)
         
-        # 只取正频率部分
-        positive_freq_idx = self.frequencies > 0
-        positive_frequencies = self.frequencies[positive_freq_idx]
-        positive_fft = self.fft_data[positive_freq_idx]
+        # 只取正频率部分（切片视图，不复制）
+        positive_frequencies = self.frequencies[self._positive]
+        positive_fft = self.fft_data[self._positive]
+        self.positive_frequencies = positive_frequencies
         
         # 计算幅度谱和相位谱
         self.magnitude_spectrum = np.abs(positive_fft)
         self.phase_spectrum = np.angle(positive_fft)
         
-        # 在指定频率范围内寻找峰值
-        freq_mask = (positive_frequencies >= min_frequency) & (positive_frequencies <= max_frequency)
-        masked_frequencies = positive_frequencies[freq_mask]
-        masked_magnitudes = self.magnitude_spectrum[freq_mask]
-        masked_phases = self.phase_spectrum[freq_mask]
+        # 在指定频率范围内寻找峰值（频率轴有序，用二分查找确定范围）
+        start = np.searchsorted(positive_frequencies, min_frequency, side='left')
+        stop = np.searchsorted(positive_frequencies, max_frequency, side='right')
+        masked_frequencies = positive_frequencies[start:stop]
+        masked_magnitudes = self.magnitude_spectrum[start:stop]
+        masked_phases = self.phase_spectrum[start:stop]
         
         # 寻找峰值
         peaks, properties = signal.find_peaks(
@@ -116,12 +169,16 @@ class FrequencyAnalyzer:
         
         return self.frequency_components
     
-    def reconstruct_audio(self, duration: Optional[float] = None) -> np.ndarray:
+    def reconstruct_audio(self, duration: Optional[float] = None, copy: bool = True) -> np.ndarray:
         """
         根据当前的频率分量重构音频信号
 
+        结果会被缓存。分量集合与时长不变时，只把振幅或启用状态发生变化的分量
+        按振幅差值叠加到缓存结果上，调节单个分量的开销与分量总数无关。
+
         Args:
             duration: 重构音频的时长，None表示使用原始时长
+            copy: 是否返回副本；为False时返回只读的内部缓存，下次重构时会被原地更新
 
         Returns:
             重构的音频数据
@@ -132,7 +189,7 @@ class FrequencyAnalyzer:
         # 确定重构时长
         if duration is None:
             if self.fft_data is not None:
-                duration = len(self.fft_data) / self.sample_rate
+                duration = self.n_samples / self.sample_rate
             else:
                 duration = 3.0  # 默认3秒
 
@@ -149,29 +206,119 @@ class FrequencyAnalyzer:
         else:
             sample_rate = float(sample_rate)
 
-        print(f"重构音频: 时长={duration:.2f}秒, 采样率={sample_rate:.0f}Hz")
-
-        # 生成时间轴
         n_samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, n_samples, False)
+        key = (n_samples, int(sample_rate),
+               tuple((c.frequency, c.phase) for c in self.frequency_components))
+        targets = [c.amplitude if c.enabled else 0.0 for c in self.frequency_components]
+
+        if key != self._reconstruction_key:
+            self._rebuild_reconstruction(key, targets)
+        else:
+            self._reconstruction.setflags(write=True)
+            for index, target in enumerate(targets):
+                delta = target - self._applied_amplitudes[index]
+                if delta != 0.0:
+                    # 复用临时缓冲区，避免每次调节都分配整段音频大小的数组
+                    np.multiply(self._unit_wave(index), delta, out=self._scratch)
+                    self._reconstruction += self._scratch
+                    self._applied_amplitudes[index] = target
+            if not any(self._applied_amplitudes):
+                # 全部分量关闭时清零，避免增量累积的舍入误差
+                self._reconstruction.fill(0.0)
+            self._reconstruction.setflags(write=False)
+
+        return self._reconstruction.copy() if copy else self._reconstruction
+
+    def _rebuild_reconstruction(self, key: tuple, targets: List[float]):
+        """
+        分量集合或时长改变后重新合成全部启用的分量
+
+        Args:
+            key: (采样点数, 采样率, 各分量(频率, 相位))
+            targets: 各分量当前的有效振幅（禁用为0）
+        """
+        n_samples, sample_rate, _ = key
+        if self._period_table is None or self._period_table.sample_rate != sample_rate:
+            self._period_table = PeriodTable(sample_rate)
+        self._unit_waves.clear()
+        self._scratch = np.empty(n_samples)
+
+        active = [(c.frequency, target, c.phase)
+                  for c, target in zip(self.frequency_components, targets) if target != 0.0]
+        if active:
+            frequencies, amplitudes, phases = zip(*active)
+            reconstruction = self._period_table.render(frequencies, amplitudes, n_samples, phases)
+        else:
+            reconstruction = np.zeros(n_samples)
+        reconstruction.setflags(write=False)
+
+        self._reconstruction = reconstruction
+        self._reconstruction_key = key
+        self._applied_amplitudes = list(targets)
+        print(f"重构音频: 时长={n_samples / sample_rate:.2f}秒, 采样率={sample_rate}Hz, "
+              f"使用了 {len(active)} 个分量")
 
-        print(f"时间轴: {len(t)} 个采样点")
+    def _unit_wave(self, index: int) -> np.ndarray:
+        """
+        获取分量的单位振幅波形，在内存预算内缓存
 
-        # 叠加所有启用的频率分量
-        reconstructed = np.zeros_like(t)
-        enabled_count = 0
+        Args:
+            index: 分量索引
 
-        for component in self.frequency_components:
-            if component.enabled:
-                wave = component.amplitude * np.sin(
-                    2 * np.pi * component.frequency * t + component.phase
-                )
-                reconstructed += wave
-                enabled_count += 1
-                print(f"  添加分量: {component.frequency:.1f}Hz, 振幅={component.amplitude:.4f}")
+        Returns:
+            单位振幅波形
+        """
+        wave = self._unit_waves.get(index)
+        if wave is not None:
+            return wave
 
-        print(f"重构完成: 使用了 {enabled_count} 个分量")
-        return reconstructed
+        component = self.frequency_components[index]
+        wave = self._period_table.render([component.frequency], [1.0],
+                                         self._reconstruction_key[0], [component.phase])
+        cached_bytes = sum(w.nbytes for w in self._unit_waves.values())
+        if cached_bytes + wave.nbytes <= self.max_unit_wave_bytes:
+            wave.setflags(write=False)
+            self._unit_waves[index] = wave
+        return wave
+    
+    def analyze_partials(self, audio_data: np.ndarray, max_partials: int = 40,
+                         frame_size: int = 2048, hop_size: int = 256) -> List[PartialTrack]:
+        """
+        正弦建模分析，提取随时间变化的频率/振幅/相位轨迹
+        
+        与analyze_audio的全局静态分量不同，轨迹能描述颤音、衰减等变化，适合真实乐器录音。
+        
+        Args:
+            audio_data: 音频数据
+            max_partials: 每帧最多跟踪的分量数
+            frame_size: 分析帧长度
+            hop_size: 帧移
+            
+        Returns:
+            分量轨迹列表
+        """
+        model = SinusoidalModel(self.sample_rate, frame_size, hop_size, max_partials)
+        self.partial_tracks = model.analyze(audio_data)
+        self._partial_samples = len(audio_data)
+        self._sinusoidal_model = model
+        print(f"✅ 正弦建模完成，跟踪到 {len(self.partial_tracks)} 条分量轨迹")
+        return self.partial_tracks
+    
+    def reconstruct_from_partials(self, n_samples: Optional[int] = None) -> np.ndarray:
+        """
+        用分量轨迹重新合成音频
+        
+        Args:
+            n_samples: 输出采样点数，None表示与分析的音频等长
+            
+        Returns:
+            合成的音频数据
+        """
+        if not self.partial_tracks:
+            raise ValueError("请先执行正弦建模分析")
+        if n_samples is None:
+            n_samples = self._partial_samples
+        return self._sinusoidal_model.synthesize(self.partial_tracks, n_samples)
     
     def get_frequency_spectrum(self) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -184,8 +331,7 @@ class FrequencyAnalyzer:
             raise ValueError("请先执行频率分析")
         
         # 只返回正频率部分
-        positive_idx = self.frequencies > 0
-        return self.frequencies[positive_idx], self.magnitude_spectrum
+        return self.positive_frequencies, self.magnitude_spectrum
     
     def update_component_amplitude(self, component_index: int, amplitude_scale: float):
         """
@@ -235,7 +381,8 @@ class FrequencyAnalyzer:
         return info_list
     
     def create_spectrogram(self, audio_data: np.ndarray, window_size: int = 2048, 
-                          hop_length: int = 512) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                          hop_length: int = 512, source_path: Optional[str] = None
+                          ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         创建频谱图
         
@@ -243,23 +390,62 @@ class FrequencyAnalyzer:
             audio_data: 音频数据
             window_size: 窗口大小
             hop_length: 跳跃长度
+            source_path: 音频文件路径，提供时金字塔缓存在文件旁的目录中
             
         Returns:
             Tuple[频谱图, 频率轴, 时间轴]
         """
-        # 使用librosa计算短时傅里叶变换
-        stft = librosa.stft(audio_data, n_fft=window_size, hop_length=hop_length)
-        magnitude = np.abs(stft)
+        pyramid = self.get_spectrogram_pyramid(audio_data, window_size, hop_length, source_path)
+        return pyramid.view()
+    
+    def get_spectrogram_pyramid(self, audio_data: np.ndarray, window_size: int = 2048,
+                                hop_length: int = 512, source_path: Optional[str] = None) -> SpectrogramPyramid:
+        """
+        获取音频的频谱图金字塔，同一段音频只计算一次
         
-        # 转换为dB
-        magnitude_db = librosa.amplitude_to_db(magnitude, ref=np.max)
+        Args:
+            audio_data: 音频数据
+            window_size: 窗口大小
+            hop_length: 跳跃长度
+            source_path: 音频文件路径，提供时读写磁盘缓存
+            
+        Returns:
+            频谱图金字塔
+        """
+        audio_data = np.ascontiguousarray(audio_data)
+        # 按内容识别音频：同一文件的数据被编辑后不会误用旧的频谱图
+        digest = content_hash(audio_data)
+        path = os.path.abspath(source_path) if source_path is not None else None
+        key = (path, digest, audio_data.shape, self.sample_rate, window_size, hop_length)
         
-        # 生成频率和时间轴
-        frequencies = librosa.fft_frequencies(sr=self.sample_rate, n_fft=window_size)
-        times = librosa.frames_to_time(np.arange(magnitude.shape[1]), 
-                                      sr=self.sample_rate, hop_length=hop_length)
+        if self.spectrogram_pyramid is None or self._spectrogram_key != key:
+            if source_path is not None:
+                self.spectrogram_pyramid = SpectrogramPyramid.for_file(
+                    source_path, audio_data, self.sample_rate, window_size, hop_length, digest)
+            else:
+                self.spectrogram_pyramid = SpectrogramPyramid.build(
+                    audio_data, self.sample_rate, window_size, hop_length)
+            self._spectrogram_key = key
+        return self.spectrogram_pyramid
+    
+    def get_spectrogram_view(self, start_time: float = 0.0, end_time: Optional[float] = None,
+                             max_columns: Optional[int] = None,
+                             statistic: str = 'max') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        按画布宽度取出最近一次频谱图的可见部分
         
-        return magnitude_db, frequencies, times
+        Args:
+            start_time: 起始时间（秒）
+            end_time: 结束时间（秒），None表示到结尾
+            max_columns: 画布宽度（列数），None表示全分辨率
+            statistic: 多帧合并为一列时的统计 'min'/'max'/'mean'
+            
+        Returns:
+            Tuple[频谱图, 频率轴, 时间轴]
+        """
+        if self.spectrogram_pyramid is None:
+            raise ValueError("请先调用create_spectrogram计算频谱图")
+        return self.spectrogram_pyramid.view(start_time, end_time, max_columns, statistic)
     
     def analyze_harmonic_content(self, fundamental_freq: float, n_harmonics: int = 5) -> List[Dict]:
         """
@@ -275,23 +461,25 @@ class FrequencyAnalyzer:
         if self.frequencies is None or self.magnitude_spectrum is None:
             raise ValueError("请先执行频率分析")
         
+        # 频率轴等间隔，直接换算出每个谐波最接近的频点，与频谱长度无关
+        harmonic_numbers = np.arange(1, n_harmonics + 1)
+        expected = fundamental_freq * harmonic_numbers
+        bin_width = self.sample_rate / self.n_samples
+        first_bin = self._positive.start
+        indices = np.clip(np.rint(expected / bin_width).astype(int) - first_bin,
+                          0, len(self.magnitude_spectrum) - 1)
+        actual = self.positive_frequencies[indices]
+        amplitudes = self.magnitude_spectrum[indices]
+        amplitudes_db = 20 * np.log10(amplitudes + 1e-10)
+        
         harmonics = []
-        for n in range(1, n_harmonics + 1):
-            harmonic_freq = fundamental_freq * n
-            
-            # 在频谱中寻找最接近的频率
-            freq_diff = np.abs(self.frequencies[self.frequencies > 0] - harmonic_freq)
-            closest_idx = np.argmin(freq_diff)
-            
-            actual_freq = self.frequencies[self.frequencies > 0][closest_idx]
-            amplitude = self.magnitude_spectrum[closest_idx]
-            
+        for i, n in enumerate(harmonic_numbers):
             harmonic_info = {
-                'harmonic_number': n,
-                'expected_frequency': harmonic_freq,
-                'actual_frequency': actual_freq,
-                'amplitude': amplitude,
-                'amplitude_db': 20 * np.log10(amplitude + 1e-10)
+                'harmonic_number': int(n),
+                'expected_frequency': expected[i],
+                'actual_frequency': actual[i],
+                'amplitude': amplitudes[i],
+                'amplitude_db': amplitudes_db[i]
             }
             harmonics.append(harmonic_info)
         
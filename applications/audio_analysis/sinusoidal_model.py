@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+正弦建模分析
+按McAulay-Quatieri方法在STFT帧之间跟踪正弦分量，得到随时间变化的频率/振幅/相位轨迹并重新合成
+"""
+
+import numpy as np
+from scipy import signal
+from typing import List, Tuple
+
+
+class PartialTrack:
+    """一条正弦分量轨迹 - 从start_frame开始每帧的频率、振幅和相位"""
+
+    def __init__(self, start_frame: int, frequencies: np.ndarray, amplitudes: np.ndarray, phases: np.ndarray):
+        self.start_frame = start_frame
+        self.frequencies = frequencies  # 频率 (Hz)
+        self.amplitudes = amplitudes    # 振幅
+        self.phases = phases            # 帧中心处的相位 (弧度，正弦相位)
+
+    @property
+    def end_frame(self) -> int:
+        """最后一帧的序号（包含）"""
+        return self.start_frame + len(self.frequencies) - 1
+
+    def __len__(self):
+        return len(self.frequencies)
+
+    def __repr__(self):
+        return (f"Partial(帧{self.start_frame}-{self.end_frame}, "
+                f"f≈{np.mean(self.frequencies):.1f}Hz, A≈{np.max(self.amplitudes):.3f})")
+
+
+class SinusoidalModel:
+    """正弦建模引擎
+
+    每帧用零相位Hann窗做FFT，按主瓣形状插值得到峰值的频率和振幅，并读取帧中心的相位；
+    相邻帧的峰值按频率就近连接成轨迹。合成时振幅线性插值，相位用三次多项式插值，
+    保证相位和频率在帧边界上都连续。每条轨迹每帧只保存三个参数，内存与轨迹时长成正比。
+    """
+
+    def __init__(self, sample_rate: int = 22050, frame_size: int = 2048, hop_size: int = 256,
+                 max_partials: int = 40, min_amplitude_db: float = -60.0,
+                 max_frequency_deviation: float = 0.03, min_track_frames: int = 3):
+        """
+        初始化正弦建模引擎
+
+        Args:
+            sample_rate: 采样率
+            frame_size: 分析帧长度
+            hop_size: 帧移，也是合成时的插值段长度
+            max_partials: 每帧最多保留的峰值数
+            min_amplitude_db: 峰值振幅下限 (dB，相对满幅1.0)
+            max_frequency_deviation: 相邻帧连接时允许的相对频率变化
+            min_track_frames: 短于该帧数的轨迹视为噪声丢弃
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.max_partials = max_partials
+        self.min_amplitude = 10 ** (min_amplitude_db / 20)
+        self.max_frequency_deviation = max_frequency_deviation
+        self.min_track_frames = min_track_frames
+
+        self.window = signal.get_window('hann', frame_size)
+        self._amplitude_scale = 2 / np.sum(self.window)
+        self.bin_width = sample_rate / frame_size
+
+    def analyze(self, audio_data: np.ndarray, block_frames: int = 128) -> List[PartialTrack]:
+        """
+        分析音频，得到正弦分量轨迹
+
+        Args:
+            audio_data: 单声道音频
+            block_frames: 每次批量FFT的帧数
+
+        Returns:
+            按起始帧排列的轨迹列表，第k帧的中心位于第 k*hop_size 个采样点
+        """
+        audio_data = np.asarray(audio_data, dtype=np.float64)
+        half = self.frame_size // 2
+        padded = np.pad(audio_data, (half, half + self.hop_size))
+        n_frames = len(audio_data) // self.hop_size + 1
+        frames = np.lib.stride_tricks.sliding_window_view(padded, self.frame_size)[::self.hop_size][:n_frames]
+
+        finished = []
+        active = []     # [起始帧, 频率列表, 振幅列表, 相位列表]
+        for start in range(0, n_frames, block_frames):
+            # 零相位加窗：把帧中心移到第0个采样点，峰值处的相位即帧中心的相位
+            block = np.fft.ifftshift(frames[start:start + block_frames] * self.window, axes=1)
+            spectra = np.fft.rfft(block, axis=1)
+            for offset, spectrum in enumerate(spectra):
+                peaks = self._frame_peaks(spectrum)
+                active, ended = self._continue_tracks(active, peaks, start + offset)
+                finished += ended
+        finished += active
+
+        tracks = [PartialTrack(begin, np.array(f), np.array(a), np.array(p))
+                  for begin, f, a, p in finished if len(f) >= self.min_track_frames]
+        tracks.sort(key=lambda track: track.start_frame)
+        return tracks
+
+    def _frame_peaks(self, spectrum: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        提取一帧的谱峰
+
+        Args:
+            spectrum: 单帧的单边频谱
+
+        Returns:
+            Tuple[频率, 振幅, 相位]，按振幅降序，最多max_partials个
+        """
+        magnitudes = np.abs(spectrum) * self._amplitude_scale
+        center = magnitudes[1:-1]
+        is_peak = (center > magnitudes[:-2]) & (center >= magnitudes[2:]) & (center >= self.min_amplitude)
+        peaks = np.flatnonzero(is_peak) + 1
+        if len(peaks) > self.max_partials:
+            peaks = peaks[np.argsort(magnitudes[peaks])[::-1][:self.max_partials]]
+
+        # Hann窗主瓣的解析插值：由峰值与较大邻点之比求出精确的频点偏移δ，
+        # 再用窗函数频响 W(δ) = sinc(δ)/(1-δ²) 修正振幅
+        left = magnitudes[peaks - 1]
+        middle = magnitudes[peaks]
+        right = magnitudes[peaks + 1]
+        sign = np.where(right >= left, 1.0, -1.0)
+        ratio = np.maximum(left, right) / middle
+        offset = sign * (2 * ratio - 1) / (ratio + 1)
+
+        frequencies = (peaks + offset) * self.bin_width
+        amplitudes = middle * (1 - offset ** 2) / np.sinc(offset)
+        # X = A/2·W·e^{j(φ-π/2)}，换算为正弦相位
+        phases = np.angle(spectrum[peaks]) + np.pi / 2
+
+        order = np.argsort(amplitudes)[::-1]
+        return frequencies[order], amplitudes[order], phases[order]
+
+    def _continue_tracks(self, active: list, peaks: tuple, frame: int) -> Tuple[list, list]:
+        """
+        把本帧峰值连接到上一帧的轨迹上
+
+        Args:
+            active: 上一帧仍在延续的轨迹
+            peaks: 本帧的 (频率, 振幅, 相位)
+            frame: 本帧序号
+
+        Returns:
+            Tuple[本帧延续或新建的轨迹, 在上一帧结束的轨迹]
+        """
+        frequencies, amplitudes, phases = peaks
+        matched_peak = {}
+        if active and len(frequencies):
+            previous = np.array([track[1][-1] for track in active])
+            distance = np.abs(previous[:, None] - frequencies[None, :])
+            limit = np.maximum(previous * self.max_frequency_deviation, 2 * self.bin_width)[:, None]
+            # 按频率差从小到大贪心匹配，每条轨迹和每个峰值只用一次
+            rows, cols = np.nonzero(distance <= limit)
+            used_tracks = set()
+            for index in np.argsort(distance[rows, cols], kind='stable'):
+                row, col = rows[index], cols[index]
+                if row in used_tracks or col in matched_peak:
+                    continue
+                used_tracks.add(row)
+                matched_peak[col] = row
+
+        continuing = []
+        matched_tracks = set(matched_peak.values())
+        ended = [track for i, track in enumerate(active) if i not in matched_tracks]
+        for col in range(len(frequencies)):
+            row = matched_peak.get(col)
+            track = active[row] if row is not None else [frame, [], [], []]
+            track[1].append(frequencies[col])
+            track[2].append(amplitudes[col])
+            track[3].append(phases[col])
+            continuing.append(track)
+        return continuing, ended
+
+    def synthesize(self, tracks: List[PartialTrack], n_samples: int) -> np.ndarray:
+        """
+        用振荡器组重新合成音频
+
+        轨迹开始前和结束后各补一个零振幅点，使分量淡入淡出。
+        每个帧间隔内所有分量一次向量化计算。
+
+        Args:
+            tracks: 轨迹列表
+            n_samples: 输出采样点数
+
+        Returns:
+            合成的音频
+        """
+        hop = self.hop_size
+        output = np.zeros(n_samples + 2 * hop)
+        if not tracks:
+            return output[:n_samples]
+
+        frames, params = self._segments(tracks)
+        order = np.argsort(frames, kind='stable')
+        frames = frames[order]
+        f0, f1, a0, a1, p0, p1 = (p[order] for p in params)
+
+        omega0 = 2 * np.pi * f0 / self.sample_rate
+        omega1 = 2 * np.pi * f1 / self.sample_rate
+        # 三次相位插值：选取使相位曲线最平滑的2πM展开
+        m = np.round(((p0 + omega0 * hop - p1) + (omega1 - omega0) * hop / 2) / (2 * np.pi))
+        residual = p1 - p0 - omega0 * hop + 2 * np.pi * m
+        alpha = 3 / hop ** 2 * residual - (omega1 - omega0) / hop
+        beta = -2 / hop ** 3 * residual + (omega1 - omega0) / hop ** 2
+
+        t = np.arange(hop)
+        boundaries = np.searchsorted(frames, np.arange(frames[0], frames[-1] + 2))
+        for index, frame in enumerate(range(frames[0], frames[-1] + 1)):
+            lo, hi = boundaries[index], boundaries[index + 1]
+            start = frame * hop
+            if lo == hi or start >= n_samples or start < 0:
+                continue
+            sl = slice(lo, hi)
+            phase = (p0[sl, None] + omega0[sl, None] * t
+                     + alpha[sl, None] * t ** 2 + beta[sl, None] * t ** 3)
+            amplitude = a0[sl, None] + (a1[sl, None] - a0[sl, None]) * (t / hop)
+            output[start:start + hop] += np.einsum('ij,ij->j', amplitude, np.sin(phase))
+        return output[:n_samples]
+
+    def _segments(self, tracks: List[PartialTrack]) -> Tuple[np.ndarray, tuple]:
+        """
+        把轨迹展开为帧间隔段
+
+        Returns:
+            Tuple[每段起始帧, (起止频率, 起止振幅, 起止相位)]
+        """
+        step = 2 * np.pi * self.hop_size / self.sample_rate
+        frames, f0, f1, a0, a1, p0, p1 = [], [], [], [], [], [], []
+        for track in tracks:
+            frequencies, amplitudes, phases = track.frequencies, track.amplitudes, track.phases
+            start = track.start_frame
+            # 首尾补零振幅点，相位按端点频率外推
+            if start > 0:
+                frequencies = np.concatenate(([frequencies[0]], frequencies))
+                amplitudes = np.concatenate(([0.0], amplitudes))
+                phases = np.concatenate(([phases[0] - step * frequencies[0]], phases))
+                start -= 1
+            frequencies = np.append(frequencies, frequencies[-1])
+            amplitudes = np.append(amplitudes, 0.0)
+            phases = np.append(phases, phases[-1] + step * frequencies[-1])
+
+            frames.append(np.arange(start, start + len(frequencies) - 1))
+            f0.append(frequencies[:-1])
+            f1.append(frequencies[1:])
+            a0.append(amplitudes[:-1])
+            a1.append(amplitudes[1:])
+            p0.append(phases[:-1])
+            p1.append(phases[1:])
+        return np.concatenate(frames), tuple(np.concatenate(p) for p in (f0, f1, a0, a1, p0, p1))
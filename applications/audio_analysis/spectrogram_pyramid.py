@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+频谱图金字塔
+对一段音频只计算一次STFT，按时间轴逐级减半保存min/max/mean三种统计，
+显示时按画布宽度选择层级并只读取可见范围；可缓存在音频文件旁的目录中
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import librosa
+
+STATISTICS = ('min', 'max', 'mean')
+
+
+def content_hash(audio_data: np.ndarray) -> str:
+    """
+    计算音频数据的内容摘要，用于识别同一段音频
+    
+    Args:
+        audio_data: 音频数据
+        
+    Returns:
+        十六进制摘要字符串
+    """
+    audio_data = np.ascontiguousarray(audio_data)
+    return hashlib.blake2b(audio_data.view(np.uint8), digest_size=16).hexdigest()
+
+
+class SpectrogramPyramid:
+    """频谱图金字塔 - 第0层为逐帧的dB频谱，第k层每列汇总2^k帧"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, meta: Dict, levels: list):
+        """
+        Args:
+            meta: 参数和元信息（采样率、窗口、帧数、参考电平等）
+            levels: 每层一个 {统计名: 数组}，数组形状为 (列数, 频点数)
+        """
+        self.meta = meta
+        self.levels = levels
+        self.sample_rate = meta['sample_rate']
+        self.window_size = meta['window_size']
+        self.hop_length = meta['hop_length']
+        self.n_frames = meta['n_frames']
+        self.ref_db = meta['ref_db']
+        self.top_db = meta['top_db']
+        self.frequencies = librosa.fft_frequencies(sr=self.sample_rate, n_fft=self.window_size)
+
+    @classmethod
+    def build(cls, audio_data: np.ndarray, sample_rate: int, window_size: int = 2048,
+              hop_length: int = 512, directory: Optional[str] = None, top_db: float = 80.0,
+              block_frames: int = 1024, coarsest_columns: int = 16) -> 'SpectrogramPyramid':
+        """
+        计算频谱图金字塔
+
+        STFT按块计算并直接写入各层，长录音不需要一次性持有复数频谱。
+
+        Args:
+            audio_data: 单声道音频
+            sample_rate: 采样率
+            window_size: 窗口大小
+            hop_length: 跳跃长度
+            directory: 缓存目录，None表示只保存在内存中
+            top_db: 显示的动态范围 (dB)
+            block_frames: 每块计算的帧数
+            coarsest_columns: 最粗一层的列数上限
+
+        Returns:
+            频谱图金字塔
+        """
+        audio_data = np.asarray(audio_data)
+        pad = window_size // 2
+        padded = np.pad(audio_data, pad)
+        n_frames = 1 + (len(padded) - window_size) // hop_length
+        n_bins = window_size // 2 + 1
+
+        n_levels = 1
+        while -(-n_frames // 2 ** (n_levels - 1)) > coarsest_columns:
+            n_levels += 1
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        def allocate(level: int, stat: str, columns: int) -> np.ndarray:
+            if directory is None:
+                return np.empty((columns, n_bins), dtype=np.float32)
+            path = os.path.join(directory, f"level{level}_{stat}.npy")
+            return np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(columns, n_bins))
+
+        # 第0层每列只有一帧，三种统计相同，共用同一个数组
+        base = allocate(0, 'mean', n_frames)
+        ref_db = -np.inf
+        for start in range(0, n_frames, block_frames):
+            stop = min(start + block_frames, n_frames)
+            segment = padded[start * hop_length:(stop - 1) * hop_length + window_size]
+            stft = librosa.stft(segment, n_fft=window_size, hop_length=hop_length, center=False)
+            # 先保存绝对电平，参考电平在全部块计算完后才能确定
+            block = librosa.amplitude_to_db(np.abs(stft), ref=1.0, top_db=None).T
+            base[start:stop] = block
+            ref_db = max(ref_db, float(block.max()))
+        levels = [{stat: base for stat in STATISTICS}]
+
+        for level in range(1, n_levels):
+            previous = levels[-1]
+            columns = -(-len(previous['mean']) // 2)
+            current = {stat: allocate(level, stat, columns) for stat in STATISTICS}
+            for start in range(0, columns, block_frames):
+                stop = min(start + block_frames, columns)
+                for stat in STATISTICS:
+                    source = previous[stat][2 * start:2 * stop]
+                    even, odd = source[0::2], source[1::2]
+                    # 列数为奇数时最后一列单独成组
+                    target = current[stat][start:stop]
+                    target[:] = even
+                    paired = len(odd)
+                    if stat == 'min':
+                        np.minimum(even[:paired], odd, out=target[:paired])
+                    elif stat == 'max':
+                        np.maximum(even[:paired], odd, out=target[:paired])
+                    else:
+                        np.add(even[:paired], odd, out=target[:paired])
+                        target[:paired] *= 0.5
+            levels.append(current)
+
+        meta = {
+            'version': cls.FORMAT_VERSION,
+            'sample_rate': int(sample_rate),
+            'window_size': int(window_size),
+            'hop_length': int(hop_length),
+            'n_samples': int(len(audio_data)),
+            'n_frames': int(n_frames),
+            'n_levels': int(n_levels),
+            'ref_db': ref_db if np.isfinite(ref_db) else 0.0,
+            'top_db': float(top_db),
+        }
+        if directory is not None:
+            for level in levels[1:]:
+                for array in level.values():
+                    array.flush()
+            base.flush()
+            with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        return cls(meta, levels)
+
+    @classmethod
+    def load(cls, directory: str) -> 'SpectrogramPyramid':
+        """
+        以内存映射方式打开缓存目录，读取时只加载访问到的部分
+
+        Args:
+            directory: 缓存目录
+
+        Returns:
+            频谱图金字塔
+        """
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f"频谱图缓存版本不匹配: {directory}")
+
+        base = np.load(os.path.join(directory, 'level0_mean.npy'), mmap_mode='r')
+        levels = [{stat: base for stat in STATISTICS}]
+        for level in range(1, meta['n_levels']):
+            levels.append({stat: np.load(os.path.join(directory, f"level{level}_{stat}.npy"), mmap_mode='r')
+                           for stat in STATISTICS})
+        return cls(meta, levels)
+
+    @classmethod
+    def for_file(cls, file_path: str, audio_data: np.ndarray, sample_rate: int,
+                 window_size: int = 2048, hop_length: int = 512,
+                 audio_hash: Optional[str] = None) -> 'SpectrogramPyramid':
+        """
+        读取音频文件旁的缓存，缓存不存在或已过期时重新计算
+
+        每组分析参数使用 "<音频文件>.spectrogram/sr<采样率>_w<窗口>_h<跳跃>" 下的独立目录，
+        切换参数不会覆盖其他参数的缓存；按文件大小、修改时间和音频内容摘要判断是否有效。
+        目录无法写入时只在内存中计算。
+
+        Args:
+            file_path: 音频文件路径
+            audio_data: 该文件解码后的音频
+            sample_rate: audio_data的采样率
+            window_size: 窗口大小
+            hop_length: 跳跃长度
+            audio_hash: audio_data的content_hash，None时在此计算
+
+        Returns:
+            频谱图金字塔
+        """
+        directory = os.path.join(file_path + '.spectrogram',
+                                 f"sr{int(sample_rate)}_w{int(window_size)}_h{int(hop_length)}")
+        stat = os.stat(file_path)
+        if audio_hash is None:
+            audio_hash = content_hash(audio_data)
+        source = {'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns,
+                  'content_hash': audio_hash}
+        expected = {'sample_rate': int(sample_rate), 'window_size': int(window_size),
+                    'hop_length': int(hop_length), 'n_samples': int(len(audio_data)), **source}
+
+        try:
+            pyramid = cls.load(directory)
+            if all(pyramid.meta.get(key) == value for key, value in expected.items()):
+                return pyramid
+        except (OSError, ValueError, KeyError):
+            pass
+
+        try:
+            pyramid = cls.build(audio_data, sample_rate, window_size, hop_length, directory=directory)
+            pyramid.meta.update(source)
+            with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(pyramid.meta, f)
+            return pyramid
+        except OSError as e:
+            print(f"⚠️ 无法写入频谱图缓存，改为内存计算: {e}")
+            return cls.build(audio_data, sample_rate, window_size, hop_length)
+
+    @property
+    def duration(self) -> float:
+        """音频时长（秒）"""
+        return self.meta['n_samples'] / self.sample_rate
+
+    def select_level(self, n_frames: int, max_columns: int) -> int:
+        """
+        选择能用不超过max_columns列显示n_frames帧的最细层级
+
+        Args:
+            n_frames: 可见范围内的帧数
+            max_columns: 画布可用的列数
+
+        Returns:
+            层级序号
+        """
+        if n_frames <= max_columns:
+            return 0
+        level = int(np.ceil(np.log2(n_frames / max(max_columns, 1))))
+        return min(level, len(self.levels) - 1)
+
+    def view(self, start_time: float = 0.0, end_time: Optional[float] = None,
+             max_columns: Optional[int] = None, statistic: str = 'max') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        取出可见时间范围的频谱图
+
+        Args:
+            start_time: 起始时间（秒）
+            end_time: 结束时间（秒），None表示到结尾
+            max_columns: 画布宽度（列数），None表示全分辨率
+            statistic: 每列汇总多帧时使用的统计 'min'/'max'/'mean'
+
+        Returns:
+            Tuple[频谱图 (dB，相对全曲最大值), 频率轴, 时间轴（每列的中心时间）]
+        """
+        if statistic not in STATISTICS:
+            raise ValueError(f"未知的统计方式: {statistic}")
+
+        frame_rate = self.sample_rate / self.hop_length
+        first = int(np.clip(np.floor(start_time * frame_rate), 0, self.n_frames))
+        last = self.n_frames if end_time is None else \
+            int(np.clip(np.ceil(end_time * frame_rate) + 1, first, self.n_frames))
+
+        level = 0 if max_columns is None else self.select_level(last - first, max_columns)
+        scale = 2 ** level
+        begin, end = first // scale, -(-last // scale)
+
+        # 只切片可见的列；内存映射的缓存只会读入这部分
+        data = np.asarray(self.levels[level][statistic][begin:end]).T - np.float32(self.ref_db)
+        np.maximum(data, -self.top_db, out=data)
+
+        times = (np.arange(begin, end) * scale + (scale - 1) / 2) / frame_rate
+        return data, self.frequencies, times
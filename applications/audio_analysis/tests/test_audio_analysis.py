@@ -9,14 +9,21 @@ import sys
 import os
 import numpy as np
 import time
+import tempfile
 import unittest
+from scipy import signal
+from scipy.io import wavfile
 
 # 添加路径
 sys.path.append('..')
+sys.path.append('../..')
 
-from audio_processor import AudioProcessor
+from audio_processor import AudioProcessor, StreamingResampler
 from frequency_analyzer import FrequencyAnalyzer
 from audio_player import AudioPlayer
+from audio_common import OutputStreamManager
+from sinusoidal_model import SinusoidalModel
+from spectrogram_pyramid import SpectrogramPyramid
 
 class TestAudioProcessor(unittest.TestCase):
     """测试音频处理器"""
@@ -190,6 +197,406 @@ class TestAudioPlayer(unittest.TestCase):
         
         print("✅ 播放信息获取正常")
 
+class _StubOutput:
+    """替代共享输出流的桩对象，由测试手动拉取回调输出"""
+    
+    def __init__(self):
+        self.callback = None
+    
+    def attach(self, callback, on_replaced=None):
+        self.callback = callback
+    
+    def detach(self, callback):
+        if self.callback == callback:
+            self.callback = None
+    
+    def pull(self, frames):
+        outdata = np.zeros((frames, 1), dtype=np.float32)
+        self.callback(outdata, frames, None, None)
+        return outdata[:, 0].copy()
+
+class TestPlayerCallback(unittest.TestCase):
+    """测试播放器回调中的增益与读取位置"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.player = AudioPlayer(sample_rate=22050)
+        self.output = _StubOutput()
+        self.player._output = self.output
+        self.block = 1024
+    
+    def test_seek_during_playback(self):
+        """测试播放中跳转由下一个回调块生效，位置按已消费帧数报告"""
+        n_frames = 20 * self.block
+        audio = np.arange(n_frames) / n_frames
+        self.player.load_audio(audio)
+        self.player.play()
+        self.output.pull(self.block)
+        
+        self.player.seek(10 * self.block / 22050)
+        # 跳转只发布请求，读取位置由回调移动
+        self.assertEqual(self.player._read_frame, self.block)
+        block = self.output.pull(self.block)
+        np.testing.assert_allclose(block, audio[10 * self.block:11 * self.block], atol=1e-6)
+        
+        self.player._update_position()
+        self.assertAlmostEqual(self.player.current_position, 11 * self.block / 22050)
+        
+        # 重新开始播放时忽略尚未处理的旧跳转
+        self.player.seek(0.0)
+        self.player.play(start_position=5 * self.block / 22050)
+        block = self.output.pull(self.block)
+        np.testing.assert_allclose(block, audio[5 * self.block:6 * self.block], atol=1e-6)
+        
+        print("✅ 播放中跳转正常")
+    
+    def test_pause_resume_ramps(self):
+        """测试暂停淡出后保持读取位置，恢复时淡入"""
+        self.player.load_audio(np.full(10 * self.block, 0.5))
+        self.player.play()
+        np.testing.assert_allclose(self.output.pull(self.block), 0.5)
+        
+        self.player.pause()
+        fade_out = self.output.pull(self.block)
+        self.assertTrue(np.all(np.diff(fade_out) < 0))
+        self.assertAlmostEqual(fade_out[-1], 0.0)
+        position = self.player._read_frame
+        self.assertEqual(position, 2 * self.block)
+        
+        # 已淡出：输出静音且读取位置不再前进
+        np.testing.assert_array_equal(self.output.pull(self.block), 0.0)
+        self.assertEqual(self.player._read_frame, position)
+        
+        self.player.resume()
+        fade_in = self.output.pull(self.block)
+        self.assertTrue(np.all(np.diff(fade_in) > 0))
+        self.assertAlmostEqual(fade_in[-1], 0.5)
+        self.assertEqual(self.player._read_frame, position + self.block)
+        
+        print("✅ 暂停/恢复增益过渡正常")
+    
+    def test_zero_volume_keeps_advancing(self):
+        """测试音量为0时输出静音但继续播放到结尾"""
+        self.player.load_audio(np.full(3 * self.block, 0.5))
+        self.player.set_volume(0.0)
+        self.player.play()
+        
+        for _ in range(4):
+            np.testing.assert_array_equal(self.output.pull(self.block), 0.0)
+        self.assertTrue(self.player._reached_end)
+        
+        finished = []
+        self.player.playback_stopped.connect(lambda: finished.append(True))
+        self.player._update_position()
+        self.assertFalse(self.player.is_playing)
+        self.assertEqual(finished, [True])
+        
+        print("✅ 静音播放正常结束")
+
+class _StubStream:
+    """替代sounddevice输出流的桩对象"""
+    
+    def __init__(self):
+        self.active = False
+        self.closed = False
+    
+    def start(self):
+        self.active = True
+    
+    def stop(self):
+        self.active = False
+    
+    def close(self):
+        self.closed = True
+
+class TestOutputStreamManager(unittest.TestCase):
+    """测试共享输出流的回调分发"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.manager = OutputStreamManager(22050)
+        self.stream = _StubStream()
+        self.manager._stream = self.stream
+    
+    def _pull(self, frames=256):
+        outdata = np.full((frames, 1), 0.5, dtype=np.float32)
+        self.manager._callback(outdata, frames, None, None)
+        return outdata[:, 0]
+    
+    def test_callback_routing(self):
+        """测试回调转发给当前播放方，被替换时通知旧播放方"""
+        # 没有播放方时输出静音
+        np.testing.assert_array_equal(self._pull(), 0.0)
+        
+        replaced = []
+        first = lambda outdata, frames, time, status: outdata.fill(0.25)
+        second = lambda outdata, frames, time, status: outdata.fill(0.75)
+        self.manager.attach(first, lambda: replaced.append('first'))
+        self.assertTrue(self.stream.active)
+        np.testing.assert_array_equal(self._pull(), 0.25)
+        
+        self.manager.attach(second)
+        self.assertEqual(replaced, ['first'])
+        np.testing.assert_array_equal(self._pull(), 0.75)
+        
+        # 已被替换的播放方不能移除当前播放方
+        self.manager.detach(first)
+        self.assertTrue(self.manager.is_attached(second))
+        self.manager.detach(second)
+        np.testing.assert_array_equal(self._pull(), 0.0)
+        
+        self.manager.close()
+        self.assertTrue(self.stream.closed)
+        self.assertTrue(self.manager.closed)
+        
+        print("✅ 输出流回调分发正常")
+
+class TestStreamingLoad(unittest.TestCase):
+    """测试流式加载"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.processor = AudioProcessor(target_sr=22050)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.wav_path = os.path.join(self.temp_dir.name, 'tone.wav')
+        t = np.arange(44100 * 2) / 44100
+        tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+        wavfile.write(self.wav_path, 44100, (tone * 32767).astype(np.int16))
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_resampler_matches_resample_poly(self):
+        """测试分块重采样与整段重采样一致"""
+        audio = np.random.default_rng(0).standard_normal(30000).astype(np.float32)
+        resampler = StreamingResampler(48000, 22050)
+        chunks = [resampler.process(audio[i:i + 7000], last=i + 7000 >= len(audio))
+                  for i in range(0, len(audio), 7000)]
+        expected = signal.resample_poly(audio.astype(np.float64), 147, 320)
+        np.testing.assert_allclose(np.concatenate(chunks), expected, atol=1e-5)
+        
+        print("✅ 流式重采样与整段一致")
+    
+    def test_iter_frames(self):
+        """测试固定长度帧与整段加载一致"""
+        audio_data, sr = self.processor.load_audio(self.wav_path)
+        frames = list(self.processor.iter_frames(self.wav_path, frame_size=1000))
+        
+        self.assertEqual(sr, 22050)
+        self.assertEqual(len(audio_data), 44100)
+        self.assertTrue(all(len(frame) == 1000 for frame in frames))
+        np.testing.assert_allclose(np.concatenate(frames)[:len(audio_data)], audio_data, atol=1e-6)
+        
+        print(f"✅ 流式加载: {len(frames)} 帧")
+    
+    def test_load_shapes(self):
+        """测试多声道与空文件的加载形状"""
+        stereo_path = os.path.join(self.temp_dir.name, 'stereo.wav')
+        t = np.arange(44100) / 44100
+        stereo = np.stack([np.sin(2 * np.pi * 440 * t), np.sin(2 * np.pi * 660 * t)], axis=1)
+        wavfile.write(stereo_path, 44100, (0.5 * stereo * 32767).astype(np.int16))
+        audio_data, _ = self.processor.load_audio(stereo_path, mono=False)
+        self.assertEqual(audio_data.shape, (2, 22050))
+        
+        empty_path = os.path.join(self.temp_dir.name, 'empty.wav')
+        wavfile.write(empty_path, 44100, np.zeros((0, 2), dtype=np.int16))
+        audio_data, _ = self.processor.load_audio(empty_path, mono=False)
+        self.assertEqual(audio_data.shape, (2, 0))
+        audio_data, _ = self.processor.load_audio(empty_path)
+        self.assertEqual(audio_data.shape, (0,))
+        
+        print("✅ 加载形状正确")
+
+class TestRealFFTMode(unittest.TestCase):
+    """测试实数FFT分析模式"""
+    
+    def setUp(self):
+        """测试前准备"""
+        t = np.arange(22050 * 2 + 1) / 22050
+        self.audio = 0.4 * np.sin(2 * np.pi * 220 * t + 0.3) + 0.2 * np.sin(2 * np.pi * 660 * t)
+    
+    def test_matches_complex_fft(self):
+        """测试实数FFT与复数FFT分析结果一致，且只保存单边频谱"""
+        real = FrequencyAnalyzer(22050)
+        full = FrequencyAnalyzer(22050, real_fft=False)
+        real_components = real.analyze_audio(self.audio, n_components=2)
+        full_components = full.analyze_audio(self.audio, n_components=2)
+        
+        np.testing.assert_allclose([(c.frequency, c.amplitude, c.phase) for c in real_components],
+                                   [(c.frequency, c.amplitude, c.phase) for c in full_components], rtol=1e-9)
+        self.assertEqual(len(real.fft_data), len(self.audio) // 2 + 1)
+        frequencies, magnitudes = real.get_frequency_spectrum()
+        self.assertTrue(np.all(frequencies > 0))
+        self.assertEqual(len(frequencies), len(magnitudes))
+        
+        print("✅ 实数FFT模式与复数FFT一致")
+    
+    def test_harmonic_lookup(self):
+        """测试谐波查找返回最接近的频点"""
+        analyzer = FrequencyAnalyzer(22050)
+        analyzer.analyze_audio(self.audio, n_components=2)
+        harmonics = analyzer.analyze_harmonic_content(220.0, n_harmonics=4)
+        
+        frequencies, _ = analyzer.get_frequency_spectrum()
+        for harmonic in harmonics:
+            closest = frequencies[np.argmin(np.abs(frequencies - harmonic['expected_frequency']))]
+            self.assertEqual(harmonic['actual_frequency'], closest)
+        self.assertGreater(harmonics[2]['amplitude'], harmonics[1]['amplitude'])
+        
+        print("✅ 谐波查找正常")
+
+class TestIncrementalReconstruction(unittest.TestCase):
+    """测试增量重构"""
+    
+    def _direct(self, components, n_samples):
+        """逐分量直接合成"""
+        t = np.arange(n_samples) / 22050
+        audio = np.zeros(n_samples)
+        for c in components:
+            if c.enabled:
+                audio += c.amplitude * np.sin(2 * np.pi * c.frequency * t + c.phase)
+        return audio
+    
+    def test_matches_full_resynthesis(self):
+        """测试调节振幅和开关分量后与整段重新合成一致"""
+        t = np.arange(22050 * 2) / 22050
+        audio = 0.4 * np.sin(2 * np.pi * 220 * t) + 0.3 * np.sin(2 * np.pi * 330 * t + 1.0)
+        analyzer = FrequencyAnalyzer(22050)
+        components = analyzer.analyze_audio(audio, n_components=2)
+        first = analyzer.reconstruct_audio(copy=False)
+        
+        components[0].amplitude = components[0].original_amplitude * 1.5
+        components[1].enabled = False
+        updated = analyzer.reconstruct_audio(copy=False)
+        self.assertIs(updated, first)
+        self.assertFalse(updated.flags.writeable)
+        np.testing.assert_allclose(updated, self._direct(components, len(audio)), atol=1e-9)
+        
+        # 默认返回副本，不随后续调节变化
+        snapshot = analyzer.reconstruct_audio()
+        components[1].enabled = True
+        analyzer.reconstruct_audio()
+        np.testing.assert_allclose(snapshot, self._direct([components[0]], len(audio)), atol=1e-9)
+        
+        print("✅ 增量重构与整段合成一致")
+
+class TestSinusoidalModel(unittest.TestCase):
+    """测试正弦建模分析与合成"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.model = SinusoidalModel(22050)
+        self.t = np.arange(22050) / 22050
+    
+    def test_steady_partials(self):
+        """测试稳态分量的参数估计和重新合成"""
+        audio = 0.3 * np.sin(2 * np.pi * 440.7 * self.t + 0.5) + 0.1 * np.sin(2 * np.pi * 1234.5 * self.t)
+        tracks = self.model.analyze(audio)
+        self.assertEqual(len(tracks), 2)
+        strongest = max(tracks, key=lambda track: track.amplitudes.mean())
+        np.testing.assert_allclose(strongest.frequencies[5:-5], 440.7, atol=1e-3)
+        np.testing.assert_allclose(strongest.amplitudes[5:-5], 0.3, rtol=1e-3)
+        
+        resynthesized = self.model.synthesize(tracks, len(audio))
+        interior = slice(2048, -2048)
+        np.testing.assert_allclose(resynthesized[interior], audio[interior], atol=1e-4)
+        
+        print("✅ 稳态分量重新合成一致")
+    
+    def test_time_varying_partial(self):
+        """测试频率滑动和振幅衰减的分量被连续跟踪"""
+        frequency = 300 + 20 * self.t
+        envelope = np.exp(-2 * self.t)
+        audio = 0.5 * envelope * np.sin(2 * np.pi * np.cumsum(frequency) / 22050)
+        tracks = self.model.analyze(audio)
+        self.assertEqual(len(tracks), 1)
+        
+        resynthesized = self.model.synthesize(tracks, len(audio))
+        interior = slice(2048, -2048)
+        error = resynthesized[interior] - audio[interior]
+        snr = 10 * np.log10(np.sum(audio[interior] ** 2) / np.sum(error ** 2))
+        self.assertGreater(snr, 30)
+        
+        print(f"✅ 时变分量合成信噪比: {snr:.1f} dB")
+
+class TestSpectrogramPyramid(unittest.TestCase):
+    """测试频谱图金字塔"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.sample_rate = 22050
+        t = np.arange(self.sample_rate * 4) / self.sample_rate
+        # 前两秒440Hz，后两秒880Hz
+        frequency = np.where(t < 2, 440, 880)
+        self.audio = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+        self.analyzer = FrequencyAnalyzer(sample_rate=self.sample_rate)
+    
+    def test_full_resolution_matches_librosa(self):
+        """测试全分辨率频谱图与直接计算一致，重复调用复用金字塔"""
+        import librosa
+        magnitude_db, frequencies, times = self.analyzer.create_spectrogram(self.audio)
+        stft = librosa.stft(self.audio, n_fft=2048, hop_length=512)
+        expected = librosa.amplitude_to_db(np.abs(stft), ref=np.max)
+        np.testing.assert_allclose(magnitude_db, expected, atol=1e-3)
+        self.assertEqual(len(times), expected.shape[1])
+        
+        pyramid = self.analyzer.spectrogram_pyramid
+        self.analyzer.create_spectrogram(self.audio)
+        self.assertIs(self.analyzer.spectrogram_pyramid, pyramid)
+        
+        print("✅ 全分辨率频谱图一致")
+    
+    def test_view_respects_canvas_width(self):
+        """测试按画布宽度选择层级，max统计保留峰值"""
+        full, frequencies, _ = self.analyzer.create_spectrogram(self.audio)
+        data, _, times = self.analyzer.get_spectrogram_view(max_columns=20, statistic='max')
+        self.assertLessEqual(data.shape[1], 20)
+        np.testing.assert_allclose(data.max(), full.max(), atol=1e-4)
+        
+        # 局部放大只返回可见时间范围
+        data, _, times = self.analyzer.get_spectrogram_view(2.5, 3.0, max_columns=1000)
+        self.assertTrue(np.all((times > 2.4) & (times < 3.1)))
+        peak = frequencies[np.argmax(data.mean(axis=1))]
+        self.assertAlmostEqual(peak, 880, delta=frequencies[1])
+        
+        print("✅ 频谱图视图层级选择正确")
+    
+    def test_disk_cache(self):
+        """测试缓存目录的写入、复用和失效"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'clip.wav')
+            wavfile.write(path, self.sample_rate, self.audio)
+            
+            cache_dir = path + '.spectrogram'
+            built = SpectrogramPyramid.for_file(path, self.audio, self.sample_rate)
+            self.assertTrue(os.path.exists(os.path.join(cache_dir, 'sr22050_w2048_h512', 'meta.json')))
+            
+            loaded = SpectrogramPyramid.for_file(path, self.audio, self.sample_rate)
+            self.assertIsInstance(loaded.levels[0]['max'], np.memmap)
+            np.testing.assert_array_equal(loaded.view(max_columns=50)[0], built.view(max_columns=50)[0])
+            
+            # 参数改变时写入独立目录，原参数的缓存保留
+            rebuilt = SpectrogramPyramid.for_file(path, self.audio, self.sample_rate, hop_length=256)
+            self.assertEqual(rebuilt.hop_length, 256)
+            self.assertEqual(sorted(os.listdir(cache_dir)), ['sr22050_w2048_h256', 'sr22050_w2048_h512'])
+            
+            # 文件未变但音频数据被编辑时不复用旧缓存
+            original_peak = built.view(0.0, 0.5)[0].max()
+            edited = self.audio.copy()
+            edited[:self.sample_rate] = 0
+            stale = SpectrogramPyramid.for_file(path, edited, self.sample_rate)
+            self.assertLess(stale.view(0.0, 0.5)[0].max(), original_peak)
+            
+            # 分析器的内存缓存同样按内容识别
+            first = self.analyzer.get_spectrogram_pyramid(self.audio, source_path=path)
+            second = self.analyzer.get_spectrogram_pyramid(edited, source_path=path)
+            self.assertIsNot(first, second)
+            
+            del built, loaded, rebuilt, stale, first, second
+        
+        print("✅ 频谱图磁盘缓存正常")
+
 def run_integration_test():
     """运行集成测试"""
     print("\n🔄 运行集成测试...")
@@ -255,6 +662,13 @@ def main():
     test_suite.addTest(unittest.makeSuite(TestAudioProcessor))
     test_suite.addTest(unittest.makeSuite(TestFrequencyAnalyzer))
     test_suite.addTest(unittest.makeSuite(TestAudioPlayer))
+    test_suite.addTest(unittest.makeSuite(TestPlayerCallback))
+    test_suite.addTest(unittest.makeSuite(TestOutputStreamManager))
+    test_suite.addTest(unittest.makeSuite(TestStreamingLoad))
+    test_suite.addTest(unittest.makeSuite(TestRealFFTMode))
+    test_suite.addTest(unittest.makeSuite(TestIncrementalReconstruction))
+    test_suite.addTest(unittest.makeSuite(TestSinusoidalModel))
+    test_suite.addTest(unittest.makeSuite(TestSpectrogramPyramid))
     
     # 运行测试
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+音频公共模块
+音频分析器与简谐振动音乐可视化共用的音频合成与输出组件
+"""
+
+from .period_table import PeriodTable
+
+__all__ = [
+    'PeriodTable',
+    'OutputStreamManager'
+]
+
+
+def __getattr__(name):
+    # 输出流依赖sounddevice（PortAudio），只在用到时才导入，离线分析无需音频设备
+    if name == 'OutputStreamManager':
+        from .output_stream import OutputStreamManager
+        return OutputStreamManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
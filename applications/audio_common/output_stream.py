@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+音频公共模块 - 音频输出流管理
+在整个进程中复用长期打开的输出流
+"""
+
+import atexit
+import threading
+from typing import Callable, Optional
+
+import sounddevice as sd
+
+
+class OutputStreamManager:
+    """长期存在的音频输出流
+
+    每个(设备, 采样率, 声道数)组合只打开一个输出流并保持运行。播放方通过attach
+    挂接自己的回调，切换播放内容时无需重新打开设备，开始发声的延迟约为一个缓冲周期。
+    没有播放方时输出静音。
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, sample_rate: int, device: Optional[int] = None, channels: int = 1,
+            blocksize: int = 1024) -> 'OutputStreamManager':
+        """
+        获取共享的输出流管理器
+        
+        Args:
+            sample_rate: 采样率
+            device: 输出设备，None表示默认设备
+            channels: 声道数
+            blocksize: 回调块大小，仅在首次创建时生效
+
+        Returns:
+            OutputStreamManager: 共享实例
+        """
+        key = (device, int(sample_rate), channels)
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None or manager.closed:
+                manager = cls(sample_rate, device, channels, blocksize)
+                cls._instances[key] = manager
+            return manager
+
+    @classmethod
+    def close_all(cls) -> None:
+        """关闭所有共享输出流"""
+        with cls._instances_lock:
+            managers = list(cls._instances.values())
+            cls._instances.clear()
+        for manager in managers:
+            manager.close()
+
+    def __init__(self, sample_rate: int, device: Optional[int] = None, channels: int = 1,
+                 blocksize: int = 1024):
+        """
+        初始化输出流管理器（一般通过get获取共享实例）
+        
+        Args:
+            sample_rate: 采样率
+            device: 输出设备，None表示默认设备
+            channels: 声道数
+            blocksize: 回调块大小
+        """
+        self.sample_rate = int(sample_rate)
+        self.device = device
+        self.channels = channels
+        self.blocksize = blocksize
+        self.closed = False
+        self._client = None  # (回调, 被替换时的通知函数)
+        self._stream = None
+        self._lock = threading.Lock()
+
+    @property
+    def latency(self) -> float:
+        """一个缓冲周期的时长(秒)"""
+        return self.blocksize / self.sample_rate
+
+    @property
+    def active(self) -> bool:
+        """输出流是否正在运行"""
+        return self._stream is not None and self._stream.active
+
+    def attach(self, callback: Callable, on_replaced: Optional[Callable[[], None]] = None) -> None:
+        """
+        挂接播放回调，替换当前的播放方
+        
+        Args:
+            callback: 与sounddevice相同签名的回调 (outdata, frames, time, status)
+            on_replaced: 被其他播放方替换时调用的无参函数
+        """
+        with self._lock:
+            self._ensure_started()
+            previous = self._client
+            self._client = (callback, on_replaced)
+        if previous is not None and previous[0] != callback and previous[1] is not None:
+            previous[1]()
+
+    def detach(self, callback: Callable) -> None:
+        """
+        移除播放回调（仅当它仍是当前播放方时），之后输出静音
+        
+        Args:
+            callback: attach时传入的回调
+        """
+        with self._lock:
+            if self._client is not None and self._client[0] == callback:
+                self._client = None
+
+    def is_attached(self, callback: Callable) -> bool:
+        """判断回调是否为当前播放方"""
+        client = self._client
+        return client is not None and client[0] == callback
+
+    def close(self) -> None:
+        """停止并关闭输出流"""
+        with self._lock:
+            self.closed = True
+            self._client = None
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+
+    def _ensure_started(self):
+        if self._stream is None:
+            self._stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                blocksize=self.blocksize,
+                device=self.device,
+                channels=self.channels,
+                dtype='float32',
+                callback=self._callback
+            )
+        if not self._stream.active:
+            self._stream.start()
+
+    def _callback(self, outdata, frames, time, status):
+        client = self._client
+        if client is None:
+            outdata.fill(0)
+            return
+        client[0](outdata, frames, time, status)
+
+
+atexit.register(OutputStreamManager.close_all)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+音频公共模块 - 周期表振荡器
+缓存正弦叠加的一个精确周期，通过平铺或相位递推生成任意时长的音频
+"""
+
+import numpy as np
+from fractions import Fraction
+from math import gcd
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+
+class PeriodTable:
+    """相位相干的周期表振荡器
+
+    对于有理频率组合（如440Hz与444Hz的拍），采样序列在最小公倍周期后严格重复，
+    只需计算一个周期再平铺即可。周期过长时，为每个频率缓存一个基础块，
+    后续块通过整体相位旋转得到，每块只需常数次三角函数计算。
+    """
+
+    def __init__(self, sample_rate: int = 44100, max_period: Optional[int] = None,
+                 block_size: int = 4096, max_entries: int = 32):
+        """
+        初始化周期表
+        
+        Args:
+            sample_rate: 采样率
+            max_period: 允许缓存的最长周期(采样点数)，默认1秒
+            block_size: 相位递推时每个基础块的长度
+            max_entries: 周期和基础块缓存的最大条目数
+        """
+        self.sample_rate = int(sample_rate)
+        self.max_period = int(max_period) if max_period is not None else self.sample_rate
+        self.block_size = int(block_size)
+        self.max_entries = max_entries
+        self._periods = OrderedDict()
+        self._bases = OrderedDict()
+
+    def period_length(self, frequencies: Sequence[float]) -> Optional[int]:
+        """
+        计算频率组合的精确周期
+        
+        Args:
+            frequencies: 频率列表(Hz)
+
+        Returns:
+            int: 采样序列严格重复的最小长度，不存在或超过max_period时返回None
+        """
+        period = 1
+        for frequency in frequencies:
+            ratio = Fraction(float(frequency)).limit_denominator(1000)
+            if abs(float(ratio) - frequency) > 1e-9 * max(1.0, abs(frequency)):
+                return None
+            # f/sr 化为最简分数后的分母就是该分量的周期
+            single = (ratio / self.sample_rate).denominator
+            period = period * single // gcd(period, single)
+            if period > self.max_period:
+                return None
+        return period
+
+    def period_wave(self, frequencies: Sequence[float], amplitudes: Sequence[float],
+                    phases: Optional[Sequence[float]] = None) -> Optional[np.ndarray]:
+        """
+        获取一个精确周期的叠加波形
+        
+        Args:
+            frequencies: 频率列表(Hz)
+            amplitudes: 振幅列表
+            phases: 初始相位列表(弧度)，默认全为0
+
+        Returns:
+            numpy.ndarray: 只读的单周期波形，不存在短周期时返回None
+        """
+        frequencies, amplitudes, phases = self._as_arrays(frequencies, amplitudes, phases)
+        key = ('period',) + self._key(frequencies, amplitudes, phases)
+        wave = self._lookup(self._periods, key)
+        if wave is not None:
+            return wave
+
+        period = self.period_length(frequencies)
+        if period is None:
+            return None
+
+        n = np.arange(period)
+        omega = 2 * np.pi * frequencies / self.sample_rate
+        wave = amplitudes @ np.sin(omega[:, None] * n + phases[:, None])
+        wave.setflags(write=False)
+        self._store(self._periods, key, wave)
+        return wave
+
+    def render(self, frequencies: Sequence[float], amplitudes: Sequence[float], n_samples: int,
+               phases: Optional[Sequence[float]] = None) -> np.ndarray:
+        """生成任意长度的正弦叠加音频
+
+        结果与直接计算 sum(a * sin(2πf·n/sr + φ)) 一致。
+
+        Args:
+            frequencies: 频率列表(Hz)
+            amplitudes: 振幅列表
+            n_samples: 采样点数
+            phases: 初始相位列表(弧度)，默认全为0
+
+        Returns:
+            numpy.ndarray: 可修改的float64音频数组
+        """
+        n_samples = int(n_samples)
+        frequencies, amplitudes, phases = self._as_arrays(frequencies, amplitudes, phases)
+        if n_samples <= 0 or len(frequencies) == 0:
+            return np.zeros(max(n_samples, 0))
+
+        # 有短周期时直接平铺
+        wave = self.period_wave(frequencies, amplitudes, phases)
+        if wave is not None:
+            return np.resize(wave, n_samples)
+
+        # 否则逐块旋转基础块：sin(θk + ωn) = sinθk·cosωn + cosθk·sinωn
+        base_cos, base_sin = self.base_blocks(frequencies)
+        block = self.block_size
+        n_blocks = -(-n_samples // block)
+        omega = 2 * np.pi * frequencies / self.sample_rate
+        theta = np.arange(n_blocks)[:, None] * (omega * block) + phases
+        rot_cos = amplitudes * np.cos(theta)
+        rot_sin = amplitudes * np.sin(theta)
+        audio = rot_sin @ base_cos + rot_cos @ base_sin
+        return audio.reshape(-1)[:n_samples]
+
+    def clear(self) -> None:
+        """清空所有缓存"""
+        self._periods.clear()
+        self._bases.clear()
+
+    def base_blocks(self, frequencies: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取各频率基础块的cos/sin矩阵
+
+        基础块只与频率有关，任意相位和振幅的块都可由它旋转得到：
+        a·sin(φ + ωn) = a·sinφ·cos(ωn) + a·cosφ·sin(ωn)
+
+        Args:
+            frequencies: 频率列表(Hz)
+
+        Returns:
+            Tuple[cos(ωn), sin(ωn)]，形状均为 (频率数, block_size)
+        """
+        frequencies = np.asarray(frequencies, dtype=np.float64).reshape(-1)
+        n = np.arange(self.block_size)
+        base_cos = np.empty((len(frequencies), self.block_size))
+        base_sin = np.empty((len(frequencies), self.block_size))
+        for i, frequency in enumerate(frequencies):
+            key = round(float(frequency), 6)
+            base = self._lookup(self._bases, key)
+            if base is None:
+                angle = 2 * np.pi * frequency / self.sample_rate * n
+                base = (np.cos(angle), np.sin(angle))
+                self._store(self._bases, key, base)
+            base_cos[i], base_sin[i] = base
+        return base_cos, base_sin
+
+    def _as_arrays(self, frequencies, amplitudes, phases):
+        frequencies = np.asarray(frequencies, dtype=np.float64).reshape(-1)
+        amplitudes = np.broadcast_to(np.asarray(amplitudes, dtype=np.float64), frequencies.shape)
+        if phases is None:
+            phases = np.zeros_like(frequencies)
+        else:
+            phases = np.broadcast_to(np.asarray(phases, dtype=np.float64), frequencies.shape)
+        return frequencies, amplitudes, phases
+
+    @staticmethod
+    def _key(frequencies, amplitudes, phases):
+        return tuple(round(float(v), 6) for v in np.concatenate([frequencies, amplitudes, phases]))
+
+    @staticmethod
+    def _lookup(table, key):
+        value = table.get(key)
+        if value is not None:
+            table.move_to_end(key)
+        return value
+
+    def _store(self, table, key, value):
+        table[key] = value
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
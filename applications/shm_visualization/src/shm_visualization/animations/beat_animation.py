@@ -4,10 +4,12 @@
 """
 
 import numpy as np
-import time
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot, QEvent
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QEvent
 import sys
 
+from .frame_scheduler import FrameScheduler
+from .wave_frames import ShiftedSine, BeatEnvelope
+
 
 class BeatAnimationController(QObject):
     """
@@ -24,7 +26,6 @@ class BeatAnimationController(QObject):
         # 动画状态
         self.is_paused = True
         self.time_counter = 0
-        self.last_frame_time = time.time()
         
         # 波形和轨迹数据
         self.wave1_data = []  # 第一个简谐振动
@@ -37,27 +38,23 @@ class BeatAnimationController(QObject):
         # 时间数据 - 减少采样点以优化性能
         self.t = np.linspace(0, 10, 600)  # 减少采样点从1000到600
         
-        # 初始化动画定时器 - 进一步优化流畅度
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_animation)
-        self.timer.setInterval(12)  # 约83 FPS (1000/12) - 优化流畅度，减少帧跳跃
+        # 平移波形帧生成器，参数变化时才重新计算正弦/余弦基
+        self._wave1 = ShiftedSine(self.t)
+        self._wave2 = ShiftedSine(self.t)
+        self._envelope = BeatEnvelope(self.t)
         
-        # 优化变量，缓存上一次的参数值
-        self._last_params = {}
-        self._needs_full_recalculation = True
-
-        # 预计算帧数据
-        self._next_frame_data = None
-
-        # 帧率控制
-        self._frame_count = 0
-        self._last_fps_time = 0
-        self._current_fps = 0
+        # 每帧原地写入的输出缓冲区，稳态下动画循环不分配数组
+        self._buffers = {name: np.empty_like(self.t) for name in
+                         ('wave1', 'wave2', 'composite', 'envelope_up', 'envelope_down')}
+        
+        # 由共享帧调度器驱动
+        self.scheduler = FrameScheduler.instance()
+        
+        # 上一次计算波形时使用的参数快照，参数不变时快照是同一个对象
+        self._last_params = None
 
-        # 性能优化
+        # 性能优化（帧率统计由共享帧调度器负责）
         self._high_performance = True  # 高性能模式
-        self._use_double_buffering = True  # 使用双缓冲
-        self._log_fps = False  # 是否记录帧率
 
         # 数学计算缓存
         self._sin_cache = {}
@@ -73,7 +70,6 @@ class BeatAnimationController(QObject):
     
     def initialize_data(self):
         """初始化数据并计算初始波形"""
-        self._needs_full_recalculation = True
         self.calculate_waves(0)
         self.calculate_beat_frequency()
     
@@ -89,11 +85,10 @@ class BeatAnimationController(QObject):
         phi1 = params['phi1']
         phi2 = params['phi2']
         
-        # 如果参数没变化且不需要全面重新计算，使用预计算数据
-        if not self._needs_full_recalculation and self._check_if_params_unchanged(params) and self._next_frame_data is not None:
-            self.wave1_data, self.wave2_data, self.composite_data, self.envelope_up, self.envelope_down = self._next_frame_data
-            self._next_frame_data = None
-            return
+        # 参数变化时重新计算基，否则直接复用
+        self._wave1.set_params(A1, omega1, phi1)
+        self._wave2.set_params(A2, omega2, phi2)
+        self._envelope.set_params(A1, A2, omega1, omega2, phi1, phi2)
         
         # 波形移动速度因子 - 更慢的移动使动画更清晰
         move_speed = 0.3
@@ -101,98 +96,22 @@ class BeatAnimationController(QObject):
         # 计算波形移动的偏移量 - 确保在视窗内循环
         wave_offset = (t_offset * move_speed) % 10
         
-        # 为了确保波形从左向右移动，我们需要减去这个偏移量
-        t_array = self.t - wave_offset
-        
-        # 使用向量化操作一次性计算所有波形，提高效率
-        self.wave1_data = A1 * np.sin(omega1 * t_array + phi1)
-        self.wave2_data = A2 * np.sin(omega2 * t_array + phi2)
-        self.composite_data = self.wave1_data + self.wave2_data
+        # 波形整体向右平移wave_offset，由预计算的基按和角公式合成
+        buffers = self._buffers
+        self.wave1_data = self._wave1.frame(wave_offset, out=buffers['wave1'])
+        self.wave2_data = self._wave2.frame(wave_offset, out=buffers['wave2'])
+        self.composite_data = np.add(self.wave1_data, self.wave2_data, out=buffers['composite'])
         
         # 计算包络线（拍现象的特征）
-        if abs(omega1 - omega2) > 0.001:  # 确保频率确实不同
-            # 使用向量化计算包络线
-            phase_diff = (omega1 - omega2) * t_array + (phi1 - phi2)
-            amplitude = np.sqrt(A1**2 + A2**2 + 2*A1*A2*np.cos(phase_diff))
-            self.envelope_up = amplitude
-            self.envelope_down = -amplitude
-        else:
-            # 如果频率几乎相同，使用振幅和
-            amplitude = A1 + A2
-            self.envelope_up = np.ones_like(self.t) * amplitude
-            self.envelope_down = np.ones_like(self.t) * -amplitude
+        self.envelope_up, self.envelope_down = self._envelope.frame(
+            wave_offset, buffers['envelope_up'], buffers['envelope_down'])
         
         # 更新缓存的参数
         self._update_cached_params(params)
-        
-        # 计算帧率
-        if self._log_fps:
-            self._frame_count += 1
-            current_time = time.time()
-            elapsed = current_time - self._last_fps_time
-            if elapsed >= 1.0:  # 每秒更新一次帧率
-                self._current_fps = self._frame_count / elapsed
-                self._frame_count = 0
-                self._last_fps_time = current_time
-                print(f"FPS: {self._current_fps:.1f}")
-            
-        # 如果处于高性能模式，预计算下一帧
-        if self._high_performance and self._use_double_buffering:
-            self._precompute_next_frame(t_offset + 0.008 * params['speed'])  # 根据新的定时器间隔调整
-        
-        # 重置重新计算标志
-        self._needs_full_recalculation = False
-    
-    def _precompute_next_frame(self, next_t_offset):
-        """预计算下一帧数据，以提高性能"""
-        params = self.params_controller.get_params()
-        
-        # 使用向量化操作计算下一帧
-        omega1 = params['omega1']
-        omega2 = params['omega2']
-        A1 = params['A1']
-        A2 = params['A2']
-        phi1 = params['phi1']
-        phi2 = params['phi2']
-        
-        # 计算下一帧的移动偏移
-        move_speed = 0.3
-        next_wave_offset = (next_t_offset * move_speed) % 10
-        t_array = self.t - next_wave_offset
-        
-        # 计算下一帧的所有波形数据 - 一次性计算所有波形
-        next_wave1 = A1 * np.sin(omega1 * t_array + phi1)
-        next_wave2 = A2 * np.sin(omega2 * t_array + phi2)
-        next_composite = next_wave1 + next_wave2
-        
-        # 计算下一帧的包络线
-        if abs(omega1 - omega2) > 0.001:
-            phase_diff = (omega1 - omega2) * t_array + (phi1 - phi2)
-            amplitude = np.sqrt(A1**2 + A2**2 + 2*A1*A2*np.cos(phase_diff))
-            next_envelope_up = amplitude
-            next_envelope_down = -amplitude
-        else:
-            amplitude = A1 + A2
-            next_envelope_up = np.ones_like(self.t) * amplitude
-            next_envelope_down = np.ones_like(self.t) * -amplitude
-        
-        # 存储预计算结果
-        self._next_frame_data = (next_wave1, next_wave2, next_composite, next_envelope_up, next_envelope_down)
-    
-    def _check_if_params_unchanged(self, params):
-        """检查参数是否变化"""
-        if not self._last_params:
-            return False
-            
-        important_params = ['A1', 'A2', 'omega1', 'omega2', 'phi1', 'phi2', 'speed']
-        for param in important_params:
-            if param not in self._last_params or params[param] != self._last_params[param]:
-                return False
-        return True
     
     def _update_cached_params(self, params):
-        """更新缓存的参数"""
-        self._last_params = params.copy()
+        """更新缓存的参数（参数快照只读，直接保存引用）"""
+        self._last_params = params
     
     def calculate_current_position(self, t_offset):
         """计算当前位置 - 现在是y轴上的位置值"""
@@ -228,57 +147,29 @@ class BeatAnimationController(QObject):
         return beat_freq, beat_period, main_freq
 
     def _check_if_params_changed(self, current_params):
-        """检查参数是否发生变化"""
-        key_params = ['A1', 'A2', 'omega1', 'omega2', 'phi1', 'phi2', 'trail_length']
+        """检查参数自上次计算波形后是否发生变化（参数变化时快照会重新生成）"""
+        return current_params is not self._last_params
 
-        for param in key_params:
-            if param not in self._last_params or self._last_params[param] != current_params[param]:
-                # 更新缓存
-                self._last_params = {k: current_params[k] for k in key_params}
-                return True
-        return False
-
-    def _update_time_dependent_only(self, t_offset):
-        """只更新时间相关的部分，避免完全重绘"""
-        if hasattr(self, 'wave1_data') and hasattr(self, 'wave2_data'):
-            # 只更新当前点的位置，不重新计算整个波形
-            self.current_position = self.calculate_current_position(t_offset)
-
-            # 发送更新信号
-            self.update_signal.emit()
-    
-    @pyqtSlot()
-    def update_animation(self):
-        """更新动画帧 - 优化版本"""
+    def advance_frame(self, dt):
+        """推进一帧，由帧调度器调用，dt为距上一帧的时间（秒）"""
         if self.is_paused:
             return
 
-        # 使用高精度计时提高帧率一致性
-        current_time = time.time()
-        dt = current_time - self.last_frame_time
-        self.last_frame_time = current_time
-
-        # 帧率控制：跳过过快的帧
-        if dt < 0.008:  # 限制最高帧率约125 FPS
-            return
-
         # 获取当前参数
         params = self.params_controller.get_params()
         speed = params['speed']
 
         # 检查参数是否变化，避免不必要的重绘
         params_changed = self._check_if_params_changed(params)
+        if not params_changed and dt <= 0:
+            # 时间和参数都没有变化，合并为上一帧
+            return
 
         # 更新时间计数器，控制动画速度
         self.time_counter += dt * speed
         t_offset = self.time_counter
 
-        # 只有在参数变化或时间推进时才重新计算
-        if params_changed or dt > 0.01:
-            self.calculate_waves(t_offset)
-        else:
-            # 使用缓存的数据，只更新时间相关的部分
-            self._update_time_dependent_only(t_offset)
+        self.calculate_waves(t_offset)
         
         # 计算当前点的位置
         self.current_position = self.calculate_current_position(t_offset)
@@ -289,15 +180,13 @@ class BeatAnimationController(QObject):
     def play(self):
         """播放动画"""
         if self.is_paused:
-            # 恢复定时器
             self.is_paused = False
-            self.last_frame_time = time.time()
-            self.timer.start()
+            self.scheduler.attach(self)
     
     def pause(self):
         """暂停动画"""
         self.is_paused = True
-        self.timer.stop()
+        self.scheduler.detach(self)
     
     def reset(self):
         """重置动画"""
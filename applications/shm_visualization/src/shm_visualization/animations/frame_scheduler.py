@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+简谐运动模拟 - 共享帧调度器
+所有动画控制器由同一个单调时钟（perf_counter）驱动，每个时钟周期每个控制器只推进一帧
+"""
+
+import time
+import weakref
+from PyQt6.QtCore import QObject, QTimer, QEvent, Qt
+
+
+class FrameScheduler(QObject):
+    """
+    共享帧调度器
+    用单次触发的定时器逐帧重新调度，渲染跟不上时降低帧率而不是堆积定时器事件；
+    绑定的窗口隐藏或最小化时对应控制器暂停，全部暂停时定时器停止；
+    窗口关闭后解除绑定。控制器和窗口都只被弱引用，调度器不会延长它们的生命周期
+    """
+
+    _instance = None
+
+    def __init__(self, interval_ms=12, max_frame_dt=0.25):
+        """
+        初始化帧调度器
+
+        Args:
+            interval_ms: 目标帧间隔（毫秒），12毫秒约为83 FPS
+            max_frame_dt: 单帧最大时间步长（秒），长时间卡顿后动画不会突然跳跃
+        """
+        super().__init__()
+        self.interval = interval_ms / 1000
+        self.max_frame_dt = max_frame_dt
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+
+        # 控制器 -> 上一帧的时钟值（None表示下一帧重新开始计时）
+        self._clients = weakref.WeakKeyDictionary()
+        # 控制器 -> 所在窗口的弱引用
+        self._windows = weakref.WeakKeyDictionary()
+
+        # 渲染耗时的滑动平均，用于自适应帧间隔
+        self._frame_cost = 0.0
+
+        # 帧率统计
+        self.fps = 0.0
+        self.dropped_frames = 0
+        self.log_fps = False
+        self._fps_frames = 0
+        self._fps_start = time.perf_counter()
+
+    @classmethod
+    def instance(cls):
+        """获取全局共享的调度器"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def bind_window(self, controller, window):
+        """
+        把控制器与显示它的窗口关联，窗口隐藏或最小化时该控制器暂停
+
+        Args:
+            controller: 动画控制器
+            window: 顶层窗口
+        """
+        self._windows[controller] = weakref.ref(window)
+        window.installEventFilter(self)
+        controller_ref = weakref.ref(controller)
+        window.destroyed.connect(lambda *args: self._on_window_destroyed(controller_ref))
+
+    def unbind_window(self, controller):
+        """
+        解除控制器与窗口的关联并停止驱动它，窗口关闭或销毁时自动调用
+
+        Args:
+            controller: 动画控制器，None时忽略
+        """
+        if controller is None:
+            return
+        self._windows.pop(controller, None)
+        self.detach(controller)
+
+    def attach(self, controller):
+        """开始驱动控制器，控制器需要实现 advance_frame(dt)"""
+        self._clients[controller] = None
+        self._reschedule(0)
+
+    def detach(self, controller):
+        """停止驱动控制器"""
+        self._clients.pop(controller, None)
+        if not self._clients:
+            self.timer.stop()
+
+    def is_attached(self, controller):
+        """控制器是否正在被驱动"""
+        return controller in self._clients
+
+    def _is_visible(self, controller):
+        window_ref = self._windows.get(controller)
+        if window_ref is None:
+            return True
+        window = window_ref()
+        return window is not None and window.isVisible() and not window.isMinimized()
+
+    def eventFilter(self, obj, event):
+        """窗口显示状态变化时恢复或暂停调度，窗口关闭后解除绑定"""
+        if event.type() in (QEvent.Type.Show, QEvent.Type.WindowStateChange) and self._clients:
+            self._reschedule(0)
+        elif event.type() == QEvent.Type.Close:
+            # 关闭事件可能被窗口忽略，等事件处理完再确认窗口确实已关闭
+            window_ref = weakref.ref(obj)
+            QTimer.singleShot(0, lambda: self._on_window_closed(window_ref))
+        return super().eventFilter(obj, event)
+
+    def _on_window_destroyed(self, controller_ref):
+        try:
+            self.unbind_window(controller_ref())
+        except RuntimeError:
+            # 程序退出时调度器的定时器可能先于窗口被销毁
+            pass
+
+    def _on_window_closed(self, window_ref):
+        window = window_ref()
+        try:
+            if window is None or window.isVisible():
+                return
+        except RuntimeError:
+            # 窗口已被Qt删除，destroyed信号已经完成清理
+            return
+        for controller, bound in list(self._windows.items()):
+            if bound() is window:
+                self.unbind_window(controller)
+        window.removeEventFilter(self)
+
+    def _reschedule(self, delay):
+        if not self.timer.isActive():
+            self.timer.start(max(0, int(round(delay * 1000))))
+
+    def _tick(self):
+        """推进所有可见控制器一帧"""
+        now = time.perf_counter()
+        active = 0
+        for controller in list(self._clients):
+            if not self._is_visible(controller):
+                # 隐藏期间不计时，恢复显示时从当前时刻继续
+                self._clients[controller] = None
+                continue
+
+            last = self._clients[controller]
+            dt = 0.0 if last is None else min(now - last, self.max_frame_dt)
+            self._clients[controller] = now
+            active += 1
+            if last is not None and dt > 1.5 * self.interval:
+                self.dropped_frames += int(dt / self.interval) - 1
+            controller.advance_frame(dt)
+
+        if not active:
+            # 没有可见的控制器，等待窗口重新显示
+            return
+
+        work = time.perf_counter() - now
+        self._frame_cost = 0.9 * self._frame_cost + 0.1 * work
+        self._update_fps(now)
+
+        # 渲染跟不上时拉长帧间隔，给事件循环留出处理输入的时间
+        period = max(self.interval, 1.25 * self._frame_cost)
+        if self._clients:
+            self._reschedule(max(period - work, 0.001))
+
+    def _update_fps(self, now):
+        self._fps_frames += 1
+        elapsed = now - self._fps_start
+        if elapsed >= 1.0:
+            self.fps = self._fps_frames / elapsed
+            if self.log_fps:
+                print(f"动画FPS: {self.fps:.1f}, 丢帧: {self.dropped_frames}")
+            self._fps_frames = 0
+            self._fps_start = now
@@ -4,8 +4,10 @@
 """
 
 import numpy as np
-import time
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from .frame_scheduler import FrameScheduler
+from .wave_frames import ShiftedSine
 
 
 class OrthogonalAnimationController(QObject):
@@ -23,7 +25,6 @@ class OrthogonalAnimationController(QObject):
         # 动画状态
         self.is_paused = True
         self.time_counter = 0
-        self.last_frame_time = time.time()
         
         # 轨迹数据
         self.trail_points = [[], []]
@@ -39,26 +40,24 @@ class OrthogonalAnimationController(QObject):
         # 时间数据 - 优化采样点减少计算量
         self.t = np.linspace(0, 10, 300)  # 从400减少到300点
         
+        # 平移波形帧生成器和原地写入的输出缓冲区，稳态下动画循环不分配数组
+        self._wave_x = ShiftedSine(self.t)
+        self._wave_y = ShiftedSine(self.t)
+        self._x_buffer = np.empty_like(self.t)
+        self._y_buffer = np.empty_like(self.t)
+        
         # 添加参数变化检测
         self._last_params = {}
         
         # 添加性能优化变量
         self._needs_full_recalculation = True
-        self._next_frame_data = None
         self._use_double_buffering = True
         self._precomputed_lissajous = False
         self._lissajous_cache = {}
         
-        # 初始化动画定时器 - 优化流畅度
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_animation)
-        self.timer.setInterval(12)  # 约83 FPS (1000/12) - 提高流畅度
-        
-        # 帧率监控
+        # 由共享帧调度器驱动，帧率统计也在调度器中
+        self.scheduler = FrameScheduler.instance()
         self._frame_count = 0
-        self._last_fps_time = 0
-        self._current_fps = 0
-        self._monitor_fps = True  # 启用帧率监控
         
         # 抗锯齿和高质量渲染
         self._high_quality = True
@@ -108,73 +107,25 @@ class OrthogonalAnimationController(QObject):
     def calculate_wave_x(self, t_offset):
         """计算X方向波形"""
         params = self.params_controller.get_params()
+        self._wave_x.set_params(params['A1'], params['omega1'], params['phi1'])
         
-        # 使用预计算数据（如有）
-        if not self._needs_full_recalculation and self._next_frame_data is not None:
-            x_data, _ = self._next_frame_data
-            self._next_frame_data = None
-            return x_data
-            
-        # 波形移动速度因子 - 更慢的移动使动画更清晰
-        move_speed = 0.3
-        
-        # 计算波形移动的偏移量 - 确保在视窗内循环
-        wave_offset = (t_offset * move_speed) % 10
-        
-        # 为了确保波形从左向右移动，我们需要减去这个偏移量
-        # 使用-5到5的范围，与波形图中的设置匹配
-        t_array = self.t - wave_offset
-        
-        # 使用向量化操作生成波形，提高效率
-        return params['A1'] * np.sin(params['omega1'] * t_array + params['phi1'])
+        # 波形整体向右平移，由预计算的基按和角公式合成
+        return self._wave_x.frame(self._wave_offset(t_offset), out=self._x_buffer)
     
     def calculate_wave_y(self, t_offset):
         """计算Y方向波形"""
         params = self.params_controller.get_params()
+        self._wave_y.set_params(params['A2'], params['omega2'], params['phi2'])
         
-        # 使用预计算数据（如有）
-        if not self._needs_full_recalculation and self._next_frame_data is not None:
-            _, y_data = self._next_frame_data
-            return y_data
-            
-        # 波形移动速度因子 - 更慢的移动使动画更清晰
-        move_speed = 0.3
-        
-        # 计算波形移动的偏移量 - 确保在视窗内循环
-        wave_offset = (t_offset * move_speed) % 10
-        
-        # 为了确保波形从左向右移动，我们需要减去这个偏移量
-        # 使用-5到5的范围，与波形图中的设置匹配
-        t_array = self.t - wave_offset
-        
-        # 使用向量化操作生成波形，提高效率
-        return params['A2'] * np.sin(params['omega2'] * t_array + params['phi2'])
+        # 波形整体向右平移，由预计算的基按和角公式合成
+        return self._wave_y.frame(self._wave_offset(t_offset), out=self._y_buffer)
     
-    def _precompute_next_frame(self, next_t_offset):
-        """预计算下一帧的波形数据"""
-        params = self.params_controller.get_params()
-        A1 = params['A1']
-        omega1 = params['omega1']
-        phi1 = params['phi1']
-        A2 = params['A2']
-        omega2 = params['omega2']
-        phi2 = params['phi2']
-        
-        # 波形移动速度因子
+    @staticmethod
+    def _wave_offset(t_offset):
+        """波形移动的偏移量 - 确保在视窗内循环"""
+        # 波形移动速度因子 - 更慢的移动使动画更清晰
         move_speed = 0.3
-        
-        # 计算波形移动的偏移量
-        next_wave_offset = (next_t_offset * move_speed) % 10
-        
-        # 计算时间数组
-        next_t_array = self.t - next_wave_offset
-        
-        # 一次性计算下一帧的X和Y波形
-        next_x_data = A1 * np.sin(omega1 * next_t_array + phi1)
-        next_y_data = A2 * np.sin(omega2 * next_t_array + phi2)
-        
-        # 存储预计算结果
-        self._next_frame_data = (next_x_data, next_y_data)
+        return (t_offset * move_speed) % 10
     
     def calculate_current_position(self, t_offset):
         """计算当前点的位置"""
@@ -274,17 +225,11 @@ class OrthogonalAnimationController(QObject):
             omega2 = (ratio_y / ratio_x) * omega1
             return omega1, omega2
     
-    @pyqtSlot()
-    def update_animation(self):
-        """更新动画帧"""
+    def advance_frame(self, dt):
+        """推进一帧，由帧调度器调用，dt为距上一帧的时间（秒）"""
         if self.is_paused:
             return
         
-        # 高精度计时以保持平滑的动画速度
-        current_time = time.time()
-        dt = current_time - self.last_frame_time
-        self.last_frame_time = current_time
-        
         # 获取当前参数
         params = self.params_controller.get_params()
         
@@ -303,17 +248,8 @@ class OrthogonalAnimationController(QObject):
         # 注意：轨迹点的添加将在UI层进行，以确保使用正确的交点值
         # 此处不再主动添加轨迹点，而是在UI的update_plots方法中添加
         
-        # 帧率监控
-        if self._monitor_fps:
-            self._frame_count += 1
-            elapsed = current_time - self._last_fps_time
-            if elapsed >= 1.0:
-                self._current_fps = self._frame_count / elapsed
-                self._frame_count = 0
-                self._last_fps_time = current_time
-                print(f"李萨如动画FPS: {self._current_fps:.1f}")
-        
         # 每隔100帧打印一次当前状态
+        self._frame_count += 1
         if self._frame_count % 100 == 0:
             print(f"动画更新 - 时间: {t_offset:.2f}, 坐标: ({self.current_x:.2f}, {self.current_y:.2f})")
             print(f"波形偏移: {(t_offset * 0.3) % 10:.2f}")
@@ -325,17 +261,13 @@ class OrthogonalAnimationController(QObject):
         """播放动画"""
         if self.is_paused:
             self.is_paused = False
-            self.last_frame_time = time.time()
-            if self._monitor_fps:
-                self._last_fps_time = time.time()
-                self._frame_count = 0
-            self.timer.start()
+            self.scheduler.attach(self)
             print(f"动画开始播放 - 时间计数器: {self.time_counter:.2f}")
     
     def pause(self):
         """暂停动画"""
         self.is_paused = True
-        self.timer.stop()
+        self.scheduler.detach(self)
         print(f"动画已暂停 - 时间计数器: {self.time_counter:.2f}")
     
     def reset(self):
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+简谐运动模拟 - 平移波形帧生成器
+动画中的波形只随时间整体平移，参数变化时在时间网格上预计算一次正弦/余弦基，
+之后每帧用和角公式合成，不再对整个网格求三角函数
+"""
+
+import numpy as np
+
+
+class ShiftedSine:
+    """
+    A·sin(ω(t - d) + φ) 的逐帧生成器
+    sin(ωt + φ - ωd) = sin(ωt + φ)·cos(ωd) - cos(ωt + φ)·sin(ωd)
+    """
+
+    def __init__(self, t):
+        """
+        Args:
+            t: 固定的时间网格
+        """
+        self.t = t
+        self._key = None
+        self._sin = None
+        self._cos = None
+        self._scratch = np.empty_like(t, dtype=float)
+        self.omega = 0.0
+
+    def set_params(self, amplitude, omega, phi):
+        """设置波形参数，参数未变化时不重新计算基"""
+        key = (amplitude, omega, phi)
+        if key == self._key:
+            return
+        phase = omega * self.t + phi
+        self._sin = amplitude * np.sin(phase)
+        self._cos = amplitude * np.cos(phase)
+        self.omega = omega
+        self._key = key
+
+    def frame(self, offset, out=None):
+        """
+        计算平移offset后的波形
+
+        Args:
+            offset: 平移量 d
+            out: 输出缓冲区，提供时原地写入，不分配新数组
+
+        Returns:
+            np.ndarray: 与时间网格等长的波形（提供out时即为out）
+        """
+        angle = self.omega * offset
+        out = np.multiply(self._sin, np.cos(angle), out=out)
+        np.multiply(self._cos, np.sin(angle), out=self._scratch)
+        return np.subtract(out, self._scratch, out=out)
+
+
+class BeatEnvelope:
+    """
+    两个简谐振动合成后的振幅包络 sqrt(A1² + A2² + 2A1A2·cos(Δω(t - d) + Δφ)) 的逐帧生成器
+    余弦项同样用和角公式由预计算的基合成，每帧只剩一次开方
+    """
+
+    def __init__(self, t):
+        """
+        Args:
+            t: 固定的时间网格
+        """
+        self.t = t
+        self._cross = ShiftedSine(t)
+        self._key = None
+        self._constant = None
+        self._square_sum = 0.0
+
+    def set_params(self, A1, A2, omega1, omega2, phi1, phi2):
+        """设置两个振动的参数，参数未变化时不重新计算基"""
+        key = (A1, A2, omega1, omega2, phi1, phi2)
+        if key == self._key:
+            return
+        self._key = key
+        if abs(omega1 - omega2) > 0.001:  # 确保频率确实不同
+            self._constant = None
+            self._square_sum = A1 ** 2 + A2 ** 2
+            # cos(x) = sin(x + π/2)
+            self._cross.set_params(2 * A1 * A2, omega1 - omega2, phi1 - phi2 + np.pi / 2)
+        else:
+            # 如果频率几乎相同，使用振幅和
+            self._constant = A1 + A2
+
+    def frame(self, offset, upper=None, lower=None):
+        """
+        计算平移offset后的上下包络
+
+        Args:
+            offset: 平移量 d
+            upper: 上包络输出缓冲区，None时新建
+            lower: 下包络输出缓冲区，None时新建
+
+        Returns:
+            tuple: (上包络, 下包络)
+        """
+        if upper is None:
+            upper = np.empty_like(self.t, dtype=float)
+        if self._constant is not None:
+            upper.fill(self._constant)
+        else:
+            self._cross.frame(offset, out=upper)
+            upper += self._square_sum
+            np.maximum(upper, 0.0, out=upper)
+            np.sqrt(upper, out=upper)
+        return upper, np.negative(upper, out=lower)
@@ -11,7 +11,9 @@ from PyQt6.QtGui import QFont, QColor
 
 from ..ui.ui_framework import WavePanel, ControlPanel, MatplotlibCanvas, COLORS, get_app_instance
 from ..animations.beat_animation import BeatAnimationController
+from ..animations.frame_scheduler import FrameScheduler
 from ..ui.params_controller import ParamsController
+from ..ui.blit_renderer import BlitRenderer
 
 
 class BeatWavePanel(QWidget):
@@ -68,6 +70,9 @@ class BeatWavePanel(QWidget):
         self.canvas3.axes.set_ylabel('振幅', color=COLORS['text'], fontfamily='SimHei')
         self.canvas3.axes.grid(True, color=COLORS['grid'], linestyle='-', alpha=0.3)
         
+        # 创建每帧更新的图元
+        self.setup_wave_artists()
+        
         # 添加画布到布局
         plots_layout.addWidget(self.canvas1, 1)
         plots_layout.addWidget(self.canvas2, 1)
@@ -97,99 +102,102 @@ class BeatWavePanel(QWidget):
         """设置公式文本"""
         self.formula_label.setText(formula)
     
+    def setup_wave_artists(self):
+        """创建持久化的波形、包络线和交点图元，静态背景由BlitRenderer缓存"""
+        for canvas in (self.canvas1, self.canvas2, self.canvas3):
+            # 绘制y轴（加粗显示）
+            canvas.axes.axvline(x=0, color=COLORS['text'], linestyle='-', linewidth=2, alpha=0.7)
+        
+        self.wave1_line, = self.canvas1.axes.plot([], [], color=COLORS['accent1'], linewidth=2.0)
+        self.wave1_point, = self.canvas1.axes.plot([], [], 'o', color=COLORS['accent1'], markersize=10, zorder=3,
+                                                   markeredgecolor='white', markeredgewidth=1)
+        self.wave2_line, = self.canvas2.axes.plot([], [], color=COLORS['accent2'], linewidth=2.0)
+        self.wave2_point, = self.canvas2.axes.plot([], [], 'o', color=COLORS['accent2'], markersize=10, zorder=3,
+                                                   markeredgecolor='white', markeredgewidth=1)
+        self.composite_line, = self.canvas3.axes.plot([], [], color=COLORS['accent3'], linewidth=2.0)
+        self.envelope_up_line, = self.canvas3.axes.plot([], [], color=COLORS['accent5'], linewidth=1.5, linestyle='--')
+        self.envelope_down_line, = self.canvas3.axes.plot([], [], color=COLORS['accent5'], linewidth=1.5, linestyle='--')
+        self.composite_point, = self.canvas3.axes.plot([], [], 'o', color=COLORS['accent4'], markersize=11, zorder=3,
+                                                       markeredgecolor='white', markeredgewidth=1)
+        
+        # 图元 -> 上一帧数据的副本
+        self._line_data = {}
+        
+        self.renderer1 = BlitRenderer(self.canvas1, [self.wave1_line, self.wave1_point])
+        self.renderer2 = BlitRenderer(self.canvas2, [self.wave2_line, self.wave2_point])
+        self.renderer3 = BlitRenderer(self.canvas3, [
+            self.composite_line, self.envelope_up_line, self.envelope_down_line, self.composite_point])
+    
+    def _set_line_data(self, line, x, y):
+        """
+        更新曲线数据
+        
+        Args:
+            line: Line2D图元
+            x: 横坐标数据
+            y: 纵坐标数据，为空或None时隐藏曲线
+            
+        Returns:
+            bool: 图元是否发生变化
+        """
+        visible = y is not None and len(y) > 0
+        if not visible:
+            changed = line.get_visible()
+            line.set_visible(False)
+            return changed
+        
+        # matplotlib 3.7之前Line2D保存的是调用方数组的引用，动画控制器原地复用缓冲区时
+        # get_ydata()会随之改变，因此由面板自己保存上一帧数据的副本用于比较
+        last = self._line_data.get(line)
+        if last is not None and line.get_visible() \
+                and np.array_equal(last[0], x) and np.array_equal(last[1], y):
+            return False
+        if last is None or last[0].shape != np.shape(x) or last[1].shape != np.shape(y):
+            last = (np.array(x, dtype=float), np.array(y, dtype=float))
+            self._line_data[line] = last
+        else:
+            np.copyto(last[0], x)
+            np.copyto(last[1], y)
+        line.set_data(*last)
+        line.set_visible(True)
+        return True
+    
     def update_waves(self, t, wave1, wave2, composite, envelope_up=None, envelope_down=None, current_t_index=None):
-        """更新三个波形图"""
+        """更新三个波形图，只重绘数据发生变化的画布"""
         # 计算新的t值，使波形在-5到5范围内显示
         new_t = t - 5  # 将0-10映射到-5到5
         
         # 查找最接近x=0的数据点索引
         zero_index = np.argmin(np.abs(new_t))
         
-        # 获取波形在y轴上的真实值
-        if len(wave1) > 0 and zero_index < len(wave1):
-            wave1_y = wave1[zero_index]
-        else:
-            wave1_y = 0
-            
-        if len(wave2) > 0 and zero_index < len(wave2):
-            wave2_y = wave2[zero_index]
-        else:
-            wave2_y = 0
-            
-        if len(composite) > 0 and zero_index < len(composite):
-            composite_y = composite[zero_index]
-        else:
-            composite_y = 0
+        # 获取波形在y轴上的真实值，在y轴处绘制各波形的交点
+        def point_at_zero(wave):
+            if current_t_index is None or len(wave) == 0 or zero_index >= len(wave):
+                return None
+            return [wave[zero_index]]
         
         # 更新第一个波形 - 波形1
-        self.canvas1.axes.clear()
-        self.canvas1.axes.set_xlim(-5, 5)
-        self.canvas1.axes.set_ylim(-1.5, 1.5)
-        self.canvas1.axes.set_title("波形1", color=COLORS['accent1'], fontsize=12, fontfamily='SimHei')
-        self.canvas1.axes.set_xlabel('时间 (s)', color=COLORS['text'], fontfamily='SimHei')
-        self.canvas1.axes.set_ylabel('振幅', color=COLORS['text'], fontfamily='SimHei')
-        self.canvas1.axes.grid(True, color=COLORS['grid'], linestyle='-', alpha=0.3)
-        
-        # 绘制y轴（加粗显示）
-        self.canvas1.axes.axvline(x=0, color=COLORS['text'], linestyle='-', linewidth=2, alpha=0.7)
-        
-        if len(wave1) > 0:
-            self.canvas1.axes.plot(new_t, wave1, color=COLORS['accent1'], linewidth=2.0)
-            # 在y轴处绘制波形1的交点
-            if current_t_index is not None:
-                self.canvas1.axes.scatter([0], [wave1_y], 
-                                 color=COLORS['accent1'], s=100, zorder=3, edgecolor='white', linewidth=1)
+        dirty1 = self._set_line_data(self.wave1_line, new_t, wave1)
+        dirty1 |= self._set_line_data(self.wave1_point, [0], point_at_zero(wave1))
         
         # 更新第二个波形 - 波形2
-        self.canvas2.axes.clear()
-        self.canvas2.axes.set_xlim(-5, 5)
-        self.canvas2.axes.set_ylim(-1.5, 1.5)
-        self.canvas2.axes.set_title("波形2", color=COLORS['accent2'], fontsize=12, fontfamily='SimHei')
-        self.canvas2.axes.set_xlabel('时间 (s)', color=COLORS['text'], fontfamily='SimHei')
-        self.canvas2.axes.set_ylabel('振幅', color=COLORS['text'], fontfamily='SimHei')
-        self.canvas2.axes.grid(True, color=COLORS['grid'], linestyle='-', alpha=0.3)
-        
-        # 绘制y轴（加粗显示）
-        self.canvas2.axes.axvline(x=0, color=COLORS['text'], linestyle='-', linewidth=2, alpha=0.7)
-        
-        if len(wave2) > 0:
-            self.canvas2.axes.plot(new_t, wave2, color=COLORS['accent2'], linewidth=2.0)
-            # 在y轴处绘制波形2的交点
-            if current_t_index is not None:
-                self.canvas2.axes.scatter([0], [wave2_y], 
-                                 color=COLORS['accent2'], s=100, zorder=3, edgecolor='white', linewidth=1)
-        
-        # 更新第三个波形 - 合成波
-        self.canvas3.axes.clear()
-        self.canvas3.axes.set_xlim(-5, 5)
-        self.canvas3.axes.set_ylim(-2.5, 2.5)
-        self.canvas3.axes.set_title("合成波", color=COLORS['accent3'], fontsize=12, fontfamily='SimHei')
-        self.canvas3.axes.set_xlabel('时间 (s)', color=COLORS['text'], fontfamily='SimHei')
-        self.canvas3.axes.set_ylabel('振幅', color=COLORS['text'], fontfamily='SimHei')
-        self.canvas3.axes.grid(True, color=COLORS['grid'], linestyle='-', alpha=0.3)
-        
-        # 绘制y轴（加粗显示）
-        self.canvas3.axes.axvline(x=0, color=COLORS['text'], linestyle='-', linewidth=2, alpha=0.7)
-        
-        if len(composite) > 0:
-            self.canvas3.axes.plot(new_t, composite, color=COLORS['accent3'], linewidth=2.0)
-            
-            # 绘制包络线
-            if envelope_up is not None and len(envelope_up) > 0:
-                self.canvas3.axes.plot(new_t, envelope_up, color=COLORS['accent5'], linewidth=1.5, linestyle='--')
-            
-            if envelope_down is not None and len(envelope_down) > 0:
-                self.canvas3.axes.plot(new_t, envelope_down, color=COLORS['accent5'], linewidth=1.5, linestyle='--')
-            
-            # 在y轴处绘制合成波的交点
-            if current_t_index is not None:
-                self.canvas3.axes.scatter([0], [composite_y], 
-                                 color=COLORS['accent4'], s=120, zorder=3, edgecolor='white', linewidth=1)
-        
-        # 刷新所有画布
-        self.canvas1.draw()
-        self.canvas2.draw()
-        self.canvas3.draw()
+        dirty2 = self._set_line_data(self.wave2_line, new_t, wave2)
+        dirty2 |= self._set_line_data(self.wave2_point, [0], point_at_zero(wave2))
+        
+        # 更新第三个波形 - 合成波和包络线
+        has_composite = len(composite) > 0
+        dirty3 = self._set_line_data(self.composite_line, new_t, composite)
+        dirty3 |= self._set_line_data(self.envelope_up_line, new_t, envelope_up if has_composite else None)
+        dirty3 |= self._set_line_data(self.envelope_down_line, new_t, envelope_down if has_composite else None)
+        dirty3 |= self._set_line_data(self.composite_point, [0], point_at_zero(composite))
+        
+        # 只刷新发生变化的画布
+        if dirty1:
+            self.renderer1.update()
+        if dirty2:
+            self.renderer2.update()
+        if dirty3:
+            self.renderer3.update()
 
 
 class BeatHarmonicWindow(QMainWindow):
@@ -214,6 +222,8 @@ class BeatHarmonicWindow(QMainWindow):
         
         # 创建动画控制器
         self.animation_controller = BeatAnimationController(self.params_controller)
+        # 窗口隐藏或最小化时暂停动画
+        FrameScheduler.instance().bind_window(self.animation_controller, self)
         
         # 创建UI组件
         self.setup_ui()
@@ -394,9 +404,7 @@ class BeatHarmonicWindow(QMainWindow):
         params = self.params_controller.get_params()
         self.update_beat_info(params['omega1'], params['omega2'])
         
-        # 强制重新计算波形，确保图形更新
-        self.animation_controller._needs_full_recalculation = True
-        
+        # 暂停时立即按新参数重新计算波形，确保图形更新
         if self.animation_controller.is_paused:
             self.animation_controller.calculate_waves(self.animation_controller.time_counter)
             self.animation_controller.current_position = self.animation_controller.calculate_current_position(
@@ -428,17 +436,17 @@ class BeatHarmonicWindow(QMainWindow):
         # 获取参数
         params = self.params_controller.get_params()
 
-        # 确保有比率预设
-        if 'ratio_presets' not in params:
+        # 确保有比率预设（参数快照只读，缺失时使用默认预设）
+        ratio_presets = params.get('ratio_presets')
+        if ratio_presets is None:
             from ..ui.ui_framework import RATIO_PRESETS
-            params['ratio_presets'] = RATIO_PRESETS
+            ratio_presets = RATIO_PRESETS
             self.params_controller.set_param('ratio_presets', RATIO_PRESETS)
 
         # 更新当前比率预设
         self.params_controller.set_param('ratio_preset', ratio_key)
 
         # 获取比率值
-        ratio_presets = params['ratio_presets']
         if ratio_key in ratio_presets:
             ratio_values = ratio_presets[ratio_key]
 
@@ -11,7 +11,9 @@ from PyQt6.QtGui import QFont
 
 from ..ui.ui_framework import WavePanel, LissajousPanel, ControlPanel, COLORS, get_app_instance, AnimatedButton
 from ..animations.orthogonal_animation import OrthogonalAnimationController
+from ..animations.frame_scheduler import FrameScheduler
 from ..ui.params_controller import ParamsController
+from ..ui.blit_renderer import BlitRenderer
 
 
 class OrthogonalHarmonicWindow(QMainWindow):
@@ -32,6 +34,8 @@ class OrthogonalHarmonicWindow(QMainWindow):
         
         # 创建动画控制器
         self.animation_controller = OrthogonalAnimationController(self.params_controller)
+        # 窗口隐藏或最小化时暂停动画
+        FrameScheduler.instance().bind_window(self.animation_controller, self)
         
         # 创建UI组件
         self.setup_ui()
@@ -76,7 +80,7 @@ class OrthogonalHarmonicWindow(QMainWindow):
         self.y_wave_panel.canvas.axes.set_xlabel('Y振幅', color=COLORS['text'], fontfamily='SimHei')
         self.y_wave_panel.canvas.axes.set_ylabel('时间 (s)', color=COLORS['text'], fontfamily='SimHei')
         # 绘制时间轴中心线（水平线，y=0）
-        self.y_wave_panel.canvas.axes.axhline(y=0, color=COLORS['text'], linestyle='-', linewidth=2, alpha=0.7)
+        self.y_wave_panel.canvas.axes.axhline(y=0, color=COLORS['text'], linestyle='-', linewidth=1.5, alpha=0.7)
 
         # 创建李萨如图形面板（右上角）
         self.lissajous_panel = LissajousPanel()
@@ -98,7 +102,10 @@ class OrthogonalHarmonicWindow(QMainWindow):
         self.x_wave_panel.canvas.axes.set_xlabel('时间 (s)', color=COLORS['text'], fontfamily='SimHei')
         self.x_wave_panel.canvas.axes.set_ylabel('X振幅', color=COLORS['text'], fontfamily='SimHei')
         # 绘制时间轴中心线（垂直线，x=0）
-        self.x_wave_panel.canvas.axes.axvline(x=0, color=COLORS['text'], linestyle='-', linewidth=2, alpha=0.7)
+        self.x_wave_panel.canvas.axes.axvline(x=0, color=COLORS['text'], linestyle='-', linewidth=1.5, alpha=0.7)
+
+        # 创建每帧更新的图元
+        self.setup_plot_artists()
 
         # 创建空白占位符（左下角）
         placeholder = QWidget()
@@ -147,6 +154,44 @@ class OrthogonalHarmonicWindow(QMainWindow):
         # 将退出按钮添加到控制面板的底部
         self.control_panel.layout().addWidget(self.exit_btn)
     
+    def setup_plot_artists(self):
+        """创建持久化的动态图元，每帧只更新数据，静态背景由BlitRenderer缓存"""
+        x_axes = self.x_wave_panel.canvas.axes
+        y_axes = self.y_wave_panel.canvas.axes
+        lissajous_axes = self.lissajous_panel.canvas.axes
+
+        # X方向波形：波形曲线、时间轴处的当前点、到李萨如图形的水平投影线
+        self.x_wave_line, = x_axes.plot([], [], color=COLORS['accent1'], linewidth=2.0)
+        self.x_point, = x_axes.plot([], [], 'o', color=COLORS['accent4'], markersize=10, zorder=3)
+        self.x_guide, = x_axes.plot([-5, 5], [0, 0], color=COLORS['accent1'], linestyle='--', alpha=0.5, linewidth=1)
+        self.x_renderer = BlitRenderer(self.x_wave_panel.canvas, [self.x_wave_line, self.x_point, self.x_guide])
+
+        # Y方向波形（旋转90度：Y振幅作为X坐标，时间作为Y坐标）
+        self.y_wave_line, = y_axes.plot([], [], color=COLORS['accent2'], linewidth=2.0)
+        self.y_point, = y_axes.plot([], [], 'o', color=COLORS['accent4'], markersize=10, zorder=3)
+        self.y_guide, = y_axes.plot([0, 0], [-5, 5], color=COLORS['accent2'], linestyle='--', alpha=0.5, linewidth=1)
+        self.y_renderer = BlitRenderer(self.y_wave_panel.canvas, [self.y_wave_line, self.y_point, self.y_guide])
+
+        # 李萨如图形：完整曲线只在参数变化时重画，属于静态背景
+        self.lissajous_curve, = lissajous_axes.plot([], [], color=COLORS['accent3'], alpha=0.3, linewidth=1.0)
+        self._lissajous_source = None
+        self.trail_line, = lissajous_axes.plot([], [], color=COLORS['accent5'], alpha=0.7, linewidth=1.5)
+        self.trail_head, = lissajous_axes.plot([], [], color=COLORS['accent5'], alpha=1.0, linewidth=2.0)
+        self.lissajous_point, = lissajous_axes.plot([], [], 'o', color=COLORS['accent4'], markersize=11, zorder=4,
+                                                    markeredgecolor='white', markeredgewidth=1)
+        # X/Y方向投影线，连接到下方X波形图和左侧Y波形图
+        self.lissajous_x_guide, = lissajous_axes.plot([0, 0], [-1.2, 1.2], color=COLORS['accent1'], linestyle='--',
+                                                      alpha=0.7, linewidth=1.5)
+        self.lissajous_y_guide, = lissajous_axes.plot([-1.2, 1.2], [0, 0], color=COLORS['accent2'], linestyle='--',
+                                                      alpha=0.7, linewidth=1.5)
+        # 坐标指示线（从坐标轴到当前点的投影）
+        self.x_projection, = lissajous_axes.plot([0, 0], [-1.2, 0], color=COLORS['accent1'], alpha=0.3, linewidth=1)
+        self.y_projection, = lissajous_axes.plot([-1.2, 0], [0, 0], color=COLORS['accent2'], alpha=0.3, linewidth=1)
+        self.lissajous_renderer = BlitRenderer(self.lissajous_panel.canvas, [
+            self.trail_line, self.trail_head, self.lissajous_point,
+            self.lissajous_x_guide, self.lissajous_y_guide, self.x_projection, self.y_projection,
+        ])
+    
     def connect_signals(self):
         """连接信号和槽"""
         # 连接参数控制器信号
@@ -225,103 +270,48 @@ class OrthogonalHarmonicWindow(QMainWindow):
                 self.animation_controller.trail_points[1] = self.animation_controller.trail_points[1][-max_trail_length:]
         
         # 更新X方向波形（下方，水平显示）
-        self.x_wave_panel.canvas.axes.clear()
-        self.x_wave_panel.canvas.axes.set_xlim(-5, 5)
-        self.x_wave_panel.canvas.axes.set_ylim(-1.2, 1.2)
-        self.x_wave_panel.canvas.axes.set_xlabel('时间 (s)', color=COLORS['text'], fontfamily='SimHei')
-        self.x_wave_panel.canvas.axes.set_ylabel('X振幅', color=COLORS['text'], fontfamily='SimHei')
-        self.x_wave_panel.canvas.axes.grid(True, color=COLORS['grid'], linestyle='-', alpha=0.3)
-
-        # 绘制时间轴中心线（垂直线，x=0）
-        self.x_wave_panel.canvas.axes.axvline(x=0, color=COLORS['text'], linestyle='-', linewidth=1.5, alpha=0.7)
-
-        # 绘制X方向波形
         if len(x_data) > 0:
-            self.x_wave_panel.canvas.axes.plot(new_t, x_data, color=COLORS['accent1'], linewidth=2.0)
-
-            # 在时间轴处显示当前点 - 使用实际波形数据上的交点
-            self.x_wave_panel.canvas.axes.scatter([0], [x_at_zero], color=COLORS['accent4'], s=100, zorder=3)
-
-            # 绘制从当前点到李萨如图形的辅助线（水平投影）
-            # 这条线表示当前X振幅值对应到李萨如图形的X坐标
-            self.x_wave_panel.canvas.axes.axhline(y=x_at_zero, color=COLORS['accent1'], linestyle='--', alpha=0.5, linewidth=1)
+            self.x_wave_line.set_data(new_t, x_data)
+            self.x_point.set_data([0], [x_at_zero])
+            # 当前X振幅对应到李萨如图形X坐标的水平投影线
+            self.x_guide.set_ydata([x_at_zero, x_at_zero])
+        for artist in (self.x_wave_line, self.x_point, self.x_guide):
+            artist.set_visible(len(x_data) > 0)
         
         # 更新Y方向波形（左侧，垂直显示）
-        self.y_wave_panel.canvas.axes.clear()
-        self.y_wave_panel.canvas.axes.set_xlim(-1.2, 1.2)  # X轴现在表示Y振幅
-        self.y_wave_panel.canvas.axes.set_ylim(-5, 5)      # Y轴现在表示时间
-        self.y_wave_panel.canvas.axes.set_xlabel('Y振幅', color=COLORS['text'], fontfamily='SimHei')
-        self.y_wave_panel.canvas.axes.set_ylabel('时间 (s)', color=COLORS['text'], fontfamily='SimHei')
-        self.y_wave_panel.canvas.axes.grid(True, color=COLORS['grid'], linestyle='-', alpha=0.3)
-
-        # 绘制时间轴中心线（水平线，y=0）
-        self.y_wave_panel.canvas.axes.axhline(y=0, color=COLORS['text'], linestyle='-', linewidth=1.5, alpha=0.7)
-
-        # 绘制Y方向波形（旋转90度：Y振幅作为X坐标，时间作为Y坐标）
         if len(y_data) > 0:
-            self.y_wave_panel.canvas.axes.plot(y_data, new_t, color=COLORS['accent2'], linewidth=2.0)
-
-            # 在时间轴处显示当前点 - 使用实际波形数据上的交点
-            self.y_wave_panel.canvas.axes.scatter([y_at_zero], [0], color=COLORS['accent4'], s=100, zorder=3)
-
-            # 绘制从当前点到李萨如图形的辅助线（垂直投影）
-            # 这条线表示当前Y振幅值对应到李萨如图形的Y坐标
-            self.y_wave_panel.canvas.axes.axvline(x=y_at_zero, color=COLORS['accent2'], linestyle='--', alpha=0.5, linewidth=1)
+            self.y_wave_line.set_data(y_data, new_t)
+            self.y_point.set_data([y_at_zero], [0])
+            self.y_guide.set_xdata([y_at_zero, y_at_zero])
+        for artist in (self.y_wave_line, self.y_point, self.y_guide):
+            artist.set_visible(len(y_data) > 0)
         
-        # 更新李萨如图形（右上角）
-        self.lissajous_panel.canvas.axes.clear()
-        self.lissajous_panel.canvas.axes.set_xlim(-1.2, 1.2)
-        self.lissajous_panel.canvas.axes.set_ylim(-1.2, 1.2)
-        self.lissajous_panel.canvas.axes.set_xlabel('X振幅', color=COLORS['text'], fontfamily='SimHei')
-        self.lissajous_panel.canvas.axes.set_ylabel('Y振幅', color=COLORS['text'], fontfamily='SimHei')
-        self.lissajous_panel.canvas.axes.grid(True, color=COLORS['grid'], linestyle='-', alpha=0.3)
-
-        # 绘制坐标轴
-        self.lissajous_panel.canvas.axes.axhline(y=0, color=COLORS['text'], linestyle='-', alpha=0.5)
-        self.lissajous_panel.canvas.axes.axvline(x=0, color=COLORS['text'], linestyle='-', alpha=0.5)
-
-        # 绘制李萨如图形轨迹 - 静态曲线
+        # 李萨如图形完整曲线只在重新计算后更新，并重新缓存背景
         lissajous_x = self.animation_controller.lissajous_x
         lissajous_y = self.animation_controller.lissajous_y
-
-        if len(lissajous_x) > 0 and len(lissajous_y) > 0:
-            self.lissajous_panel.canvas.axes.plot(lissajous_x, lissajous_y, color=COLORS['accent3'], alpha=0.3, linewidth=1.0)
-
-        # 绘制动态轨迹
+        if self._lissajous_source is not lissajous_x:
+            self._lissajous_source = lissajous_x
+            self.lissajous_curve.set_data(lissajous_x, lissajous_y)
+            self.lissajous_renderer.invalidate()
+        
+        # 动态轨迹，最新部分更亮
         trail_x = self.animation_controller.trail_points[0]
         trail_y = self.animation_controller.trail_points[1]
-
-        if len(trail_x) > 0 and len(trail_y) > 0:
-            # 绘制完整轨迹
-            self.lissajous_panel.canvas.axes.plot(trail_x, trail_y, color=COLORS['accent5'], alpha=0.7, linewidth=1.5)
-
-            # 让最新部分的轨迹更亮
-            if len(trail_x) > 5:
-                self.lissajous_panel.canvas.axes.plot(
-                    trail_x[-5:],
-                    trail_y[-5:],
-                    color=COLORS['accent5'],
-                    alpha=1.0,
-                    linewidth=2.0
-                )
-
-        # 绘制当前点 - 使用波形与时间轴的交点值
-        self.lissajous_panel.canvas.axes.scatter([x_at_zero], [y_at_zero], color=COLORS['accent4'], s=120, zorder=4, edgecolor='white', linewidth=1)
-
-        # 绘制增强的辅助线，显示与波形图的对应关系
-        # X方向投影线（垂直虚线，连接到下方X波形图）
-        self.lissajous_panel.canvas.axes.axvline(x=x_at_zero, color=COLORS['accent1'], linestyle='--', alpha=0.7, linewidth=1.5)
-        # Y方向投影线（水平虚线，连接到左侧Y波形图）
-        self.lissajous_panel.canvas.axes.axhline(y=y_at_zero, color=COLORS['accent2'], linestyle='--', alpha=0.7, linewidth=1.5)
-
-        # 绘制坐标指示线（从原点到当前点的投影）
-        self.lissajous_panel.canvas.axes.plot([x_at_zero, x_at_zero], [-1.2, 0], color=COLORS['accent1'], alpha=0.3, linewidth=1)
-        self.lissajous_panel.canvas.axes.plot([-1.2, 0], [y_at_zero, y_at_zero], color=COLORS['accent2'], alpha=0.3, linewidth=1)
-        
-        # 刷新所有画布
-        self.x_wave_panel.canvas.draw()
-        self.y_wave_panel.canvas.draw()
-        self.lissajous_panel.canvas.draw()
+        self.trail_line.set_data(trail_x, trail_y)
+        self.trail_head.set_data(trail_x[-5:], trail_y[-5:])
+        self.trail_head.set_visible(len(trail_x) > 5)
+        
+        # 当前点和投影线 - 使用波形与时间轴的交点值
+        self.lissajous_point.set_data([x_at_zero], [y_at_zero])
+        self.lissajous_x_guide.set_xdata([x_at_zero, x_at_zero])
+        self.lissajous_y_guide.set_ydata([y_at_zero, y_at_zero])
+        self.x_projection.set_xdata([x_at_zero, x_at_zero])
+        self.y_projection.set_ydata([y_at_zero, y_at_zero])
+        
+        # 只重绘动态图元
+        self.x_renderer.update()
+        self.y_renderer.update()
+        self.lissajous_renderer.update()
     
     @pyqtSlot()
     def on_params_changed(self):
@@ -13,6 +13,7 @@ from matplotlib.patches import Circle, Arrow, Arc
 
 from ..ui.ui_framework import WavePanel, PhaseControlPanel, MatplotlibCanvas, COLORS, get_app_instance
 from ..animations.phase_animation import PhaseAnimationController
+from ..animations.frame_scheduler import FrameScheduler
 from ..ui.params_controller import ParamsController
 
 
@@ -293,6 +294,8 @@ class PhaseHarmonicWindow(QMainWindow):
         
         # 创建动画控制器
         self.animation_controller = PhaseAnimationController(self.params_controller)
+        # 窗口隐藏或最小化时暂停动画
+        FrameScheduler.instance().bind_window(self.animation_controller, self)
         
         # 创建UI组件
         self.setup_ui()
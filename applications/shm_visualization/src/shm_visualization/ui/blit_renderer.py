@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+简谐运动模拟 - 增量渲染器
+静态背景（坐标轴、网格、标签等）只完整绘制一次并缓存，
+每帧只重绘动态图元并把变化区域贴回画布
+"""
+
+
+class BlitRenderer:
+    """
+    基于Matplotlib blit的增量渲染器
+    动态图元在创建时注册，之后每帧只需修改它们的数据再调用update()
+    """
+
+    def __init__(self, canvas, artists=()):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self._artists = []
+        self._background = None
+
+        # 任何完整重绘（首次显示、窗口缩放、invalidate）之后都重新缓存背景
+        self._draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+        for artist in artists:
+            self.add_artist(artist)
+
+    def add_artist(self, artist):
+        """注册一个动态图元，它不会被画进缓存的背景"""
+        artist.set_animated(True)
+        self._artists.append(artist)
+        return artist
+
+    def invalidate(self):
+        """静态内容变化后调用，下一次update()会完整重绘并重新缓存背景"""
+        self._background = None
+
+    def _on_draw(self, event):
+        """完整重绘后缓存背景，并把动态图元补画到画布上"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self._artists:
+            self.figure.draw_artist(artist)
+
+    def update(self):
+        """
+        刷新画布
+        有缓存背景时只恢复背景、重绘动态图元并贴回其所在坐标轴的区域
+        """
+        if self._background is None:
+            self.canvas.draw()
+            return
+
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        for axes in {artist.axes for artist in self._artists if artist.axes is not None}:
+            self.canvas.blit(axes.bbox)
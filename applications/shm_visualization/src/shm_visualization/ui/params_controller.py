@@ -4,6 +4,8 @@
 管理和更新简谐运动动画的参数
 """
 
+from types import MappingProxyType
+
 from PyQt6.QtCore import QObject, pyqtSignal
 from .ui_framework import INITIAL_PARAMS, RATIO_PRESETS
 
@@ -21,10 +23,27 @@ class ParamsController(QObject):
         self.params = INITIAL_PARAMS.copy()
         # 添加频率比预设
         self.params['ratio_presets'] = RATIO_PRESETS
+        
+        # 只读参数快照，参数变化后才重新生成；version每次变化加一
+        self.version = 0
+        self._snapshot = None
+        self.params_changed.connect(self._invalidate_snapshot)
+    
+    def _invalidate_snapshot(self):
+        """参数发生变化，下一次get_params()时重新生成快照"""
+        self.version += 1
+        self._snapshot = None
     
     def get_params(self):
-        """获取当前参数的副本"""
-        return self.params.copy()
+        """
+        获取当前参数的只读快照
+        
+        参数不变时每次返回同一个对象，调用方可以直接保存引用来比较；
+        需要修改时请使用set_param或对快照调用copy()
+        """
+        if self._snapshot is None:
+            self._snapshot = MappingProxyType(self.params.copy())
+        return self._snapshot
     
     def set_param(self, name, value):
         """设置单个参数的值"""
@@ -74,4 +93,5 @@ class ParamsController(QObject):
         """设置频率比预设"""
         if ratio_key in self.params['ratio_presets']:
             self.params['ratio_preset'] = ratio_key
+            self._invalidate_snapshot()
             self.ratio_changed.emit(ratio_key) 
\ No newline at end of file
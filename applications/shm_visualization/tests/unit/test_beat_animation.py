@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+拍现象动画控制器测试
+验证时间和参数都未变化的帧被合并
+"""
+
+import os
+import sys
+import unittest
+
+# 添加源代码包目录到路径
+package_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'src', 'shm_visualization')
+if package_dir not in sys.path:
+    sys.path.insert(0, package_dir)
+
+from PyQt6.QtWidgets import QApplication
+
+from animations.beat_animation import BeatAnimationController
+from ui.params_controller import ParamsController
+
+
+class TestBeatFrameCoalescing(unittest.TestCase):
+    """测试逐帧推进时的合并逻辑"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        """测试前准备：不经过调度器，直接调用advance_frame"""
+        self.params = ParamsController()
+        self.controller = BeatAnimationController(self.params)
+        self.controller.initialize_data()
+        self.controller.is_paused = False
+        self.updates = []
+        self.controller.update_signal.connect(lambda: self.updates.append(self.controller.time_counter))
+
+    def test_unchanged_frame_is_coalesced(self):
+        """测试dt为0且参数未变时不重新计算"""
+        self.controller.advance_frame(0.0)
+        self.assertEqual(self.updates, [])
+
+        self.controller.advance_frame(0.02)
+        self.assertEqual(len(self.updates), 1)
+
+    def test_param_change_recomputes(self):
+        """测试dt为0但参数变化时按新参数重新计算，之后再次合并"""
+        self.params.set_param('A1', 0.3)
+        self.controller.advance_frame(0.0)
+        self.assertEqual(len(self.updates), 1)
+        self.assertAlmostEqual(abs(self.controller.wave1_data).max(), 0.3, places=2)
+
+        self.controller.advance_frame(0.0)
+        self.assertEqual(len(self.updates), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+增量渲染器测试
+验证只恢复背景并重绘、贴回已注册的动态图元
+"""
+
+import os
+import sys
+import unittest
+
+# 添加源代码包目录到路径
+package_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'src', 'shm_visualization')
+if package_dir not in sys.path:
+    sys.path.insert(0, package_dir)
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from ui.blit_renderer import BlitRenderer
+
+
+class RecordingCanvas(FigureCanvasAgg):
+    """记录完整重绘、背景恢复和贴图调用的画布"""
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.calls = []
+
+    def draw(self):
+        self.calls.append('draw')
+        super().draw()
+
+    def restore_region(self, region, *args, **kwargs):
+        self.calls.append('restore')
+        super().restore_region(region, *args, **kwargs)
+
+    def blit(self, bbox=None):
+        self.calls.append(('blit', tuple(bbox.bounds)))
+
+
+class TestBlitRenderer(unittest.TestCase):
+    """测试增量渲染器"""
+
+    def setUp(self):
+        """测试前准备：两个坐标轴，只有第一个包含动态图元"""
+        self.figure = Figure()
+        self.canvas = RecordingCanvas(self.figure)
+        self.axes, self.static_axes = self.figure.subplots(2)
+        self.line, = self.axes.plot([0, 1], [0, 1])
+        self.static_line, = self.static_axes.plot([0, 1], [1, 0])
+        self.renderer = BlitRenderer(self.canvas, [self.line])
+
+        self.drawn = []
+        draw_artist = self.figure.draw_artist
+
+        def spy(artist):
+            self.drawn.append(artist)
+            draw_artist(artist)
+
+        self.figure.draw_artist = spy
+
+    def test_first_update_draws_everything(self):
+        """测试没有缓存背景时完整重绘，并在重绘后补画动态图元"""
+        self.assertTrue(self.line.get_animated())
+        self.assertFalse(self.static_line.get_animated())
+
+        self.renderer.update()
+        self.assertEqual(self.canvas.calls, ['draw'])
+        self.assertEqual(self.drawn, [self.line])
+
+    def test_blits_only_registered_artists(self):
+        """测试有缓存背景时只恢复背景、重绘注册的图元并贴回其坐标轴区域"""
+        self.renderer.update()
+        self.canvas.calls.clear()
+        self.drawn.clear()
+
+        self.line.set_ydata([1, 0])
+        self.renderer.update()
+        self.assertEqual(self.canvas.calls, ['restore', ('blit', tuple(self.axes.bbox.bounds))])
+        self.assertEqual(self.drawn, [self.line])
+
+    def test_invalidate_forces_full_draw(self):
+        """测试静态内容变化后重新完整绘制并缓存背景"""
+        self.renderer.update()
+        self.renderer.invalidate()
+        self.canvas.calls.clear()
+
+        self.renderer.update()
+        self.assertEqual(self.canvas.calls, ['draw'])
+
+        self.canvas.calls.clear()
+        self.renderer.update()
+        self.assertEqual(self.canvas.calls[0], 'restore')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+共享帧调度器测试
+验证时间步长上限、隐藏窗口暂停以及窗口关闭后的解绑
+"""
+
+import gc
+import os
+import sys
+import time
+import unittest
+
+# 添加源代码包目录到路径
+package_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'src', 'shm_visualization')
+if package_dir not in sys.path:
+    sys.path.insert(0, package_dir)
+
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from animations.frame_scheduler import FrameScheduler
+
+
+class RecordingController:
+    """记录每帧时间步长的控制器"""
+
+    def __init__(self):
+        self.steps = []
+
+    def advance_frame(self, dt):
+        self.steps.append(dt)
+
+
+class TestFrameScheduler(unittest.TestCase):
+    """测试共享帧调度器"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        """每个测试使用独立的调度器"""
+        self.scheduler = FrameScheduler(interval_ms=12, max_frame_dt=0.25)
+        self.controller = RecordingController()
+
+    def tearDown(self):
+        self.scheduler.timer.stop()
+
+    def test_dt_is_capped(self):
+        """测试首帧步长为0，长时间卡顿后的步长不超过上限"""
+        self.scheduler.attach(self.controller)
+        self.scheduler._tick()
+        self.assertEqual(self.controller.steps, [0.0])
+
+        # 模拟上一帧发生在5秒前
+        self.scheduler._clients[self.controller] = time.perf_counter() - 5.0
+        self.scheduler._tick()
+        self.assertEqual(self.controller.steps[-1], 0.25)
+        self.assertGreater(self.scheduler.dropped_frames, 0)
+
+    def test_hidden_window_pauses(self):
+        """测试窗口隐藏期间不推进，重新显示后从当前时刻继续"""
+        window = QWidget()
+        self.scheduler.bind_window(self.controller, window)
+        self.scheduler.attach(self.controller)
+
+        self.scheduler._tick()
+        self.assertEqual(self.controller.steps, [])
+        self.assertIsNone(self.scheduler._clients[self.controller])
+
+        window.show()
+        self.scheduler._tick()
+        self.scheduler._clients[self.controller] = time.perf_counter() - 1.0
+        window.hide()
+        self.scheduler._tick()
+        window.show()
+        self.scheduler._tick()
+        # 隐藏前后各推进一帧，隐藏期间的时间不计入
+        self.assertEqual(self.controller.steps, [0.0, 0.0])
+        window.close()
+
+    def test_close_unbinds(self):
+        """测试窗口关闭后控制器被解绑，调度器不再持有它们"""
+        window = QWidget()
+        self.scheduler.bind_window(self.controller, window)
+        self.scheduler.attach(self.controller)
+        window.show()
+        window.close()
+        self.app.processEvents()
+
+        self.assertFalse(self.scheduler.is_attached(self.controller))
+        self.assertNotIn(self.controller, self.scheduler._windows)
+
+        # 只被弱引用：窗口与控制器释放后映射随之清空
+        other = RecordingController()
+        other_window = QWidget()
+        self.scheduler.bind_window(other, other_window)
+        self.scheduler.attach(other)
+        del other, other_window
+        gc.collect()
+        self.assertEqual(len(self.scheduler._windows), 0)
+        self.assertEqual(len(self.scheduler._clients), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
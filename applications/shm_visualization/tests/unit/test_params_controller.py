@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+参数控制器测试
+验证只读参数快照的复用与失效
+"""
+
+import os
+import sys
+import unittest
+
+# 添加源代码包目录到路径
+package_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'src', 'shm_visualization')
+if package_dir not in sys.path:
+    sys.path.insert(0, package_dir)
+
+from PyQt6.QtWidgets import QApplication
+
+from ui.params_controller import ParamsController
+
+
+class TestParamsSnapshot(unittest.TestCase):
+    """测试参数快照"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        """测试前准备"""
+        self.controller = ParamsController()
+
+    def test_snapshot_is_read_only(self):
+        """测试快照不能被修改，也不会随内部参数字典改变"""
+        params = self.controller.get_params()
+        with self.assertRaises(TypeError):
+            params['A1'] = 5.0
+        self.controller.params['A1'] = 5.0
+        self.assertNotEqual(params['A1'], 5.0)
+
+    def test_snapshot_reused_until_change(self):
+        """测试参数不变时返回同一对象，变化后重新生成且版本加一"""
+        params = self.controller.get_params()
+        self.assertIs(self.controller.get_params(), params)
+        version = self.controller.version
+
+        self.controller.set_param('A1', 0.5)
+        self.assertEqual(self.controller.version, version + 1)
+        updated = self.controller.get_params()
+        self.assertIsNot(updated, params)
+        self.assertEqual(updated['A1'], 0.5)
+
+        # 不存在的参数不触发失效
+        self.controller.set_param('unknown', 1.0)
+        self.assertIs(self.controller.get_params(), updated)
+
+        self.controller.reset_params()
+        self.assertIsNot(self.controller.get_params(), updated)
+
+    def test_ratio_preset_invalidates(self):
+        """测试设置频率比预设后快照失效"""
+        params = self.controller.get_params()
+        version = self.controller.version
+        preset = next(iter(params['ratio_presets']))
+
+        self.controller.set_ratio_preset(preset)
+        self.assertEqual(self.controller.version, version + 1)
+        self.assertEqual(self.controller.get_params()['ratio_preset'], preset)
+
+        self.controller.set_ratio_mode('w2')
+        self.assertEqual(self.controller.get_params()['ratio_mode'], 'w2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+平移波形帧生成器测试
+验证和角公式合成的波形与包络与直接计算一致
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# 添加源代码包目录到路径
+package_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'src', 'shm_visualization')
+if package_dir not in sys.path:
+    sys.path.insert(0, package_dir)
+
+from animations.wave_frames import ShiftedSine, BeatEnvelope
+
+
+class TestShiftedSine(unittest.TestCase):
+    """测试平移正弦波"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.t = np.linspace(0, 10, 1000)
+
+    def test_matches_direct_evaluation(self):
+        """测试各平移量下与 A·sin(ω(t - d) + φ) 一致"""
+        wave = ShiftedSine(self.t)
+        wave.set_params(0.8, 3.7, 1.2)
+        for offset in (0.0, 0.35, 2.0, 17.5):
+            expected = 0.8 * np.sin(3.7 * (self.t - offset) + 1.2)
+            np.testing.assert_allclose(wave.frame(offset), expected, atol=1e-12)
+
+    def test_writes_into_out(self):
+        """测试提供输出缓冲区时原地写入"""
+        wave = ShiftedSine(self.t)
+        wave.set_params(1.0, 2.0, 0.0)
+        out = np.empty_like(self.t)
+        self.assertIs(wave.frame(0.5, out=out), out)
+        np.testing.assert_allclose(out, np.sin(2.0 * (self.t - 0.5)), atol=1e-12)
+
+        # 参数变化后重新计算基
+        wave.set_params(0.5, 4.0, -0.3)
+        wave.frame(0.5, out=out)
+        np.testing.assert_allclose(out, 0.5 * np.sin(4.0 * (self.t - 0.5) - 0.3), atol=1e-12)
+
+
+class TestBeatEnvelope(unittest.TestCase):
+    """测试拍现象振幅包络"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.t = np.linspace(0, 10, 1000)
+
+    def test_matches_direct_evaluation(self):
+        """测试上下包络与直接开方计算一致"""
+        envelope = BeatEnvelope(self.t)
+        A1, A2, omega1, omega2, phi1, phi2 = 1.0, 0.6, 5.0, 5.8, 0.4, -0.9
+        envelope.set_params(A1, A2, omega1, omega2, phi1, phi2)
+
+        upper = np.empty_like(self.t)
+        lower = np.empty_like(self.t)
+        for offset in (0.0, 1.3, 6.0):
+            phase = (omega1 - omega2) * (self.t - offset) + (phi1 - phi2)
+            expected = np.sqrt(A1 ** 2 + A2 ** 2 + 2 * A1 * A2 * np.cos(phase))
+            result_upper, result_lower = envelope.frame(offset, upper, lower)
+            self.assertIs(result_upper, upper)
+            self.assertIs(result_lower, lower)
+            np.testing.assert_allclose(upper, expected, atol=1e-12)
+            np.testing.assert_allclose(lower, -expected, atol=1e-12)
+
+    def test_equal_amplitudes_stay_real(self):
+        """测试等振幅时包络在零点附近不会因舍入误差出现NaN"""
+        envelope = BeatEnvelope(self.t)
+        envelope.set_params(1.0, 1.0, 5.0, 6.0, 0.0, np.pi)
+        upper, lower = envelope.frame(0.7)
+        self.assertFalse(np.any(np.isnan(upper)))
+        self.assertGreaterEqual(upper.min(), 0.0)
+
+    def test_equal_frequencies_give_constant(self):
+        """测试频率相同时包络为振幅和"""
+        envelope = BeatEnvelope(self.t)
+        envelope.set_params(1.0, 0.5, 5.0, 5.0, 0.0, 1.0)
+        upper, lower = envelope.frame(2.0)
+        np.testing.assert_array_equal(upper, np.full_like(self.t, 1.5))
+        np.testing.assert_array_equal(lower, np.full_like(self.t, -1.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
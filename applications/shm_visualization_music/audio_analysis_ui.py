@@ -18,6 +18,7 @@ from PyQt6.QtGui import QFont
 from visualization_engine import MatplotlibCanvas, WaveformVisualizer, SpectrumVisualizer
 from audio_analyzer import AudioAnalyzer
 from audio_engine import AudioEngine
+from spectrum_stream import StreamingSpectrumAnalyzer, LiveSpectrumFeeder
 from harmonic_core import HarmonicMotion, SuperpositionMotion, HarmonicParams, HarmonicType
 
 
@@ -394,6 +395,13 @@ class AudioAnalysisPanel(QWidget):
         spectrum_layout = QVBoxLayout(spectrum_group)
         self.spectrum_canvas = MatplotlibCanvas()
         self.spectrum_viz = SpectrumVisualizer(self.spectrum_canvas)
+        
+        # 播放时的实时频谱：音频回调写入分析器，定时器按固定频率刷新显示
+        self.live_spectrum = StreamingSpectrumAnalyzer(sample_rate=self.audio_engine.sample_rate)
+        self.audio_engine.add_output_listener(self.live_spectrum.write)
+        self.spectrum_feeder = LiveSpectrumFeeder(self.live_spectrum, self.spectrum_viz,
+                                                  is_active=lambda: self.audio_engine.is_playing)
+        self.spectrum_feeder.finished.connect(lambda: self.update_spectrum_display(self.current_audio))
         spectrum_layout.addWidget(self.spectrum_canvas)
         
         # 添加波形和频谱面板到左侧布局
@@ -937,13 +945,7 @@ class AudioAnalysisPanel(QWidget):
                     amp = oscillator.params.amplitude
                     
                     # 查找接近的音符名称
-                    note_name = "未知"
-                    min_diff = float('inf')
-                    for note_freq, name in self.analyzer.freq_to_note.items():
-                        diff = abs(freq - note_freq)
-                        if diff < min_diff and diff <= self.analyzer.note_tolerance:
-                            min_diff = diff
-                            note_name = name
+                    note_name = self.analyzer.frequency_to_note(freq)
                     
                     title = f"分量 {i+1}: {freq:.1f} Hz"
                     if note_name != "未知":
@@ -971,13 +973,7 @@ class AudioAnalysisPanel(QWidget):
             amp = osc.params.amplitude
             
             # 查找接近的音符名称
-            note_name = "未知"
-            min_diff = float('inf')
-            for note_freq, name in self.analyzer.freq_to_note.items():
-                diff = abs(freq - note_freq)
-                if diff < min_diff and diff <= self.analyzer.note_tolerance:
-                    min_diff = diff
-                    note_name = name
+            note_name = self.analyzer.frequency_to_note(freq)
             
             if note_name != "未知":
                 info_text += f"分量 {i+1}: {freq:.1f} Hz ({note_name}), 振幅: {amp:.3f}\n"
@@ -1040,6 +1036,7 @@ class AudioAnalysisPanel(QWidget):
         """播放按钮点击事件"""
         if self.current_audio is not None:
             self.play_requested.emit(self.current_audio)
+            self.spectrum_feeder.start()
             self.audio_engine.play_audio(self.current_audio)
     
     @pyqtSlot()
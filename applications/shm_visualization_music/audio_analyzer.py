@@ -4,6 +4,9 @@
 负责分析音频并分解为简谐振动分量
 """
 
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
 from scipy import signal
 from scipy.fft import rfft, rfftfreq
@@ -12,6 +15,177 @@ from typing import List, Tuple, Dict, Optional
 from harmonic_core import HarmonicMotion, HarmonicParams, HarmonicType, SuperpositionMotion
 
 
+# 十二平均律音名（以C为音级0）
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# 和弦类型：名称后缀 -> 相对根音的音级
+CHORD_TYPES = {
+    '大三和弦': (0, 4, 7),
+    '小三和弦': (0, 3, 7),
+}
+
+NO_CHORD = "未识别和弦"
+
+
+class ChordTracker:
+    """逐帧和弦跟踪器
+    
+    每帧的色度向量与全部大/小三和弦模板做余弦匹配，再用迟滞合并为和弦段：
+    新和弦的匹配度必须比当前和弦高出hysteresis，并连续保持min_frames帧才切换，
+    避免在两个相近和弦之间来回跳动。可以分多次push，适合边解码边分析。
+    """
+    
+    def __init__(self, hop_duration: float, min_confidence: float = 0.6,
+                 hysteresis: float = 0.05, min_frames: int = 4):
+        """初始化和弦跟踪器
+        
+        Args:
+            hop_duration: 相邻帧的时间间隔(秒)
+            min_confidence: 判定为和弦的最低模板匹配度 (0-1)
+            hysteresis: 切换和弦或离开当前和弦所需的匹配度余量
+            min_frames: 新和弦需要连续保持的帧数
+        """
+        self.hop_duration = hop_duration
+        self.min_confidence = min_confidence
+        self.hysteresis = hysteresis
+        self.min_frames = max(1, int(min_frames))
+        
+        names = []
+        chord_notes = []
+        templates = []
+        for root in range(12):
+            for suffix, intervals in CHORD_TYPES.items():
+                pitch_classes = [(root + i) % 12 for i in intervals]
+                template = np.zeros(12)
+                template[pitch_classes] = 1.0
+                templates.append(template / np.linalg.norm(template))
+                names.append(f"{NOTE_NAMES[root]}{suffix}")
+                chord_notes.append([NOTE_NAMES[pc] for pc in pitch_classes])
+        self.chord_names = names
+        self.chord_notes = chord_notes
+        self.templates = np.array(templates)
+        self.reset()
+    
+    def reset(self):
+        """清空跟踪状态"""
+        self._frame_index = 0
+        self._current = None        # 当前和弦模板序号，-1表示无和弦，None表示尚未确定
+        self._segment_start = 0
+        self._segment_sum = [np.zeros(12), 0.0, 0]      # [色度和, 匹配度和, 帧数]
+        self._candidate = None
+        self._candidate_start = 0
+        self._candidate_sum = [np.zeros(12), 0.0, 0]
+    
+    def push(self, chroma: np.ndarray) -> List[Dict]:
+        """输入一批色度帧
+        
+        Args:
+            chroma: (帧数, 12) 的色度向量，全零表示静音帧
+            
+        Returns:
+            List[Dict]: 本批次中结束的和弦段
+        """
+        chroma = np.atleast_2d(chroma)
+        norms = np.linalg.norm(chroma, axis=1, keepdims=True)
+        scores = (chroma / np.maximum(norms, 1e-12)) @ self.templates.T
+        best = np.argmax(scores, axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+        
+        closed = []
+        for i in range(len(scores)):
+            frame = self._frame_index + i
+            label = int(best[i]) if best_scores[i] >= self.min_confidence else -1
+            current = self._current
+            if current is not None and current >= 0:
+                current_score = scores[i, current]
+                # 当前和弦仍然成立，且新和弦的优势不足迟滞量时保持不变
+                if (current_score >= self.min_confidence - self.hysteresis
+                        and best_scores[i] < current_score + self.hysteresis):
+                    label = current
+            score = scores[i, label] if label >= 0 else best_scores[i]
+            
+            if label == current:
+                self._merge_candidate()
+                self._accumulate(self._segment_sum, chroma[i], score)
+                continue
+            
+            if label != self._candidate:
+                self._merge_candidate()
+                self._candidate = label
+                self._candidate_start = frame
+            self._accumulate(self._candidate_sum, chroma[i], score)
+            
+            if frame - self._candidate_start + 1 >= self.min_frames:
+                if current is None:
+                    # 第一段从第0帧开始，此前未稳定的帧也计入这一段的统计
+                    self._current = self._candidate
+                    self._merge_candidate()
+                else:
+                    closed.append(self._make_segment(self._candidate_start))
+                    self._segment_start = self._candidate_start
+                    self._current = self._candidate
+                    self._segment_sum = self._candidate_sum
+                    self._candidate = None
+                    self._candidate_sum = [np.zeros(12), 0.0, 0]
+        
+        self._frame_index += len(scores)
+        return closed
+    
+    def finish(self, end_time: Optional[float] = None) -> List[Dict]:
+        """结束跟踪，返回最后一个和弦段
+        
+        Args:
+            end_time: 音频结束时间(秒)，None表示按已输入的帧数计算
+            
+        Returns:
+            List[Dict]: 剩余的和弦段
+        """
+        if self._current is None:
+            # 整段都未稳定到任何和弦，按最后的候选命名，统计覆盖全部帧
+            self._current = self._candidate if self._candidate is not None else -1
+        self._merge_candidate()
+        
+        if self._frame_index == 0:
+            return []
+        segment = self._make_segment(None, end_time)
+        self.reset()
+        return [segment]
+    
+    @staticmethod
+    def _accumulate(total: list, chroma: np.ndarray, score: float):
+        total[0] += chroma
+        total[1] += score
+        total[2] += 1
+    
+    def _merge_candidate(self):
+        """未达到保持帧数的候选并入当前和弦段"""
+        if self._candidate is None:
+            return
+        self._segment_sum[0] += self._candidate_sum[0]
+        self._segment_sum[1] += self._candidate_sum[1]
+        self._segment_sum[2] += self._candidate_sum[2]
+        self._candidate = None
+        self._candidate_sum = [np.zeros(12), 0.0, 0]
+    
+    def _make_segment(self, end_frame: Optional[int], end_time: Optional[float] = None) -> Dict:
+        chroma_sum, score_sum, count = self._segment_sum
+        if end_time is None:
+            end_time = (self._frame_index if end_frame is None else end_frame) * self.hop_duration
+        label = self._current
+        if label >= 0:
+            notes = list(self.chord_notes[label])
+        else:
+            # 无和弦时给出能量最强的音级
+            notes = [NOTE_NAMES[i] for i in np.argsort(chroma_sum)[::-1][:3] if chroma_sum[i] > 0]
+        return {
+            'start': self._segment_start * self.hop_duration,
+            'end': end_time,
+            'chord': self.chord_names[label] if label >= 0 else NO_CHORD,
+            'confidence': float(score_sum / count) if count else 0.0,
+            'notes': notes,
+        }
+
+
 class AudioAnalyzer:
     """音频分析引擎，用于分析音频并分解为简谐振动分量"""
     
@@ -23,16 +197,18 @@ class AudioAnalyzer:
         """
         self.sample_rate = sample_rate
         
-        # 基本音符频率参考表
-        self.freq_to_note = {
-            261.63: 'C4', 277.18: 'C#4', 293.66: 'D4', 311.13: 'D#4', 
-            329.63: 'E4', 349.23: 'F4', 369.99: 'F#4', 392.00: 'G4', 
-            415.30: 'G#4', 440.00: 'A4', 466.16: 'A#4', 493.88: 'B4',
-            523.25: 'C5'
-        }
+        # 音符识别的容差范围 (音分，100音分为一个半音)
+        self.note_tolerance_cents = 25.0
+        self._build_note_index(440.0)
         
-        # 音符频率的容差范围 (Hz)
-        self.note_tolerance = 5.0
+        # 分析计划缓存：(长度, 窗函数, 零填充倍数, 采样率) -> (窗函数数组, 频率轴, 填充长度)
+        self._plan_cache = OrderedDict()
+        self.max_cached_plans = 16
+        # 频谱结果缓存：同一段音频重复分析时直接复用
+        self._spectrum_cache = OrderedDict()
+        self.max_cached_spectra = 8
+        self.cache_hits = 0
+        self.cache_misses = 0
         
     def analyze_frequency_content(self, audio_data: np.ndarray, window_type='hann', zero_padding=1) -> Tuple[np.ndarray, np.ndarray]:
         """分析音频的频率内容
@@ -43,30 +219,119 @@ class AudioAnalyzer:
             zero_padding: 零填充倍数，用于增加频率分辨率
             
         Returns:
-            Tuple[np.ndarray, np.ndarray]: (频率数组, 振幅数组)
+            Tuple[np.ndarray, np.ndarray]: (频率数组, 振幅数组)，均为只读的缓存数组
         """
-        # 选择窗函数
-        if window_type == 'hann':
-            window = signal.windows.hann(len(audio_data))
-        elif window_type == 'hamming':
-            window = signal.windows.hamming(len(audio_data))
-        elif window_type == 'blackman':
-            window = signal.windows.blackman(len(audio_data))
-        else:
-            window = signal.windows.hann(len(audio_data))
+        audio_data = np.ascontiguousarray(audio_data)
+        cache_key = (self._fingerprint(audio_data), window_type, zero_padding, self.sample_rate)
+        cached = self._spectrum_cache.get(cache_key)
+        if cached is not None:
+            self._spectrum_cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+        
+        window, frequencies, padded_length = self._get_plan(len(audio_data), window_type, zero_padding)
         
         # 应用窗函数减少频谱泄漏
         windowed_data = audio_data * window
         
-        # 增加零填充以提高频率分辨率
-        padded_length = len(windowed_data) * zero_padding
+        # 计算FFT（零填充以提高频率分辨率）
+        fft_result = rfft(windowed_data, n=padded_length, overwrite_x=True)
+        magnitudes = np.abs(fft_result)
+        magnitudes *= 2 / len(windowed_data)
+        magnitudes.setflags(write=False)
+        
+        result = (frequencies, magnitudes)
+        self._spectrum_cache[cache_key] = result
+        while len(self._spectrum_cache) > self.max_cached_spectra:
+            self._spectrum_cache.popitem(last=False)
+        return result
+    
+    def _get_plan(self, length: int, window_type: str, zero_padding: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """获取给定长度和参数下的窗函数与频率轴
+        
+        Args:
+            length: 音频长度
+            window_type: 窗函数类型
+            zero_padding: 零填充倍数
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray, int]: (窗函数, 频率轴, 填充后长度)
+        """
+        key = (length, window_type, zero_padding, self.sample_rate)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self._plan_cache.move_to_end(key)
+            return plan
         
-        # 计算FFT
-        fft_result = rfft(windowed_data, n=padded_length)
-        magnitudes = np.abs(fft_result) * 2 / len(windowed_data)
+        # 选择窗函数
+        if window_type == 'hamming':
+            window = signal.windows.hamming(length)
+        elif window_type == 'blackman':
+            window = signal.windows.blackman(length)
+        else:
+            window = signal.windows.hann(length)
+        padded_length = length * zero_padding
         frequencies = rfftfreq(padded_length, 1/self.sample_rate)
+        window.setflags(write=False)
+        frequencies.setflags(write=False)
+        
+        plan = (window, frequencies, padded_length)
+        self._plan_cache[key] = plan
+        while len(self._plan_cache) > self.max_cached_plans:
+            self._plan_cache.popitem(last=False)
+        return plan
+    
+    @staticmethod
+    def _fingerprint(audio_data: np.ndarray) -> tuple:
+        """计算音频内容的摘要，用作结果缓存的键"""
+        digest = hashlib.blake2b(audio_data.view(np.uint8), digest_size=16).digest()
+        return (digest, audio_data.shape, audio_data.dtype.str)
+    
+    def _build_note_index(self, reference_pitch: float):
+        """建立MIDI 0-127音符的对数频率索引
+        
+        Args:
+            reference_pitch: A4的频率(Hz)
+        """
+        self.reference_pitch = reference_pitch
+        self.note_midi = np.arange(128)
+        self.note_names = np.array([f"{NOTE_NAMES[m % 12]}{m // 12 - 1}" for m in self.note_midi])
+        self._note_log2 = np.log2(reference_pitch) + (self.note_midi - 69) / 12
+        # 相邻音符在对数频率上的中点，二分查找落入的区间即为最接近的音符
+        self._note_edges = (self._note_log2[:-1] + self._note_log2[1:]) / 2
+    
+    def lookup_notes(self, frequencies) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """批量查找最接近的音符
         
-        return frequencies, magnitudes
+        Args:
+            frequencies: 任意形状的频率数组(Hz)，例如 (帧数, 峰值数) 的STFT峰值序列
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: 与输入同形状的
+            (音符名称, MIDI编号, 音分偏差)；超出容差或频率无效处为 ("未知", -1, nan)
+        """
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        valid = frequencies > 0
+        log2_freq = np.log2(np.where(valid, frequencies, 1.0))
+        
+        index = np.searchsorted(self._note_edges, log2_freq)
+        cents = (log2_freq - self._note_log2[index]) * 1200
+        matched = valid & (np.abs(cents) <= self.note_tolerance_cents)
+        
+        names = np.where(matched, self.note_names[index], "未知")
+        midi = np.where(matched, self.note_midi[index], -1)
+        cents = np.where(matched, cents, np.nan)
+        return names, midi, cents
+    
+    def frequency_to_note(self, frequency: float) -> str:
+        """查找单个频率对应的音符名称，超出容差时返回未知"""
+        return str(self.lookup_notes(frequency)[0])
+    
+    def clear_cache(self):
+        """清空分析缓存"""
+        self._plan_cache.clear()
+        self._spectrum_cache.clear()
     
     def find_dominant_frequencies(self, 
                                  audio_data: np.ndarray, 
@@ -75,92 +340,137 @@ class AudioAnalyzer:
                                  min_freq_distance: float = None) -> List[Tuple[float, float]]:
         """找出音频中的主要频率成分
         
+        只做一次Hann窗FFT：候选峰值用对数抛物线插值细化到亚频点精度，
+        彼此相距很近的峰值（如拍现象）再用chirp-z变换在局部放大频谱后分辨。
+        
         Args:
             audio_data: 音频数据数组
             num_peaks: 要返回的峰值数量
             min_amplitude: 最小振幅阈值（相对于最大振幅）
-            min_freq_distance: 频率峰值间的最小距离(Hz)，若为None则自动计算
+            min_freq_distance: 频率峰值间的最小距离(Hz)，若为None则取两个频点宽度
             
         Returns:
             List[Tuple[float, float]]: [(频率1, 振幅1), (频率2, 振幅2), ...]，按振幅降序排列
         """
-        # 检测是否有可能是拍现象（需要更高的频率分辨率）
-        # 拍现象通常由两个频率接近的正弦波组成，频率差为1-20Hz之间
-        is_potential_beat = False
-        
-        # 首先用标准分辨率进行分析
         frequencies, magnitudes = self.analyze_frequency_content(audio_data)
-        
-        # 获取初步的频率峰值
-        peaks, _ = signal.find_peaks(magnitudes)
-        if len(peaks) >= 2:
-            peak_freqs = frequencies[peaks]
-            # 计算相邻峰值间的最小频率差
-            peak_freqs.sort()
-            freq_diffs = np.diff(peak_freqs)
-            min_diff = np.min(freq_diffs) if len(freq_diffs) > 0 else float('inf')
-            
-            # 如果频率差小于20Hz，可能是拍现象
-            if min_diff < 20:
-                is_potential_beat = True
-        
-        # 如果可能是拍现象，使用更高分辨率再次分析
-        if is_potential_beat:
-            frequencies, magnitudes = self.analyze_frequency_content(audio_data, window_type='blackman', zero_padding=4)
-            
-            # 如果没有指定最小频率距离，则设置为较小的值以便检测接近的频率
-            if min_freq_distance is None:
-                min_freq_distance = 2.0  # 2Hz的最小间距，足够区分拍现象
-        else:
-            # 普通情况下，使用默认设置
-            if min_freq_distance is None:
-                min_freq_distance = 10.0
+        if len(frequencies) < 3:
+            return []
+        bin_width = frequencies[1] - frequencies[0]
+        if min_freq_distance is None:
+            min_freq_distance = 2 * bin_width
         
         # 跳过极低频率 (< 20 Hz)，这些通常是DC偏移或噪声
-        min_freq_idx = np.searchsorted(frequencies, 20)
-        frequencies = frequencies[min_freq_idx:]
-        magnitudes = magnitudes[min_freq_idx:]
-        
-        # 如果没有数据，返回空列表
-        if len(frequencies) == 0:
+        min_freq_idx = max(1, int(np.searchsorted(frequencies, 20)))
+        if min_freq_idx >= len(magnitudes) - 1:
             return []
         
         # 计算振幅阈值
-        max_magnitude = np.max(magnitudes)
-        threshold = max_magnitude * min_amplitude
-        
-        # 找出所有超过阈值的峰值
-        # 将最小距离从索引单位转换为频率单位
-        freq_resolution = frequencies[1] - frequencies[0]
-        min_distance_idx = int(min_freq_distance / freq_resolution) if freq_resolution > 0 else 10
-        min_distance_idx = max(1, min_distance_idx)
-        
-        peaks, properties = signal.find_peaks(magnitudes, height=threshold, distance=min_distance_idx)
-        
-        # 按振幅降序排列
+        threshold = np.max(magnitudes[min_freq_idx:]) * min_amplitude
+        peaks, _ = signal.find_peaks(magnitudes[:-1], height=threshold)
+        peaks = peaks[peaks >= min_freq_idx]
         if len(peaks) == 0:
             return []
-            
-        peak_heights = properties['peak_heights']
-        peak_freqs = frequencies[peaks]
         
-        # 排序并组合结果
-        sorted_indices = np.argsort(peak_heights)[::-1]  # 降序
-        peak_freqs = peak_freqs[sorted_indices]
-        peak_heights = peak_heights[sorted_indices]
+        peak_freqs, peak_mags = self._interpolate_peaks(magnitudes, peaks, bin_width)
         
-        # 返回最强的num_peaks个峰值
-        peak_freqs_mags = list(zip(peak_freqs[:num_peaks], peak_heights[:num_peaks]))
+        # 相距不足4个频点的峰值主瓣互相重叠，在局部用chirp-z变换放大后重新定位
+        is_potential_beat = False
+        group_start = 0
+        for i in range(1, len(peaks) + 1):
+            if i < len(peaks) and peaks[i] - peaks[i - 1] < 4:
+                continue
+            if i - group_start > 1:
+                is_potential_beat = True
+                zoom_freqs, zoom_mags = self._zoom_peaks(
+                    audio_data, peak_freqs[group_start] - 2 * bin_width,
+                    peak_freqs[i - 1] + 2 * bin_width, i - group_start)
+                count = len(zoom_freqs)
+                peak_freqs[group_start:group_start + count] = zoom_freqs
+                peak_mags[group_start:group_start + count] = zoom_mags
+                peak_mags[group_start + count:i] = 0.0  # 放大后合并的峰值
+            group_start = i
+        
+        # 按振幅降序选取，跳过距离更强峰值过近的峰
+        selected = []
+        for index in np.argsort(peak_mags)[::-1]:
+            if peak_mags[index] <= 0:
+                break
+            freq = peak_freqs[index]
+            if all(abs(freq - other) >= min_freq_distance for other, _ in selected):
+                selected.append((freq, peak_mags[index]))
+            if len(selected) == num_peaks:
+                break
         
         # 检查是否有接近的频率并打印调试信息
-        if is_potential_beat and len(peak_freqs_mags) >= 2:
-            freq1, amp1 = peak_freqs_mags[0]
-            freq2, amp2 = peak_freqs_mags[1]
+        if is_potential_beat and len(selected) >= 2:
+            freq1, amp1 = selected[0]
+            freq2, amp2 = selected[1]
             beat_freq = abs(freq1 - freq2)
             if beat_freq < 10:  # 10Hz以内的差异视为拍现象
                 print(f"检测到可能的拍现象: 频率1={freq1:.1f}Hz, 频率2={freq2:.1f}Hz, 拍频={beat_freq:.1f}Hz")
         
-        return peak_freqs_mags[:num_peaks]
+        return selected
+    
+    @staticmethod
+    def _interpolate_peaks(magnitudes: np.ndarray, peaks: np.ndarray, bin_width: float,
+                           start_freq: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """用对数幅度的抛物线插值细化峰值位置和高度
+        
+        Args:
+            magnitudes: 幅度谱
+            peaks: 峰值索引（不含首尾点）
+            bin_width: 频点间隔(Hz)
+            start_freq: 第0个频点对应的频率(Hz)
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (细化后的频率, 细化后的幅度)
+        """
+        floor = np.finfo(np.float64).tiny
+        left = np.log(np.maximum(magnitudes[peaks - 1], floor))
+        center = np.log(np.maximum(magnitudes[peaks], floor))
+        right = np.log(np.maximum(magnitudes[peaks + 1], floor))
+        curvature = left - 2 * center + right
+        offset = np.zeros(len(peaks))
+        valid = curvature < 0
+        offset[valid] = 0.5 * (left[valid] - right[valid]) / curvature[valid]
+        offset = np.clip(offset, -0.5, 0.5)
+        
+        freqs = start_freq + (peaks + offset) * bin_width
+        mags = np.exp(center - 0.25 * (left - right) * offset)
+        return freqs, mags
+    
+    def _zoom_peaks(self, audio_data: np.ndarray, f_start: float, f_stop: float,
+                    max_peaks: int, points_per_bin: int = 16) -> Tuple[np.ndarray, np.ndarray]:
+        """用chirp-z变换放大局部频谱并定位其中的峰值
+        
+        Args:
+            audio_data: 音频数据数组
+            f_start: 放大区间起始频率(Hz)
+            f_stop: 放大区间终止频率(Hz)
+            max_peaks: 最多返回的峰值数
+            points_per_bin: 每个FFT频点宽度内的采样点数
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (峰值频率, 峰值幅度)，按频率升序
+        """
+        length = len(audio_data)
+        window, _, _ = self._get_plan(length, 'hann', 1)
+        f_start = max(f_start, 0.0)
+        f_stop = min(f_stop, self.sample_rate / 2)
+        bin_width = self.sample_rate / length
+        points = max(3, int(np.ceil((f_stop - f_start) / bin_width * points_per_bin)) + 1)
+        
+        zoomed = signal.zoom_fft(audio_data * window, [f_start, f_stop], m=points,
+                                 fs=self.sample_rate, endpoint=True)
+        zoom_mags = np.abs(zoomed) * 2 / length
+        step = (f_stop - f_start) / (points - 1)
+        
+        peaks, _ = signal.find_peaks(zoom_mags[:-1])
+        peaks = peaks[peaks >= 1]
+        if len(peaks) == 0:
+            return np.zeros(0), np.zeros(0)
+        peaks = np.sort(peaks[np.argsort(zoom_mags[peaks])[::-1][:max_peaks]])
+        return self._interpolate_peaks(zoom_mags, peaks, step, f_start)
     
     def decompose_to_harmonics(self, audio_data: np.ndarray, num_components: int = 5) -> SuperpositionMotion:
         """将音频分解为简谐振动的叠加
@@ -216,15 +526,16 @@ class AudioAnalyzer:
         
         # 创建简谐振动组合
         oscillators = []
+        phases = self.estimate_phases(audio_data, [freq for freq, _ in dominant_freqs])
         
-        for freq, amplitude in dominant_freqs:
+        for (freq, amplitude), phase in zip(dominant_freqs, phases):
             # 创建简谐振动
             oscillator = HarmonicMotion(
                 type=HarmonicType.SINGLE,
                 params=HarmonicParams(
                     amplitude=amplitude,
                     frequency=freq,
-                    phase=0.0,  # 相位信息通常在FFT中丢失，这里简化为0
+                    phase=phase,
                     damping=0.0
                 )
             )
@@ -233,6 +544,31 @@ class AudioAnalyzer:
         # 返回简谐振动的叠加
         return SuperpositionMotion(oscillators)
     
+    def estimate_phases(self, audio_data: np.ndarray, frequencies: List[float]) -> np.ndarray:
+        """估计各频率分量在t=0时的初始相位
+        
+        在每个（亚频点精度的）频率上单独计算加Hann窗的离散时间傅里叶变换，
+        Hann窗在该频率处的频响为实数，因此变换结果的相位就是分量的相位。
+        
+        Args:
+            audio_data: 音频数据数组
+            frequencies: 分量频率列表(Hz)
+            
+        Returns:
+            np.ndarray: 与 A·sin(2πft + φ) 约定一致的相位φ (弧度)
+        """
+        if len(frequencies) == 0:
+            return np.zeros(0)
+        window, _, _ = self._get_plan(len(audio_data), 'hann', 1)
+        weighted = audio_data * window
+        n = np.arange(len(audio_data))
+        phases = np.empty(len(frequencies))
+        for i, freq in enumerate(frequencies):
+            coefficient = weighted @ np.exp(-2j * np.pi * freq / self.sample_rate * n)
+            # X = A/2·W(0)·e^{j(φ-π/2)}
+            phases[i] = np.angle(coefficient) + np.pi / 2
+        return np.angle(np.exp(1j * phases))
+    
     def identify_musical_notes(self, audio_data: np.ndarray, num_notes: int = 3) -> List[Tuple[str, float, float]]:
         """识别音频中的音符
         
@@ -246,20 +582,13 @@ class AudioAnalyzer:
         # 找出主要频率成分
         dominant_freqs = self.find_dominant_frequencies(audio_data, num_notes)
         
-        # 识别音符
-        notes = []
-        for freq, amplitude in dominant_freqs:
-            # 查找最接近的音符
-            note_name = "未知"
-            min_diff = float('inf')
-            
-            for note_freq, name in self.freq_to_note.items():
-                diff = abs(freq - note_freq)
-                if diff < min_diff and diff <= self.note_tolerance:
-                    min_diff = diff
-                    note_name = name
-            
-            notes.append((note_name, freq, amplitude))
+        if not dominant_freqs:
+            return []
+        
+        # 一次二分查找得到所有峰值的音符
+        freqs = np.array([freq for freq, _ in dominant_freqs])
+        names, _, _ = self.lookup_notes(freqs)
+        notes = [(str(name), freq, amplitude) for name, (freq, amplitude) in zip(names, dominant_freqs)]
             
         return notes
     
@@ -315,13 +644,12 @@ class AudioAnalyzer:
         t = np.linspace(0, duration, num_points)
         
         # 计算叠加波形
-        composite_wave = np.array([superposition.position(time) for time in t])
+        composite_wave = superposition.position(t)
         
         # 计算各个分量波形
         component_waves = {}
         for i, osc in enumerate(superposition.oscillators):
-            wave = np.array([osc.position(time) for time in t])
-            component_waves[f"component_{i}"] = wave
+            component_waves[f"component_{i}"] = osc.position(t)
             
         # 整合结果
         result = {
@@ -341,27 +669,105 @@ class AudioAnalyzer:
         Returns:
             str: 识别出的和弦名称
         """
-        # 识别音符
-        notes = self.identify_musical_notes(audio_data, num_notes=3)
-        note_names = [note[0] for note in notes if note[0] != "未知"]
-        
-        # 简单的和弦映射
-        chord_map = {
-            frozenset(['C4', 'E4', 'G4']): 'C大三和弦',
-            frozenset(['G4', 'B4', 'D4']): 'G大三和弦',
-            frozenset(['F4', 'A4', 'C4']): 'F大三和弦',
-            frozenset(['A4', 'C4', 'E4']): 'A小三和弦',
-            frozenset(['D4', 'F4', 'A4']): 'D小三和弦',
-            frozenset(['E4', 'G4', 'B4']): 'E小三和弦'
-        }
+        # 逐帧用色度模板跟踪和弦，取整段中持续时间最长的和弦
+        durations = {}
+        for segment in self.track_chords(audio_data):
+            if segment['chord'] != NO_CHORD:
+                duration = segment['end'] - segment['start']
+                durations[segment['chord']] = durations.get(segment['chord'], 0.0) + duration
+        if not durations:
+            return NO_CHORD
+        return max(durations, key=durations.get)
+    
+    def _get_chroma_map(self, frame_size: int, min_midi: int = 36, max_midi: int = 96) -> Tuple[np.ndarray, slice, np.ndarray]:
+        """获取把FFT频点归并为12个音级的映射
+        
+        Args:
+            frame_size: 帧长度
+            min_midi: 参与计算的最低音符 (默认C2)
+            max_midi: 参与计算的最高音符 (默认C7)
+            
+        Returns:
+            Tuple[np.ndarray, slice, np.ndarray]: (窗函数, 参与计算的频点范围, (频点数, 12) 的归并矩阵)
+        """
+        key = ('chroma', frame_size, min_midi, max_midi, self.sample_rate, self.reference_pitch)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self._plan_cache.move_to_end(key)
+            return plan
+        
+        window, frequencies, _ = self._get_plan(frame_size, 'hann', 1)
+        # 用音符索引为每个频点找到最接近的音符
+        bins = np.flatnonzero(frequencies > 0)
+        midi = self.note_midi[np.searchsorted(self._note_edges, np.log2(frequencies[bins]))]
+        in_range = (midi >= min_midi) & (midi <= max_midi)
+        bins, midi = bins[in_range], midi[in_range]
+        
+        band = slice(int(bins[0]), int(bins[-1]) + 1)
+        chroma_map = np.zeros((band.stop - band.start, 12))
+        chroma_map[bins - band.start, midi % 12] = 1.0
+        
+        plan = (window, band, chroma_map)
+        self._plan_cache[key] = plan
+        while len(self._plan_cache) > self.max_cached_plans:
+            self._plan_cache.popitem(last=False)
+        return plan
+    
+    def iter_chroma(self, audio_data: np.ndarray, frame_size: int = 4096, hop_size: int = 2048,
+                    block_frames: int = 256, silence_threshold: float = 0.01):
+        """逐块计算色度向量
+        
+        每次对block_frames帧做一次批量FFT，内存占用与音频总长度无关。
         
-        # 查找匹配的和弦
-        note_set = frozenset(note_names)
-        for chord_notes, chord_name in chord_map.items():
-            if note_set.issubset(chord_notes) and len(note_set) >= 2:
-                return chord_name
+        Args:
+            audio_data: 音频数据数组
+            frame_size: 帧长度
+            hop_size: 帧移
+            block_frames: 每块的帧数
+            silence_threshold: RMS低于该值的帧视为静音，色度向量为零
+            
+        Yields:
+            np.ndarray: (帧数, 12) 的色度向量块
+        """
+        audio_data = np.asarray(audio_data, dtype=np.float64)
+        if len(audio_data) < frame_size:
+            audio_data = np.pad(audio_data, (0, frame_size - len(audio_data)))
+        window, band, chroma_map = self._get_chroma_map(frame_size)
+        frames = np.lib.stride_tricks.sliding_window_view(audio_data, frame_size)[::hop_size]
+        
+        for start in range(0, len(frames), block_frames):
+            block = frames[start:start + block_frames]
+            rms = np.sqrt(np.mean(block ** 2, axis=1))
+            magnitudes = np.abs(rfft(block * window, axis=1)[:, band])
+            chroma = magnitudes @ chroma_map
+            chroma[rms < silence_threshold] = 0.0
+            yield chroma
+    
+    def track_chords(self, audio_data: np.ndarray, frame_size: int = 4096, hop_size: int = 2048,
+                     min_confidence: float = 0.6, hysteresis: float = 0.05,
+                     min_duration: float = 0.2) -> List[Dict]:
+        """分析整段录音中随时间变化的和弦
         
-        return "未识别和弦"
+        Args:
+            audio_data: 音频数据数组
+            frame_size: 帧长度
+            hop_size: 帧移
+            min_confidence: 判定为和弦的最低模板匹配度 (0-1)
+            hysteresis: 切换和弦所需的匹配度余量
+            min_duration: 新和弦至少持续的时间(秒)，更短的变化并入前一段
+            
+        Returns:
+            List[Dict]: 按时间排列的和弦段，每段包含
+                start/end (秒)、chord (和弦名称)、confidence (平均匹配度)、notes (音名列表)
+        """
+        hop_duration = hop_size / self.sample_rate
+        tracker = ChordTracker(hop_duration, min_confidence, hysteresis,
+                               min_frames=int(np.ceil(min_duration / hop_duration)))
+        segments = []
+        for chroma in self.iter_chroma(audio_data, frame_size, hop_size):
+            segments += tracker.push(chroma)
+        segments += tracker.finish(len(audio_data) / self.sample_rate)
+        return segments
 
 
 # 测试代码
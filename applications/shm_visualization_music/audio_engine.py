@@ -8,30 +8,492 @@ import numpy as np
 import sounddevice as sd
 from scipy.io import wavfile
 import librosa
-import time
 import threading
-import queue
+import os
+import sys
+from collections import OrderedDict
+
+try:
+    from audio_common import PeriodTable, OutputStreamManager
+except ImportError:
+    # 以脚本方式运行时applications目录不在搜索路径中
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from audio_common import PeriodTable, OutputStreamManager
+
+
+# 音符到频率的扩展映射（C3-B6）
+EXTENDED_NOTE_FREQS = {
+    # 第三个八度
+    'C3': 130.81, 'C#3': 138.59, 'D3': 146.83, 'D#3': 155.56,
+    'E3': 164.81, 'F3': 174.61, 'F#3': 185.00, 'G3': 196.00,
+    'G#3': 207.65, 'A3': 220.00, 'A#3': 233.08, 'B3': 246.94,
+    
+    # 第四个八度（中央C所在的八度）
+    'C4': 261.63, 'C#4': 277.18, 'D4': 293.66, 'D#4': 311.13,
+    'E4': 329.63, 'F4': 349.23, 'F#4': 369.99, 'G4': 392.00,
+    'G#4': 415.30, 'A4': 440.00, 'A#4': 466.16, 'B4': 493.88,
+    
+    # 第五个八度
+    'C5': 523.25, 'C#5': 554.37, 'D5': 587.33, 'D#5': 622.25,
+    'E5': 659.26, 'F5': 698.46, 'F#5': 739.99, 'G5': 783.99,
+    'G#5': 830.61, 'A5': 880.00, 'A#5': 932.33, 'B5': 987.77,
+    
+    # 第六个八度
+    'C6': 1046.50, 'C#6': 1108.73, 'D6': 1174.66, 'D#6': 1244.51,
+    'E6': 1318.51, 'F6': 1396.91, 'F#6': 1479.98, 'G6': 1567.98,
+    'G#6': 1661.22, 'A6': 1760.00, 'A#6': 1864.66, 'B6': 1975.53
+}
+
+
+class ToneStream:
+    """流式正弦叠加振荡器
+    
+    保存每个分量的相位累加器，按需逐块生成音频，相位在块之间保持连续。
+    频率和振幅的修改在下一个块生效，无需重新渲染整段音频。
+    """
+    
+    def __init__(self, frequencies, amplitudes, sample_rate=44100, duration=None,
+                 phases=None, fade_time=0.01, period_table=None):
+        """初始化流式振荡器
+        
+        Args:
+            frequencies: 各分量频率列表(Hz)
+            amplitudes: 各分量振幅列表
+            sample_rate: 采样率
+            duration: 持续时间(秒)，None表示无限长
+            phases: 各分量初始相位(弧度)，默认全为0
+            fade_time: 淡入淡出时长(秒)
+            period_table: 周期表，提供时在修改参数的线程上预先取出各频率的基础块，
+                生成音频块时只需按当前相位旋转，不再逐采样计算三角函数
+        """
+        self.sample_rate = sample_rate
+        self._frequencies = np.asarray(frequencies, dtype=np.float64).reshape(-1)
+        self._amplitudes = np.asarray(amplitudes, dtype=np.float64).reshape(-1)
+        if phases is None:
+            self._phases = np.zeros(len(self._frequencies))
+        else:
+            self._phases = np.asarray(phases, dtype=np.float64).reshape(-1).copy()
+        self._pending = None
+        
+        # 与相位无关的基础块，随频率一起切换
+        self._period_table = period_table
+        self._basis = self._make_basis(self._frequencies)
+        
+        self.total_frames = None if duration is None else int(sample_rate * duration)
+        self.frames_rendered = 0
+        self.finished = False
+        
+        self._fade_samples = int(fade_time * sample_rate)
+        # 只有在总长度足够时才淡入淡出，与整段生成的处理保持一致
+        if self.total_frames is not None and self.total_frames <= 2 * self._fade_samples:
+            self._fade_samples = 0
+        self._stop_at = self.total_frames
+        self._ramp = np.arange(0)
+    
+    def set_frequencies(self, frequencies):
+        """修改各分量频率，从下一个块开始生效
+        
+        新频率的基础块在调用线程上计算，播放回调中不做三角函数表的构建。
+        
+        Args:
+            frequencies: 新的频率列表(Hz)，长度需与分量数一致
+        """
+        frequencies = self._check_length(frequencies, '频率')
+        self._pending = (frequencies, self._pending_amplitudes(), self._make_basis(frequencies))
+    
+    def set_amplitudes(self, amplitudes):
+        """修改各分量振幅，从下一个块开始生效
+        
+        Args:
+            amplitudes: 新的振幅列表，长度需与分量数一致
+        """
+        amplitudes = self._check_length(amplitudes, '振幅')
+        self._pending = (self._pending_frequencies(), amplitudes, self._pending_basis())
+    
+    def _check_length(self, values, label):
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if len(values) != len(self._phases):
+            raise ValueError(f"{label}数量({len(values)})与分量数({len(self._phases)})不一致")
+        return values
+    
+    def _make_basis(self, frequencies):
+        if self._period_table is None or len(frequencies) == 0:
+            return None
+        return self._period_table.base_blocks(frequencies)
+    
+    def _pending_frequencies(self):
+        return self._pending[0] if self._pending is not None else self._frequencies
+    
+    def _pending_amplitudes(self):
+        return self._pending[1] if self._pending is not None else self._amplitudes
+    
+    def _pending_basis(self):
+        return self._pending[2] if self._pending is not None else self._basis
+    
+    def stop(self):
+        """请求停止：从当前位置开始淡出后结束"""
+        stop_at = self.frames_rendered + self._fade_samples
+        if self._stop_at is None or stop_at < self._stop_at:
+            self._stop_at = stop_at
+    
+    def read(self, frames):
+        """生成下一个音频块
+        
+        Args:
+            frames: 需要的帧数
+            
+        Returns:
+            numpy.ndarray: float32音频块，结束后的部分以静音填充
+        """
+        block = np.zeros(frames, dtype=np.float32)
+        if self.finished:
+            return block
+        
+        # 在块边界上应用挂起的参数修改
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            self._frequencies, self._amplitudes, self._basis = pending
+        
+        valid = frames
+        if self._stop_at is not None:
+            valid = max(0, min(frames, self._stop_at - self.frames_rendered))
+        
+        if len(self._ramp) < frames:
+            self._ramp = np.arange(frames, dtype=np.float64)
+        n = self._ramp[:valid]
+        
+        # 每个采样的相位增量
+        omega = 2 * np.pi * self._frequencies / self.sample_rate
+        basis = self._basis
+        if valid > 0 and len(omega) > 0:
+            if basis is not None and valid <= basis[0].shape[1]:
+                # 按当前相位旋转基础块：a·sin(φ + ωn) = a·sinφ·cos(ωn) + a·cosφ·sin(ωn)
+                base_cos, base_sin = basis
+                block[:valid] = ((self._amplitudes * np.sin(self._phases)) @ base_cos[:, :valid]
+                                 + (self._amplitudes * np.cos(self._phases)) @ base_sin[:, :valid])
+            else:
+                angle = self._phases[:, None] + omega[:, None] * n
+                block[:valid] = self._amplitudes @ np.sin(angle)
+            self._apply_fades(block, valid)
+        
+        # 推进相位累加器，取模避免长时间播放后精度下降
+        self._phases = np.mod(self._phases + omega * frames, 2 * np.pi)
+        self.frames_rendered += valid
+        
+        if self._stop_at is not None and self.frames_rendered >= self._stop_at:
+            self.finished = True
+        
+        return block
+    
+    def _apply_fades(self, block, valid):
+        """在块内应用淡入和淡出包络"""
+        fade = self._fade_samples
+        if fade <= 0:
+            return
+        
+        start = self.frames_rendered
+        positions = start + np.arange(valid)
+        
+        if start < fade:
+            fade_in = positions < fade
+            block[:valid][fade_in] *= positions[fade_in] / (fade - 1)
+        
+        if self._stop_at is not None and self._stop_at - (start + valid) < fade:
+            remaining = self._stop_at - positions
+            fade_out = remaining <= fade
+            block[:valid][fade_out] *= (remaining[fade_out] - 1) / (fade - 1)
+
+
+class WaveformCache:
+    """按字节预算淘汰的LRU波形缓存
+    
+    缓存的数组被设为只读，命中时可以直接返回视图而不复制；
+    总字节数超过预算时淘汰最久未使用的条目。
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024, precision=6):
+        """初始化波形缓存
+        
+        Args:
+            max_bytes: 缓存总字节数上限
+            precision: 浮点参数量化到的小数位数
+        """
+        self.max_bytes = max_bytes
+        self.precision = precision
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def make_key(self, kind, *params):
+        """生成量化后的元组键，避免浮点误差导致的重复条目
+        
+        Args:
+            kind: 波形类型，如'sine'
+            *params: 生成参数，可以是数值、字符串或它们的序列
+            
+        Returns:
+            tuple: 可哈希的缓存键
+        """
+        return (kind,) + tuple(self._quantize(p) for p in params)
+    
+    def _quantize(self, value):
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return tuple(self._quantize(v) for v in value)
+        if isinstance(value, (bool, str)) or value is None:
+            return value
+        return round(float(value), self.precision)
+    
+    def get(self, key):
+        """查找缓存条目
+        
+        Args:
+            key: make_key生成的键
+            
+        Returns:
+            numpy.ndarray: 只读的缓存数组，未命中时返回None
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+    
+    def put(self, key, audio):
+        """存入缓存，必要时淘汰最久未使用的条目
+        
+        Args:
+            key: make_key生成的键
+            audio: 要缓存的音频数组，缓存后会被设为只读
+            
+        Returns:
+            numpy.ndarray: 缓存中的只读数组
+        """
+        audio.setflags(write=False)
+        if audio.nbytes > self.max_bytes:
+            # 超过整个预算的波形不缓存
+            return audio
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.nbytes
+            
+            while self._entries and self.current_bytes + audio.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+            
+            self._entries[key] = audio
+            self.current_bytes += audio.nbytes
+        return audio
+    
+    def clear(self):
+        """清空缓存（保留统计计数）"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def stats(self):
+        """获取缓存统计信息
+        
+        Returns:
+            dict: 条目数、字节数、命中/未命中/淘汰次数和命中率
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+        }
+
+
+class AudioRingBuffer:
+    """单生产者/单消费者的float32环形缓冲区
+    
+    写位置只由供给线程修改，读位置只由音频回调修改，两者都是单调递增的整数，
+    因此读写双方无需加锁。切换音源时由生产者发布丢弃位置，消费者下次读取时跳过旧数据。
+    """
+    
+    def __init__(self, capacity):
+        """初始化环形缓冲区
+        
+        Args:
+            capacity: 容量(帧数)
+        """
+        self.capacity = int(capacity)
+        self._buffer = np.zeros(self.capacity, dtype=np.float32)
+        self._write_pos = 0   # 只由生产者修改
+        self._read_pos = 0    # 只由消费者修改
+        self._discard_to = 0  # 生产者发布，消费者跳过此前的数据
+    
+    @property
+    def write_position(self):
+        """已写入的总帧数"""
+        return self._write_pos
+    
+    @property
+    def read_position(self):
+        """已读取的总帧数"""
+        return self._read_pos
+    
+    def available(self):
+        """可读取的帧数"""
+        return max(0, self._write_pos - max(self._read_pos, self._discard_to))
+    
+    def free(self):
+        """可写入的帧数（消费者尚未跳过的旧数据仍占用空间）"""
+        return self.capacity - (self._write_pos - self._read_pos)
+    
+    def write(self, data):
+        """写入数据，由生产者调用
+        
+        Args:
+            data: 一维音频数据
+            
+        Returns:
+            int: 实际写入的帧数，不超过剩余空间
+        """
+        count = min(len(data), self.free())
+        if count <= 0:
+            return 0
+        start = self._write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._buffer[start:start + first] = data[:first]
+        self._buffer[:count - first] = data[first:count]
+        self._write_pos += count
+        return count
+    
+    def discard_before(self, position):
+        """丢弃指定写位置之前的全部数据，由生产者在切换音源时调用
+        
+        Args:
+            position: 写位置，消费者下次读取时直接跳到此处
+        """
+        if position > self._discard_to:
+            self._discard_to = position
+    
+    def read_into(self, out):
+        """读取数据到输出缓冲区，由消费者调用，不足部分以静音填充
+        
+        Args:
+            out: 一维输出缓冲区
+            
+        Returns:
+            int: 实际读取的帧数
+        """
+        read = max(self._read_pos, self._discard_to)
+        count = min(len(out), self._write_pos - read)
+        if count > 0:
+            start = read % self.capacity
+            first = min(count, self.capacity - start)
+            out[:first] = self._buffer[start:start + first]
+            out[first:count] = self._buffer[:count - first]
+        else:
+            count = 0
+        out[count:] = 0
+        self._read_pos = read + count
+        return count
+
+
+class ArraySource:
+    """整段音频的播放源，循环模式下按取模位置读取"""
+    
+    def __init__(self, audio_data, loop=False):
+        """初始化播放源
+        
+        Args:
+            audio_data: 音频数据
+            loop: 是否循环播放
+        """
+        self.audio = np.ascontiguousarray(audio_data, dtype=np.float32)
+        self.loop = loop
+        self.position = 0
+        self.finished = len(self.audio) == 0
+        self._block = np.empty(0, dtype=np.float32)  # 循环模式的输出块，按需扩大后复用
+    
+    def read(self, frames):
+        """读取下一段音频
+        
+        Args:
+            frames: 需要的帧数
+            
+        Returns:
+            numpy.ndarray: 音频数据，非循环模式下结尾处可能不足frames帧；
+                循环模式下返回内部复用的输出块，下次读取前有效
+        """
+        length = len(self.audio)
+        if self.finished:
+            return self.audio[:0]
+        if self.loop:
+            if len(self._block) < frames:
+                self._block = np.empty(frames, dtype=np.float32)
+            chunk = self._block[:frames]
+            # 按取模位置分段复制，到结尾后从头继续，可能绕回多次
+            filled = 0
+            while filled < frames:
+                count = min(frames - filled, length - self.position)
+                chunk[filled:filled + count] = self.audio[self.position:self.position + count]
+                filled += count
+                self.position = (self.position + count) % length
+        else:
+            chunk = self.audio[self.position:self.position + frames]
+            self.position += len(chunk)
+            self.finished = self.position >= length
+        return chunk
 
 
 class AudioEngine:
     """音频引擎类，负责生成和播放简谐振动对应的音频"""
     
-    def __init__(self, sample_rate=44100, buffer_size=1024):
+    def __init__(self, sample_rate=44100, buffer_size=1024, cache_bytes=64 * 1024 * 1024,
+                 ring_blocks=4):
         """初始化音频引擎
         
         Args:
             sample_rate: 采样率，默认44.1kHz (CD音质)
             buffer_size: 音频缓冲区大小
+            cache_bytes: 波形缓存的字节预算
+            ring_blocks: 环形缓冲区容纳的回调块数，决定预读延迟
         """
         self.sample_rate = sample_rate
         self.buffer_size = buffer_size
         self.is_playing = False
-        self.stream = None
+        self.stream = None  # 共享的输出流管理器，首次播放时获取
         self.current_audio = None
-        self.audio_queue = queue.Queue()
-        self.playback_thread = None
+        self.current_stream = None  # 正在播放的流式振荡器
+        self.playback_thread = None  # 供给线程，把播放源写入环形缓冲区
         self.loop_playback = False  # 循环播放标志
         
+        # 播放路径：供给线程 -> 环形缓冲区 -> 音频回调
+        self._ring = AudioRingBuffer(buffer_size * ring_blocks)
+        self._source = None          # 当前播放源，替换即切换
+        self._source_serial = 0      # 每次开始播放加一，同一音源停止后重新播放也视为切换
+        self._end_position = None    # 播放源结束时的写位置
+        self._feed_event = threading.Event()
+        self._control_lock = threading.Lock()
+        self._playback_done = threading.Event()
+        self._playback_done.set()
+        self._feeder_exit = False
+        self.xrun_stats = {'underruns': 0, 'underrun_frames': 0, 'device_xruns': 0}
+        self._output_listeners = ()  # 在音频回调中接收已输出块的函数
+        
         # 设置sounddevice参数
         sd.default.samplerate = sample_rate
         sd.default.channels = 1  # 单声道
@@ -45,9 +507,11 @@ class AudioEngine:
         }
         
         # 预缓存常用声音
-        self._cache = {}
+        self._cache = WaveformCache(cache_bytes)
+        # 周期表：重复音调只计算一个周期
+        self._period_table = PeriodTable(sample_rate)
 
-    def generate_sine_wave(self, frequency, amplitude=0.5, duration=1.0, phase=0.0):
+    def generate_sine_wave(self, frequency, amplitude=0.5, duration=1.0, phase=0.0, copy=True):
         """生成正弦波
         
         Args:
@@ -55,17 +519,18 @@ class AudioEngine:
             amplitude: 振幅，范围[0,1]
             duration: 持续时间(秒)
             phase: 初始相位(弧度)
+            copy: 是否返回可修改的副本，False时返回缓存中的只读数组
             
         Returns:
             numpy.ndarray: 音频数据
         """
         # 检查缓存中是否已有相同参数的波形
-        cache_key = f"sine_{frequency}_{amplitude}_{duration}_{phase}"
-        if cache_key in self._cache:
-            return self._cache[cache_key].copy()
+        cache_key = self._cache.make_key('sine', frequency, amplitude, duration, phase)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached.copy() if copy else cached
             
-        t = np.linspace(0, duration, int(self.sample_rate * duration), False)
-        audio = amplitude * np.sin(2 * np.pi * frequency * t + phase)
+        audio = self._period_table.render([frequency], [amplitude], int(self.sample_rate * duration), [phase])
         
         # 应用淡入淡出以避免爆音
         fade_samples = int(0.01 * self.sample_rate)  # 10ms淡入淡出
@@ -76,12 +541,11 @@ class AudioEngine:
             audio[-fade_samples:] *= fade_out
         
         # 缓存结果
-        if len(self._cache) < 100:  # 限制缓存大小
-            self._cache[cache_key] = audio.copy()
-            
-        return audio
+        cached = self._cache.put(cache_key, audio)
+        return cached.copy() if copy else cached
     
-    def generate_harmonic_series(self, fundamental_freq, num_harmonics=5, amplitudes=None, duration=1.0):
+    def generate_harmonic_series(self, fundamental_freq, num_harmonics=5, amplitudes=None, duration=1.0,
+                                 copy=True):
         """生成谐波级数 (基频加上多个谐波)
         
         Args:
@@ -89,6 +553,7 @@ class AudioEngine:
             num_harmonics: 谐波数量
             amplitudes: 各谐波的相对振幅，如果为None则自动设为1/n
             duration: 持续时间(秒)
+            copy: 是否返回可修改的副本，False时返回缓存中的只读数组
             
         Returns:
             numpy.ndarray: 合成的音频数据
@@ -100,92 +565,60 @@ class AudioEngine:
             # 补全振幅数组
             amplitudes = amplitudes + [0.0] * (num_harmonics - len(amplitudes))
             
-        # 生成基频
-        audio = self.generate_sine_wave(fundamental_freq, amplitudes[0], duration)
+        # 检查缓存
+        cache_key = self._cache.make_key('harmonic', fundamental_freq, amplitudes[:num_harmonics], duration)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached.copy() if copy else cached
+            
+        # 所有谐波一次合成，整数倍频率共享基频的周期
+        frequencies = [fundamental_freq * (i + 1) for i in range(num_harmonics)]
+        audio = self._period_table.render(frequencies, amplitudes[:num_harmonics], int(self.sample_rate * duration))
         
-        # 添加谐波
-        for i in range(1, num_harmonics):
-            harmonic = self.generate_sine_wave(fundamental_freq * (i + 1), amplitudes[i], duration)
-            audio += harmonic
+        # 应用淡入淡出以避免爆音
+        fade_samples = int(0.01 * self.sample_rate)  # 10ms淡入淡出
+        if len(audio) > 2 * fade_samples:
+            fade_in = np.linspace(0, 1, fade_samples)
+            fade_out = np.linspace(1, 0, fade_samples)
+            audio[:fade_samples] *= fade_in
+            audio[-fade_samples:] *= fade_out
             
         # 归一化，防止削波
         if np.max(np.abs(audio)) > 1.0:
             audio = audio / np.max(np.abs(audio))
             
-        return audio
+        # 缓存结果
+        cached = self._cache.put(cache_key, audio)
+        return cached.copy() if copy else cached
     
-    def generate_chord(self, notes, duration=1.0, equal_amplitude=True):
+    def generate_chord(self, notes, duration=1.0, equal_amplitude=True, copy=True):
         """生成和弦 (同时播放的多个音符)
         
         Args:
             notes: 音符列表，可以是音符名称或频率
             duration: 持续时间(秒)
             equal_amplitude: 是否所有音符使用相同振幅
+            copy: 是否返回可修改的副本，False时返回缓存中的只读数组
             
         Returns:
             numpy.ndarray: 合成的和弦音频
         """
         # 检查缓存
-        cache_key = f"chord_{'_'.join(str(n) for n in notes)}_{duration}"
-        if cache_key in self._cache:
-            return self._cache[cache_key].copy()
+        cache_key = self._cache.make_key('chord', [str(n) for n in notes], duration, equal_amplitude)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached.copy() if copy else cached
             
-        chord_audio = np.zeros(int(self.sample_rate * duration))
-        
         # 确定每个音符的振幅
         if equal_amplitude:
             amplitude = 1.0 / len(notes)
         else:
             amplitude = 0.5
         
-        # 音符到频率的扩展映射（增加更多音符）
-        extended_note_freqs = {
-            # 第三个八度
-            'C3': 130.81, 'C#3': 138.59, 'D3': 146.83, 'D#3': 155.56,
-            'E3': 164.81, 'F3': 174.61, 'F#3': 185.00, 'G3': 196.00,
-            'G#3': 207.65, 'A3': 220.00, 'A#3': 233.08, 'B3': 246.94,
-            
-            # 第四个八度（中央C所在的八度）
-            'C4': 261.63, 'C#4': 277.18, 'D4': 293.66, 'D#4': 311.13,
-            'E4': 329.63, 'F4': 349.23, 'F#4': 369.99, 'G4': 392.00,
-            'G#4': 415.30, 'A4': 440.00, 'A#4': 466.16, 'B4': 493.88,
-            
-            # 第五个八度
-            'C5': 523.25, 'C#5': 554.37, 'D5': 587.33, 'D#5': 622.25,
-            'E5': 659.26, 'F5': 698.46, 'F#5': 739.99, 'G5': 783.99,
-            'G#5': 830.61, 'A5': 880.00, 'A#5': 932.33, 'B5': 987.77,
-            
-            # 第六个八度
-            'C6': 1046.50, 'C#6': 1108.73, 'D6': 1174.66, 'D#6': 1244.51,
-            'E6': 1318.51, 'F6': 1396.91, 'F#6': 1479.98, 'G6': 1567.98,
-            'G#6': 1661.22, 'A6': 1760.00, 'A#6': 1864.66, 'B6': 1975.53
-        }
-        
-        # 合成每个音符
-        for note in notes:
-            # 如果输入是音符名称而非频率
-            if isinstance(note, str):
-                if note in extended_note_freqs:
-                    frequency = extended_note_freqs[note]
-                elif note in self.note_freqs:
-                    frequency = self.note_freqs[note]
-                else:
-                    try:
-                        # 尝试直接转换为频率
-                        frequency = float(note)
-                    except ValueError:
-                        print(f"警告: 未知音符 '{note}'，将被忽略")
-                        continue
-            else:
-                try:
-                    # 如果是数值类型，直接作为频率使用
-                    frequency = float(note)
-                except (ValueError, TypeError):
-                    print(f"警告: 无法转换为频率的值 '{note}'，将被忽略")
-                    continue
-                
-            note_audio = self.generate_sine_wave(frequency, amplitude, duration)
-            chord_audio += note_audio
+        # 所有音符一次合成
+        frequencies = [f for f in (self._resolve_frequency(note) for note in notes) if f is not None]
+        chord_audio = self._period_table.render(frequencies, [amplitude] * len(frequencies),
+                                                int(self.sample_rate * duration))
             
         # 归一化
         if np.max(np.abs(chord_audio)) > 1.0:
@@ -200,12 +633,10 @@ class AudioEngine:
             chord_audio[-fade_samples:] *= fade_out
         
         # 缓存结果
-        if len(self._cache) < 100:  # 限制缓存大小
-            self._cache[cache_key] = chord_audio.copy()
-            
-        return chord_audio
+        cached = self._cache.put(cache_key, chord_audio)
+        return cached.copy() if copy else cached
     
-    def generate_beat(self, freq1, freq2, amplitude=0.5, duration=3.0):
+    def generate_beat(self, freq1, freq2, amplitude=0.5, duration=3.0, copy=True):
         """生成拍现象音频 (两个频率接近的正弦波叠加)
         
         Args:
@@ -213,19 +644,20 @@ class AudioEngine:
             freq2: 第二个频率(Hz)
             amplitude: 振幅
             duration: 持续时间(秒)
+            copy: 是否返回可修改的副本，False时返回缓存中的只读数组
             
         Returns:
             numpy.ndarray: 拍频音频
         """
         # 检查缓存
-        cache_key = f"beat_{freq1}_{freq2}_{amplitude}_{duration}"
-        if cache_key in self._cache:
-            return self._cache[cache_key].copy()
+        cache_key = self._cache.make_key('beat', freq1, freq2, amplitude, duration)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached.copy() if copy else cached
             
-        t = np.linspace(0, duration, int(self.sample_rate * duration), False)
-        wave1 = amplitude * np.sin(2 * np.pi * freq1 * t)
-        wave2 = amplitude * np.sin(2 * np.pi * freq2 * t)
-        beat_wave = wave1 + wave2
+        # 有理频率的拍在公共周期后严格重复，只需计算一个周期
+        beat_wave = self._period_table.render([freq1, freq2], [amplitude, amplitude],
+                                              int(self.sample_rate * duration))
         
         # 归一化
         if np.max(np.abs(beat_wave)) > 1.0:
@@ -240,36 +672,155 @@ class AudioEngine:
             beat_wave[-fade_samples:] *= fade_out
         
         # 缓存结果
-        if len(self._cache) < 100:  # 限制缓存大小
-            self._cache[cache_key] = beat_wave.copy()
+        cached = self._cache.put(cache_key, beat_wave)
+        return cached.copy() if copy else cached
+    
+    def cache_stats(self):
+        """获取波形缓存的统计信息
+        
+        Returns:
+            dict: 条目数、字节数、命中/未命中/淘汰次数和命中率
+        """
+        return self._cache.stats()
+    
+    def _resolve_frequency(self, note):
+        """将音符名称或数值转换为频率
+        
+        Args:
+            note: 音符名称(如'A4')或频率值
+            
+        Returns:
+            float: 频率(Hz)，无法识别时返回None
+        """
+        # 如果输入是音符名称而非频率
+        if isinstance(note, str):
+            if note in EXTENDED_NOTE_FREQS:
+                return EXTENDED_NOTE_FREQS[note]
+            if note in self.note_freqs:
+                return self.note_freqs[note]
+            try:
+                # 尝试直接转换为频率
+                return float(note)
+            except ValueError:
+                print(f"警告: 未知音符 '{note}'，将被忽略")
+                return None
+        
+        try:
+            # 如果是数值类型，直接作为频率使用
+            return float(note)
+        except (ValueError, TypeError):
+            print(f"警告: 无法转换为频率的值 '{note}'，将被忽略")
+            return None
+    
+    def create_tone_stream(self, frequencies, amplitudes, duration=None, phases=None):
+        """创建流式振荡器，按块生成音频而不预先分配整段缓冲区
+        
+        振幅之和超过1时按比例缩小，保证任意时刻都不会削波。
+        
+        Args:
+            frequencies: 各分量频率列表(Hz)
+            amplitudes: 各分量振幅列表
+            duration: 持续时间(秒)，None表示无限长
+            phases: 各分量初始相位(弧度)
             
-        return beat_wave
+        Returns:
+            ToneStream: 流式振荡器
+        """
+        amplitudes = np.asarray(amplitudes, dtype=np.float64)
+        total = np.sum(np.abs(amplitudes))
+        if total > 1.0:
+            amplitudes = amplitudes / total
+        return ToneStream(frequencies, amplitudes, self.sample_rate, duration, phases,
+                          period_table=self._period_table)
+    
+    def stream_sine_wave(self, frequency, amplitude=0.5, duration=None, phase=0.0):
+        """创建正弦波的流式振荡器，参数含义与generate_sine_wave相同"""
+        return self.create_tone_stream([frequency], [amplitude], duration, [phase])
+    
+    def stream_harmonic_series(self, fundamental_freq, num_harmonics=5, amplitudes=None, duration=None):
+        """创建谐波级数的流式振荡器，参数含义与generate_harmonic_series相同"""
+        if amplitudes is None:
+            amplitudes = [1.0 / (i + 1) for i in range(num_harmonics)]
+        elif len(amplitudes) < num_harmonics:
+            amplitudes = list(amplitudes) + [0.0] * (num_harmonics - len(amplitudes))
+        frequencies = [fundamental_freq * (i + 1) for i in range(num_harmonics)]
+        return self.create_tone_stream(frequencies, amplitudes[:num_harmonics], duration)
+    
+    def stream_chord(self, notes, duration=None, equal_amplitude=True):
+        """创建和弦的流式振荡器，参数含义与generate_chord相同"""
+        frequencies = [f for f in (self._resolve_frequency(note) for note in notes) if f is not None]
+        amplitude = 1.0 / len(notes) if equal_amplitude else 0.5
+        return self.create_tone_stream(frequencies, [amplitude] * len(frequencies), duration)
+    
+    def stream_beat(self, freq1, freq2, amplitude=0.5, duration=None):
+        """创建拍现象的流式振荡器，参数含义与generate_beat相同"""
+        return self.create_tone_stream([freq1, freq2], [amplitude, amplitude], duration)
     
     def _playback_worker(self):
-        """音频播放工作线程"""
+        """供给线程：把当前播放源写入环形缓冲区，预读完成后挂接到共享输出流"""
+        ring = self._ring
+        source = None
+        serial = None
+        attached = False
+        block_time = self.buffer_size / self.sample_rate
+        
         try:
-            with sd.OutputStream(
-                samplerate=self.sample_rate,
-                blocksize=self.buffer_size,
-                channels=1,
-                callback=self._audio_callback
-            ) as stream:
-                self.stream = stream
-                
-                while self.is_playing:
-                    # 线程保持活动状态，通过回调函数处理音频输出
-                    time.sleep(0.1)
-                    
-                self.stream = None
+            while not self._feeder_exit:
+                # 先读音源再读序号：_start_source先更新序号再替换音源
+                current = self._source
+                current_serial = self._source_serial
+                if current is not source or current_serial != serial:
+                    # 切换音源：丢弃尚未播放的旧数据，新数据紧接其后；
+                    # 停止或播完时回调已从输出流卸下，需要重新挂接
+                    source = current
+                    serial = current_serial
+                    attached = False
+                    ring.discard_before(ring.write_position)
+                    self._end_position = None
                 
+                if source is not None:
+                    if self._end_position is None:
+                        frames = ring.free()
+                        if frames > 0:
+                            ring.write(source.read(frames))
+                            if source.finished:
+                                self._end_position = ring.write_position
+                        if not attached:
+                            # 输出流已在运行，挂接后下一个回调周期即开始发声
+                            self.stream.attach(self._audio_callback, self.stop_audio)
+                            attached = True
+                    elif ring.read_position >= self._end_position:
+                        self._finish_source(source)
+                        continue
+                    self._feed_event.wait(block_time / 2)
+                else:
+                    # 没有播放源时一直休眠，_start_source和cleanup会唤醒
+                    self._feed_event.wait()
+                self._feed_event.clear()
         except Exception as e:
             print(f"音频播放错误: {e}")
             self.is_playing = False
-            self.stream = None
+            self._source = None
+            self._playback_done.set()
+        finally:
+            self.playback_thread = None
+    
+    def _finish_source(self, source):
+        """播放源结束后的状态更新（若期间已切换到新音源则不做处理）"""
+        with self._control_lock:
+            if self._source is source:
+                self._source = None
+                self.is_playing = False
+                self.current_audio = None
+                self.current_stream = None
+                self._playback_done.set()
+                self.stream.detach(self._audio_callback)
     
     def _audio_callback(self, outdata, frames, time, status):
         """音频回调函数，提供音频数据给声卡
         
+        只从环形缓冲区复制数据，不分配内存、不加锁，保证回调耗时稳定。
+        
         Args:
             outdata: 输出缓冲区
             frames: 要填充的帧数
@@ -277,65 +828,72 @@ class AudioEngine:
             status: 状态标志
         """
         if status:
-            print(f"回调状态: {status}")
+            self.xrun_stats['device_xruns'] += 1
         
-        if self.current_audio is None:
-            # 没有音频数据，输出静音
-            outdata[:] = np.zeros((frames, 1), dtype=np.float32)
+        out = outdata[:, 0]
+        if not self.is_playing:
+            out.fill(0)
             return
         
-        # 尝试从循环队列获取音频数据
-        try:
-            if not hasattr(self, '_playback_position'):
-                self._playback_position = 0
-                
-            # 计算从当前播放位置开始的可用采样数量
-            remaining = len(self.current_audio) - self._playback_position
-            
-            if remaining >= frames:
-                # 有足够的数据可以播放
-                outdata[:, 0] = self.current_audio[self._playback_position:self._playback_position+frames]
-                self._playback_position += frames
-                
-            else:
-                # 当前音频数据不足以填满输出缓冲区
-                if remaining > 0:
-                    # 先复制剩余的音频数据
-                    outdata[:remaining, 0] = self.current_audio[self._playback_position:]
-                    
-                # 根据是否循环播放决定后续操作
-                if self.loop_playback:
-                    # 循环播放: 从头开始继续填充
-                    self._playback_position = 0
-                    still_needed = frames - remaining
-                    
-                    # 可能需要多次循环才能填满缓冲区
-                    while still_needed > 0 and self.loop_playback:
-                        if still_needed <= len(self.current_audio):
-                            # 一次循环足够填充剩余空间
-                            outdata[remaining:, 0] = self.current_audio[:still_needed]
-                            self._playback_position = still_needed
-                            still_needed = 0
-                        else:
-                            # 需要多次循环
-                            outdata[remaining:remaining+len(self.current_audio), 0] = self.current_audio
-                            still_needed -= len(self.current_audio)
-                            remaining += len(self.current_audio)
-                else:
-                    # 非循环播放: 用静音填充剩余部分并结束播放
-                    outdata[remaining:, 0] = 0
-                    # 播放结束，重置状态
-                    self.is_playing = False
-                    self._playback_position = 0
-                    
-        except Exception as e:
-            print(f"音频回调错误: {e}")
-            outdata[:] = np.zeros((frames, 1), dtype=np.float32)
-            self.is_playing = False
+        read = self._ring.read_into(out)
+        if read < frames and self._end_position is None:
+            # 播放源尚未结束但缓冲区已空：欠载
+            self.xrun_stats['underruns'] += 1
+            self.xrun_stats['underrun_frames'] += frames - read
+        for listener in self._output_listeners:
+            listener(out)
+        self._feed_event.set()
+    
+    def add_output_listener(self, listener):
+        """注册输出监听函数，每个实际输出的音频块都会传给它
+        
+        监听函数在音频回调中执行，只应做复制等轻量操作（如StreamingSpectrumAnalyzer.write）。
+        
+        Args:
+            listener: 接收一维float32音频块的函数
+        """
+        self._output_listeners = self._output_listeners + (listener,)
+    
+    def remove_output_listener(self, listener):
+        """移除输出监听函数
+        
+        Args:
+            listener: add_output_listener注册的函数
+        """
+        self._output_listeners = tuple(l for l in self._output_listeners if l != listener)
+    
+    def _start_source(self, source):
+        """切换到新的播放源，无需停止输出流"""
+        if self.stream is None:
+            self.stream = OutputStreamManager.get(self.sample_rate, blocksize=self.buffer_size)
+        with self._control_lock:
+            self._playback_done.clear()
+            self._source_serial += 1
+            self._source = source
+            self.is_playing = True
+            if self.playback_thread is None or not self.playback_thread.is_alive():
+                self._feeder_exit = False
+                self.playback_thread = threading.Thread(target=self._playback_worker)
+                self.playback_thread.daemon = True
+                self.playback_thread.start()
+        self._feed_event.set()
+    
+    def playback_stats(self):
+        """获取播放路径的统计信息
+        
+        Returns:
+            dict: 欠载次数、欠载帧数、设备报告的xrun次数和缓冲区中待播放的帧数
+        """
+        stats = dict(self.xrun_stats)
+        stats['buffered_frames'] = self._ring.available()
+        stats['ring_capacity'] = self._ring.capacity
+        return stats
     
     def play_audio(self, audio_data, blocking=False, loop=False):
         """播放音频数据
         
+        正在播放时直接切换到新音频，不需要重新打开输出流。
+        
         Args:
             audio_data: 要播放的音频数据，numpy.ndarray
             blocking: 是否阻塞线程等待播放完成
@@ -349,34 +907,39 @@ class AudioEngine:
         if np.max(np.abs(audio_data)) > 1.0:
             audio_data = audio_data / np.max(np.abs(audio_data))
             
-        # 如果已经在播放，先停止
-        if self.is_playing:
-            self.stop_audio()
-            time.sleep(0.1)  # 等待清理完成
-            
         # 设置循环播放状态
         self.loop_playback = loop
             
         # 设置当前音频
+        self.current_stream = None
         self.current_audio = audio_data
-        self._playback_position = 0  # 重置播放位置
-            
-        # 启动播放线程
-        self.is_playing = True
-        self.playback_thread = threading.Thread(target=self._playback_worker)
-        self.playback_thread.daemon = True
-        self.playback_thread.start()
+        self._start_source(ArraySource(audio_data, loop))
         
-        if blocking:
+        if blocking and not loop:
             # 阻塞模式：等待播放完成
             try:
-                # 计算大致的播放时间
-                play_duration = len(audio_data) / self.sample_rate
-                # 增加一点余量以确保完全播放
-                time.sleep(play_duration + 0.1)
+                self._playback_done.wait()
             except KeyboardInterrupt:
                 self.stop_audio()
                 
+    def play_stream(self, tone_stream, blocking=False):
+        """播放流式振荡器，第一个块生成后立即开始发声
+        
+        Args:
+            tone_stream: ToneStream实例，可在播放中修改其频率和振幅
+            blocking: 是否阻塞直到播放结束（仅对有限时长有效）
+        """
+        self.loop_playback = False
+        self.current_audio = None
+        self.current_stream = tone_stream
+        self._start_source(tone_stream)
+        
+        if blocking and tone_stream.total_frames is not None:
+            try:
+                self._playback_done.wait()
+            except KeyboardInterrupt:
+                self.stop_audio()
+    
     def set_loop(self, loop_state):
         """设置循环播放状态
         
@@ -384,16 +947,22 @@ class AudioEngine:
             loop_state: 是否循环播放
         """
         self.loop_playback = loop_state
+        source = self._source
+        if isinstance(source, ArraySource):
+            source.loop = loop_state
                 
     def stop_audio(self):
-        """停止音频播放"""
-        self.is_playing = False
-        self.loop_playback = False
-        if self.playback_thread and self.playback_thread.is_alive():
-            # 等待播放线程结束
-            time.sleep(0.1)
-        self.current_audio = None
-        self._playback_position = 0
+        """停止音频播放，立即生效"""
+        with self._control_lock:
+            self.is_playing = False
+            self.loop_playback = False
+            self._source = None
+            self.current_audio = None
+            self.current_stream = None
+            self._playback_done.set()
+        if self.stream is not None:
+            self.stream.detach(self._audio_callback)
+        self._feed_event.set()
     
     def save_audio(self, audio_data, filename):
         """保存音频到WAV文件
@@ -432,10 +1001,12 @@ class AudioEngine:
         """清理资源"""
         self.stop_audio()
         
-        # 发送退出信号给播放线程
-        if self.playback_thread and self.playback_thread.is_alive():
-            self.audio_queue.put(None)
-            self.playback_thread.join(timeout=1.0)
+        # 通知供给线程退出
+        thread = self.playback_thread
+        if thread and thread.is_alive():
+            self._feeder_exit = True
+            self._feed_event.set()
+            thread.join(timeout=1.0)
 
 
 # 测试代码
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+简谐振动与音乐可视化 - 批量音频分析
+用进程池并行分析多段音频，把频率分量、音符和和弦汇总为一张结构化表
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import librosa
+
+from audio_analyzer import AudioAnalyzer
+
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.mp3')
+
+# 每个进程复用一个分析器，窗函数计划缓存在同一进程的任务之间共享
+_worker_analyzer = None
+
+
+def _init_worker(sample_rate):
+    global _worker_analyzer
+    _worker_analyzer = AudioAnalyzer(sample_rate)
+
+
+def _analyze_task(task):
+    """在工作进程中分析一段音频
+
+    Args:
+        task: (来源名称, 文件路径或None, 共享内存名称, 偏移字节数, 样本数, 分量数)
+
+    Returns:
+        tuple: (来源名称, [(频率, 振幅, 音符), ...], 和弦名称, 错误信息)
+    """
+    name, path, shm_name, offset, length, num_components = task
+    analyzer = _worker_analyzer
+    shm = None
+    try:
+        if path is not None:
+            audio, _ = librosa.load(path, sr=analyzer.sample_rate, mono=True)
+        else:
+            # 直接在共享内存上分析，输入数组不经过进程间序列化
+            shm = shared_memory.SharedMemory(name=shm_name)
+            audio = np.ndarray((length,), dtype=np.float64, buffer=shm.buf, offset=offset)
+
+        notes = analyzer.identify_musical_notes(audio, num_notes=num_components)
+        chord = analyzer.analyze_chord(audio)
+        components = [(float(freq), float(amp), note) for note, freq, amp in notes]
+        return name, components, chord, ''
+    except Exception as e:
+        return name, [], '', str(e)
+    finally:
+        audio = None
+        if shm is not None:
+            shm.close()
+
+
+def _share_arrays(arrays):
+    """把所有输入数组依次复制到一块共享内存
+
+    Args:
+        arrays: 一维音频数组列表
+
+    Returns:
+        tuple: (共享内存对象, [(偏移字节数, 样本数), ...])
+    """
+    layout = []
+    total = 0
+    for audio in arrays:
+        layout.append((total, len(audio)))
+        total += len(audio) * 8
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    for audio, (offset, length) in zip(arrays, layout):
+        view = np.ndarray((length,), dtype=np.float64, buffer=shm.buf, offset=offset)
+        view[:] = audio
+        del view
+    return shm, layout
+
+
+def analyze_batch(sources, sample_rate=44100, num_components=5, max_workers=None, names=None):
+    """批量分析多段音频
+
+    文件由工作进程各自读取；数组先复制到一块共享内存，工作进程按偏移直接读取。
+
+    Args:
+        sources: 文件路径或一维音频数组的列表，数组的采样率应为sample_rate
+        sample_rate: 分析采样率，文件读取时重采样到该采样率
+        num_components: 每段音频提取的频率分量数
+        max_workers: 进程数，None表示使用全部CPU核心
+        names: 各来源在结果表中的名称，None时文件用文件名、数组用序号
+
+    Returns:
+        np.ndarray: 结构化数组，每个频率分量一行，字段为
+            source, component, frequency, amplitude, note, chord, error。
+            没有检测到分量或分析失败的音频保留一行，component为-1
+    """
+    if names is None:
+        names = [os.path.basename(s) if isinstance(s, (str, os.PathLike)) else f"array_{i}"
+                 for i, s in enumerate(sources)]
+
+    arrays = [np.asarray(s, dtype=np.float64).ravel() for s in sources
+              if not isinstance(s, (str, os.PathLike))]
+    shm, layout = _share_arrays(arrays) if arrays else (None, [])
+
+    tasks = []
+    array_index = 0
+    for name, source in zip(names, sources):
+        if isinstance(source, (str, os.PathLike)):
+            tasks.append((name, os.fspath(source), None, 0, 0, num_components))
+        else:
+            offset, length = layout[array_index]
+            tasks.append((name, None, shm.name, offset, length, num_components))
+            array_index += 1
+
+    try:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(tasks)))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(sample_rate,)) as executor:
+            results = list(executor.map(_analyze_task, tasks))
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    return _build_table(results)
+
+
+def _build_table(results):
+    """把各段音频的分析结果整理为结构化数组"""
+    rows = []
+    for name, components, chord, error in results:
+        if not components:
+            rows.append((name, -1, np.nan, np.nan, '', chord, error))
+        for i, (freq, amp, note) in enumerate(components):
+            rows.append((name, i, freq, amp, note, chord, error))
+
+    def width(column):
+        return max([len(row[column]) for row in rows] + [1])
+
+    dtype = [
+        ('source', f'U{width(0)}'),
+        ('component', 'i4'),
+        ('frequency', 'f8'),
+        ('amplitude', 'f8'),
+        ('note', f'U{width(4)}'),
+        ('chord', f'U{width(5)}'),
+        ('error', f'U{width(6)}'),
+    ]
+    return np.array(rows, dtype=dtype)
+
+
+def find_audio_files(directory):
+    """列出目录中的音频文件（按文件名排序）"""
+    return sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                  if f.lower().endswith(AUDIO_EXTENSIONS))
+
+
+# 命令行：python batch_analysis.py <目录或文件>...
+if __name__ == "__main__":
+    paths = []
+    for arg in sys.argv[1:]:
+        paths += find_audio_files(arg) if os.path.isdir(arg) else [arg]
+    if not paths:
+        print("用法: python batch_analysis.py <目录或音频文件>...")
+        sys.exit(1)
+
+    table = analyze_batch(paths)
+    for row in table:
+        if row['component'] < 0:
+            print(f"{row['source']}: 无分量 {row['error']}")
+        else:
+            print(f"{row['source']}: {row['frequency']:.2f} Hz  {row['amplitude']:.4f}  "
+                  f"{row['note']}  {row['chord']}")
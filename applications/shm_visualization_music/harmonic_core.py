@@ -25,7 +25,66 @@ class HarmonicParams:
     frequency: float = 1.0    # 频率(Hz)
     phase: float = 0.0        # 初始相位(弧度)
     damping: float = 0.0      # 阻尼系数
+
+
+# 单次广播计算允许的最大元素数（振子数 × 时间点数），超出时按时间分块
+_MAX_BROADCAST_ELEMENTS = 1 << 20
+
+
+def _evaluate_oscillators(amplitude: np.ndarray, frequency: np.ndarray, phase: np.ndarray,
+                          damping: np.ndarray, t: Union[float, np.ndarray],
+                          order: int = 0) -> Union[float, np.ndarray]:
+    """一次广播计算多个简谐振动在给定时刻的叠加值
+    
+    Args:
+        amplitude: 各振子振幅数组
+        frequency: 各振子频率数组(Hz)
+        phase: 各振子初始相位数组(弧度)
+        damping: 各振子阻尼系数数组，非正值视为无阻尼
+        t: 时间(秒)，标量或任意形状的数组
+        order: 0为位置，1为速度，2为加速度
+        
+    Returns:
+        叠加值，形状与t相同；t为标量时返回标量
+    """
+    t = np.asarray(t, dtype=np.float64)
+    t_flat = t.reshape(-1)
+    result = np.zeros(t_flat.shape, dtype=np.float64)
+    
+    if amplitude.size > 0:
+        omega = (2 * np.pi * frequency)[:, None]
+        phase = phase[:, None]
+        # 与单振子实现保持一致：只有正的阻尼系数才产生衰减
+        damping = np.where(damping > 0, damping, 0.0)[:, None]
+        is_damped = bool(np.any(damping > 0))
+        
+        step = max(1, _MAX_BROADCAST_ELEMENTS // amplitude.size)
+        for start in range(0, t_flat.size, step):
+            t_block = t_flat[None, start:start + step]
+            angle = omega * t_block + phase
+            
+            if order == 0:
+                terms = np.sin(angle)
+            elif order == 1:
+                terms = omega * np.cos(angle)
+                if is_damped:
+                    terms -= damping * np.sin(angle)
+            else:
+                sin_term = np.sin(angle)
+                terms = -omega**2 * sin_term
+                if is_damped:
+                    terms += damping**2 * sin_term - 2 * damping * omega * np.cos(angle)
+            
+            if is_damped:
+                terms *= np.exp(-damping * t_block)
+            
+            # 振幅加权求和，一次完成所有振子的叠加
+            result[start:start + step] = amplitude @ terms
     
+    if t.ndim == 0:
+        return float(result[0])
+    return result.reshape(t.shape)
+
 
 class HarmonicMotion:
     """简谐振动基类"""
@@ -40,79 +99,47 @@ class HarmonicMotion:
         self.type = type
         self.params = params or HarmonicParams()
         
-    def position(self, t: float) -> float:
+    def _param_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """以单元素数组形式返回振动参数，供向量化计算使用"""
+        return (np.array([self.params.amplitude], dtype=np.float64),
+                np.array([self.params.frequency], dtype=np.float64),
+                np.array([self.params.phase], dtype=np.float64),
+                np.array([self.params.damping], dtype=np.float64))
+    
+    def position(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """计算给定时刻的位置
         
         Args:
-            t: 时间(秒)
+            t: 时间(秒)，可以是标量或NumPy数组
             
         Returns:
-            位置值
+            位置值，与t形状相同
         """
-        amplitude = self.params.amplitude
-        frequency = self.params.frequency
-        phase = self.params.phase
-        damping = self.params.damping
-        
-        # 计算阻尼衰减
-        if damping > 0:
-            amplitude *= np.exp(-damping * t)
-            
-        return amplitude * np.sin(2 * np.pi * frequency * t + phase)
+        return _evaluate_oscillators(*self._param_arrays(), t, order=0)
     
-    def velocity(self, t: float) -> float:
+    def velocity(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """计算给定时刻的速度
         
         Args:
-            t: 时间(秒)
+            t: 时间(秒)，可以是标量或NumPy数组
             
         Returns:
-            速度值
-        """
-        amplitude = self.params.amplitude
-        frequency = self.params.frequency
-        phase = self.params.phase
-        damping = self.params.damping
-        
-        # 计算阻尼衰减
-        if damping > 0:
-            damping_factor = np.exp(-damping * t)
-            # 速度由位置的导数和阻尼项组成
-            return (2 * np.pi * frequency * amplitude * np.cos(2 * np.pi * frequency * t + phase) - 
-                    damping * amplitude * np.sin(2 * np.pi * frequency * t + phase)) * damping_factor
-        else:
-            return 2 * np.pi * frequency * amplitude * np.cos(2 * np.pi * frequency * t + phase)
+            速度值，与t形状相同
+        """
+        # 有阻尼时速度由位置的导数和阻尼项组成
+        return _evaluate_oscillators(*self._param_arrays(), t, order=1)
     
-    def acceleration(self, t: float) -> float:
+    def acceleration(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """计算给定时刻的加速度
         
         Args:
-            t: 时间(秒)
+            t: 时间(秒)，可以是标量或NumPy数组
             
         Returns:
-            加速度值
-        """
-        # 加速度是位置的二阶导数
-        amplitude = self.params.amplitude
-        frequency = self.params.frequency
-        phase = self.params.phase
-        damping = self.params.damping
-        
-        if damping > 0:
-            # 复杂情况，加速度包含阻尼项
-            omega = 2 * np.pi * frequency
-            damping_factor = np.exp(-damping * t)
-            sin_term = np.sin(omega * t + phase)
-            cos_term = np.cos(omega * t + phase)
-            
-            return damping_factor * (
-                -omega**2 * amplitude * sin_term
-                - 2 * damping * omega * amplitude * cos_term
-                + damping**2 * amplitude * sin_term
-            )
-        else:
-            # 简单情况，无阻尼
-            return -(2 * np.pi * frequency)**2 * amplitude * np.sin(2 * np.pi * frequency * t + phase)
+            加速度值，与t形状相同
+        """
+        # 加速度是位置的二阶导数，有阻尼时包含阻尼项
+        return _evaluate_oscillators(*self._param_arrays(), t, order=2)
     
     def energy(self) -> float:
         """计算振动的总能量
@@ -177,38 +204,46 @@ class SuperpositionMotion:
         """
         self.oscillators.append(oscillator)
     
-    def position(self, t: float) -> float:
+    def _param_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """将所有振子的参数收集为数组，供一次广播计算使用"""
+        params = [osc.params for osc in self.oscillators]
+        return (np.array([p.amplitude for p in params], dtype=np.float64),
+                np.array([p.frequency for p in params], dtype=np.float64),
+                np.array([p.phase for p in params], dtype=np.float64),
+                np.array([p.damping for p in params], dtype=np.float64))
+    
+    def position(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """计算叠加振动在给定时刻的位置
         
         Args:
-            t: 时间(秒)
+            t: 时间(秒)，可以是标量或NumPy数组
             
         Returns:
-            位置值
+            位置值，与t形状相同
         """
-        return sum(osc.position(t) for osc in self.oscillators)
+        return _evaluate_oscillators(*self._param_arrays(), t, order=0)
     
-    def velocity(self, t: float) -> float:
+    def velocity(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """计算叠加振动在给定时刻的速度
         
         Args:
-            t: 时间(秒)
+            t: 时间(秒)，可以是标量或NumPy数组
             
         Returns:
-            速度值
+            速度值，与t形状相同
         """
-        return sum(osc.velocity(t) for osc in self.oscillators)
+        return _evaluate_oscillators(*self._param_arrays(), t, order=1)
     
-    def acceleration(self, t: float) -> float:
+    def acceleration(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """计算叠加振动在给定时刻的加速度
         
         Args:
-            t: 时间(秒)
+            t: 时间(秒)，可以是标量或NumPy数组
             
         Returns:
-            加速度值
+            加速度值，与t形状相同
         """
-        return sum(osc.acceleration(t) for osc in self.oscillators)
+        return _evaluate_oscillators(*self._param_arrays(), t, order=2)
     
     def energy(self) -> float:
         """计算叠加振动的总能量
@@ -219,6 +254,299 @@ class SuperpositionMotion:
         # 简单叠加每个振动的能量
         # 注意：这只是近似，实际上需要考虑振动之间的相互作用
         return sum(osc.energy() for osc in self.oscillators)
+    
+    def to_bank(self) -> 'OscillatorBank':
+        """转换为数组形式的振子组
+        
+        Returns:
+            包含全部振子参数的OscillatorBank
+        """
+        return OscillatorBank.from_oscillators(self.oscillators)
+    
+    @classmethod
+    def from_bank(cls, bank: 'OscillatorBank') -> 'SuperpositionMotion':
+        """从振子组创建叠加振动（只包含启用的振子）
+        
+        Args:
+            bank: 振子组
+            
+        Returns:
+            新创建的SuperpositionMotion实例
+        """
+        return cls(bank.to_oscillators(enabled_only=True))
+
+
+class OscillatorBank:
+    """振子组 - 以连续float64数组保存大量简谐振动的参数
+    
+    与SuperpositionMotion的计算结果一致，但不为每个分量创建
+    HarmonicMotion对象，适合加法合成、分析重构等上千分量的场景。
+    """
+    
+    def __init__(self, capacity: int = 16):
+        """初始化振子组
+        
+        Args:
+            capacity: 初始预分配容量，超出时自动按倍数扩容
+        """
+        capacity = max(1, int(capacity))
+        self._size = 0
+        self._amplitude = np.zeros(capacity, dtype=np.float64)
+        self._frequency = np.zeros(capacity, dtype=np.float64)
+        self._phase = np.zeros(capacity, dtype=np.float64)
+        self._damping = np.zeros(capacity, dtype=np.float64)
+        self._enabled = np.zeros(capacity, dtype=bool)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def amplitude(self) -> np.ndarray:
+        """振幅数组（可原地修改的视图）"""
+        return self._amplitude[:self._size]
+    
+    @property
+    def frequency(self) -> np.ndarray:
+        """频率数组(Hz)（可原地修改的视图）"""
+        return self._frequency[:self._size]
+    
+    @property
+    def phase(self) -> np.ndarray:
+        """初始相位数组(弧度)（可原地修改的视图）"""
+        return self._phase[:self._size]
+    
+    @property
+    def damping(self) -> np.ndarray:
+        """阻尼系数数组（可原地修改的视图）"""
+        return self._damping[:self._size]
+    
+    @property
+    def enabled(self) -> np.ndarray:
+        """启用掩码（可原地修改的视图）"""
+        return self._enabled[:self._size]
+    
+    def _reserve(self, extra: int):
+        """确保还能再容纳extra个振子"""
+        required = self._size + extra
+        capacity = len(self._amplitude)
+        if required <= capacity:
+            return
+        
+        while capacity < required:
+            capacity *= 2
+        
+        for name in ('_amplitude', '_frequency', '_phase', '_damping', '_enabled'):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+    
+    def add(self, amplitude, frequency, phase=0.0, damping=0.0, enabled=True) -> np.ndarray:
+        """添加一个或一批振子
+        
+        Args:
+            amplitude: 振幅，标量或数组
+            frequency: 频率(Hz)，标量或数组
+            phase: 初始相位(弧度)，标量或数组
+            damping: 阻尼系数，标量或数组
+            enabled: 是否启用，标量或数组
+            
+        Returns:
+            新振子在振子组中的索引数组
+        """
+        amplitude, frequency, phase, damping, enabled = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(amplitude, dtype=np.float64)),
+            np.atleast_1d(np.asarray(frequency, dtype=np.float64)),
+            np.atleast_1d(np.asarray(phase, dtype=np.float64)),
+            np.atleast_1d(np.asarray(damping, dtype=np.float64)),
+            np.atleast_1d(np.asarray(enabled, dtype=bool))
+        )
+        count = amplitude.size
+        self._reserve(count)
+        
+        start, end = self._size, self._size + count
+        self._amplitude[start:end] = amplitude.ravel()
+        self._frequency[start:end] = frequency.ravel()
+        self._phase[start:end] = phase.ravel()
+        self._damping[start:end] = damping.ravel()
+        self._enabled[start:end] = enabled.ravel()
+        self._size = end
+        
+        return np.arange(start, end)
+    
+    def add_oscillator(self, oscillator: HarmonicMotion) -> int:
+        """添加一个HarmonicMotion对象的参数
+        
+        Args:
+            oscillator: 要添加的简谐振动
+            
+        Returns:
+            新振子的索引
+        """
+        params = oscillator.params
+        return int(self.add(params.amplitude, params.frequency, params.phase, params.damping)[0])
+    
+    def remove(self, indices):
+        """删除指定索引的振子，其余振子保持原有顺序
+        
+        Args:
+            indices: 单个索引、索引数组或布尔掩码
+        """
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        count = int(np.count_nonzero(keep))
+        
+        for name in ('_amplitude', '_frequency', '_phase', '_damping', '_enabled'):
+            data = getattr(self, name)
+            data[:count] = data[:self._size][keep]
+        self._size = count
+    
+    def set_enabled(self, indices, enabled: bool = True):
+        """设置指定振子的启用状态
+        
+        Args:
+            indices: 单个索引、索引数组或布尔掩码
+            enabled: 是否启用
+        """
+        self.enabled[indices] = enabled
+    
+    def clear(self):
+        """清空所有振子（保留已分配的容量）"""
+        self._size = 0
+    
+    def _active_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """返回启用振子的参数数组"""
+        mask = self.enabled
+        if mask.all():
+            return self.amplitude, self.frequency, self.phase, self.damping
+        return self.amplitude[mask], self.frequency[mask], self.phase[mask], self.damping[mask]
+    
+    def position(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """计算启用振子在给定时刻的叠加位置
+        
+        Args:
+            t: 时间(秒)，可以是标量或NumPy数组
+            
+        Returns:
+            位置值，与t形状相同
+        """
+        return _evaluate_oscillators(*self._active_arrays(), t, order=0)
+    
+    def velocity(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """计算启用振子在给定时刻的叠加速度
+        
+        Args:
+            t: 时间(秒)，可以是标量或NumPy数组
+            
+        Returns:
+            速度值，与t形状相同
+        """
+        return _evaluate_oscillators(*self._active_arrays(), t, order=1)
+    
+    def acceleration(self, t: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """计算启用振子在给定时刻的叠加加速度
+        
+        Args:
+            t: 时间(秒)，可以是标量或NumPy数组
+            
+        Returns:
+            加速度值，与t形状相同
+        """
+        return _evaluate_oscillators(*self._active_arrays(), t, order=2)
+    
+    def energy(self) -> float:
+        """计算启用振子的总能量（与SuperpositionMotion.energy相同的近似）
+        
+        Returns:
+            能量值
+        """
+        amplitude, frequency, _, _ = self._active_arrays()
+        return float(np.sum(0.5 * (2 * np.pi * frequency)**2 * amplitude**2))
+    
+    def to_oscillators(self, enabled_only: bool = False) -> List[HarmonicMotion]:
+        """转换为HarmonicMotion对象列表
+        
+        Args:
+            enabled_only: 是否只包含启用的振子
+            
+        Returns:
+            简谐振动列表
+        """
+        indices = np.flatnonzero(self.enabled) if enabled_only else range(self._size)
+        return [
+            HarmonicMotion(
+                type=HarmonicType.SINGLE,
+                params=HarmonicParams(
+                    amplitude=float(self._amplitude[i]),
+                    frequency=float(self._frequency[i]),
+                    phase=float(self._phase[i]),
+                    damping=float(self._damping[i])
+                )
+            )
+            for i in indices
+        ]
+    
+    @classmethod
+    def from_oscillators(cls, oscillators: List[HarmonicMotion]) -> 'OscillatorBank':
+        """从HarmonicMotion对象列表创建振子组
+        
+        Args:
+            oscillators: 简谐振动列表
+            
+        Returns:
+            新创建的OscillatorBank实例
+        """
+        bank = cls(capacity=len(oscillators))
+        if oscillators:
+            params = [osc.params for osc in oscillators]
+            bank.add([p.amplitude for p in params],
+                     [p.frequency for p in params],
+                     [p.phase for p in params],
+                     [p.damping for p in params])
+        return bank
+    
+    def to_dict(self) -> Dict:
+        """转换为字典表示
+        
+        每个振子使用与HarmonicMotion.to_dict相同的格式，并附加enabled字段
+        
+        Returns:
+            字典形式的参数
+        """
+        return {
+            'type': HarmonicType.SUPERPOSITION.name,
+            'oscillators': [
+                {
+                    'type': HarmonicType.SINGLE.name,
+                    'amplitude': float(self._amplitude[i]),
+                    'frequency': float(self._frequency[i]),
+                    'phase': float(self._phase[i]),
+                    'damping': float(self._damping[i]),
+                    'enabled': bool(self._enabled[i])
+                }
+                for i in range(self._size)
+            ]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Union[Dict, List[Dict]]) -> 'OscillatorBank':
+        """从字典创建实例
+        
+        Args:
+            data: to_dict的结果，或HarmonicMotion.to_dict结果组成的列表
+            
+        Returns:
+            新创建的OscillatorBank实例
+        """
+        entries = data['oscillators'] if isinstance(data, dict) else data
+        bank = cls(capacity=len(entries))
+        if entries:
+            bank.add([entry.get('amplitude', 1.0) for entry in entries],
+                     [entry.get('frequency', 1.0) for entry in entries],
+                     [entry.get('phase', 0.0) for entry in entries],
+                     [entry.get('damping', 0.0) for entry in entries],
+                     [entry.get('enabled', True) for entry in entries])
+        return bank
 
 
 class HarmonicToAudioMapper:
@@ -244,12 +572,12 @@ class HarmonicToAudioMapper:
             'C5': 523.25
         }
         
-    def harmonic_to_audio(self, harmonic: Union[HarmonicMotion, SuperpositionMotion], 
+    def harmonic_to_audio(self, harmonic: Union[HarmonicMotion, SuperpositionMotion, OscillatorBank], 
                          duration: float) -> np.ndarray:
         """将简谐振动转换为音频
         
         Args:
-            harmonic: 简谐振动或叠加振动
+            harmonic: 简谐振动、叠加振动或振子组
             duration: 音频时长(秒)
             
         Returns:
@@ -258,11 +586,8 @@ class HarmonicToAudioMapper:
         # 创建时间数组
         t = np.linspace(0, duration, int(self.sample_rate * duration), False)
         
-        # 计算音频样本
-        if isinstance(harmonic, SuperpositionMotion):
-            audio = np.array([harmonic.position(time) for time in t])
-        else:
-            audio = np.array([harmonic.position(time) for time in t])
+        # 一次向量化计算全部音频样本
+        audio = harmonic.position(t)
         
         # 归一化到[-1, 1]范围
         if np.max(np.abs(audio)) > 0:
@@ -371,7 +696,7 @@ if __name__ == "__main__":
     
     # 测试计算
     t_values = np.linspace(0, 1, 10)
-    positions = [simple_osc.position(t) for t in t_values]
+    positions = simple_osc.position(t_values)
     print("时间值:", t_values)
     print("位置值:", positions)
     
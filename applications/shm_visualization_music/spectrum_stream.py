@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+简谐振动与音乐可视化 - 实时频谱分析
+对播放或采集中的音频块做滑动窗口STFT，按固定频率刷新频谱显示
+"""
+
+import numpy as np
+from scipy import signal
+from scipy.fft import rfft, rfftfreq
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class StreamingSpectrumAnalyzer:
+    """流式STFT分析器
+
+    音频块写入预分配的环形缓冲区，每积累hop_size个样本产生一帧幅度谱。
+    每帧只对最近fft_size个样本做一次FFT，开销与音频总长度无关。
+    write只复制数据，可以在音频回调中调用；push/latest在其他线程计算频谱。
+    """
+
+    def __init__(self, sample_rate=44100, fft_size=4096, hop_size=1024, window_type='hann', history=4):
+        """初始化流式频谱分析器
+
+        Args:
+            sample_rate: 采样率
+            fft_size: 每帧的窗口长度
+            hop_size: 相邻帧之间的样本数，重叠率为 1 - hop_size/fft_size
+            window_type: 窗函数类型 ('hann', 'hamming', 'blackman')
+            history: 环形缓冲区容纳的窗口数，读取频谱时写入方可继续写入
+        """
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.hop_size = hop_size
+        self.frequencies = rfftfreq(fft_size, 1 / sample_rate)
+
+        self._window = signal.get_window(window_type, fft_size).astype(np.float32)
+        self._scale = 2 / fft_size  # 与AudioAnalyzer.analyze_frequency_content相同的归一化
+        self._buffer = np.zeros(fft_size * history, dtype=np.float32)
+        self._frame = np.empty(fft_size, dtype=np.float32)
+        self._write_pos = 0
+        self._next_frame = fft_size
+
+    @property
+    def overlap(self):
+        """相邻帧的重叠比例"""
+        return 1 - self.hop_size / self.fft_size
+
+    def reset(self):
+        """清空缓冲区，重新开始分析"""
+        self._buffer.fill(0)
+        self._write_pos = 0
+        self._next_frame = self.fft_size
+
+    def write(self, block):
+        """写入音频块（只复制数据）
+
+        Args:
+            block: 音频块，多声道时按声道取平均
+        """
+        block = np.asarray(block)
+        if block.ndim > 1:
+            block = block.mean(axis=1)
+        capacity = len(self._buffer)
+        if len(block) > capacity:
+            self._write_pos += len(block) - capacity
+            block = block[-capacity:]
+
+        count = len(block)
+        start = self._write_pos % capacity
+        first = min(count, capacity - start)
+        self._buffer[start:start + first] = block[:first]
+        self._buffer[:count - first] = block[first:]
+        self._write_pos += count
+
+    def push(self, block):
+        """写入音频块并返回期间完成的所有帧
+
+        Args:
+            block: 音频块
+
+        Returns:
+            List[np.ndarray]: 按时间顺序的幅度谱帧
+        """
+        frames = []
+        block = np.asarray(block)
+        for start in range(0, len(block), self.hop_size):
+            self.write(block[start:start + self.hop_size])
+            while self._write_pos >= self._next_frame:
+                frames.append(self._compute(self._next_frame))
+                self._next_frame += self.hop_size
+        return frames
+
+    def latest(self):
+        """计算最近fft_size个样本的幅度谱
+
+        Returns:
+            np.ndarray: 幅度谱，样本不足一帧时返回None
+        """
+        end = self._write_pos
+        if end < self.fft_size:
+            return None
+        return self._compute(end)
+
+    def _compute(self, end):
+        capacity = len(self._buffer)
+        start = (end - self.fft_size) % capacity
+        first = min(self.fft_size, capacity - start)
+        self._frame[:first] = self._buffer[start:start + first]
+        self._frame[first:] = self._buffer[:self.fft_size - first]
+        self._frame *= self._window
+        return np.abs(rfft(self._frame)) * self._scale
+
+
+class LiveSpectrumFeeder(QObject):
+    """按固定频率把流式分析结果送到SpectrumVisualizer"""
+
+    finished = pyqtSignal()  # 数据源停止后发出
+
+    def __init__(self, analyzer, visualizer, interval_ms=50, max_display_freq=5000, is_active=None):
+        """初始化频谱刷新器
+
+        Args:
+            analyzer: StreamingSpectrumAnalyzer实例
+            visualizer: SpectrumVisualizer实例
+            interval_ms: 刷新间隔(毫秒)
+            max_display_freq: 送去显示的最高频率(Hz)
+            is_active: 返回数据源是否仍在运行的函数，返回False时自动停止
+        """
+        super().__init__()
+        self.analyzer = analyzer
+        self.visualizer = visualizer
+        self.is_active = is_active
+        self._bins = int(np.searchsorted(analyzer.frequencies, max_display_freq))
+
+        self.timer = QTimer()
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._refresh)
+
+    def start(self):
+        """开始刷新"""
+        self.analyzer.reset()
+        self.timer.start()
+
+    def stop(self):
+        """停止刷新"""
+        if self.timer.isActive():
+            self.timer.stop()
+            self.finished.emit()
+
+    def _refresh(self):
+        if self.is_active is not None and not self.is_active():
+            self.stop()
+            return
+
+        magnitudes = self.analyzer.latest()
+        if magnitudes is None:
+            return
+        self.visualizer.update_spectrum(self.analyzer.frequencies[:self._bins], magnitudes[:self._bins])
+        self.visualizer.canvas.draw_idle()
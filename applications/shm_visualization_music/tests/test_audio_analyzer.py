@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+音频分析引擎测试
+验证分析缓存与频率检测结果
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_analyzer import AudioAnalyzer, ChordTracker
+from batch_analysis import analyze_batch
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """测试窗函数计划和频谱结果缓存"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.analyzer = AudioAnalyzer()
+        t = np.arange(44100) / 44100
+        self.audio = 0.5 * np.sin(2 * np.pi * 440 * t) + 0.5 * np.sin(2 * np.pi * 444 * t)
+
+    def test_repeated_analysis_reuses_spectrum(self):
+        """测试同一段音频重复分析时命中缓存"""
+        frequencies, magnitudes = self.analyzer.analyze_frequency_content(self.audio)
+        again = self.analyzer.analyze_frequency_content(self.audio.copy())
+        self.assertIs(again[1], magnitudes)
+        self.assertFalse(magnitudes.flags.writeable)
+        self.assertEqual(self.analyzer.cache_hits, 1)
+
+        # 内容改变后重新计算
+        changed = self.audio.copy()
+        changed[0] = 0.1
+        self.assertIsNot(self.analyzer.analyze_frequency_content(changed)[1], magnitudes)
+
+    def test_cached_matches_direct_fft(self):
+        """测试缓存结果与直接计算一致"""
+        _, magnitudes = self.analyzer.analyze_frequency_content(self.audio, window_type='blackman', zero_padding=2)
+        windowed = self.audio * np.blackman(len(self.audio))
+        expected = np.abs(np.fft.rfft(windowed, n=2 * len(self.audio))) * 2 / len(self.audio)
+        np.testing.assert_allclose(magnitudes, expected, atol=1e-10)
+
+
+class TestDominantFrequencies(unittest.TestCase):
+    """测试主频检测"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.analyzer = AudioAnalyzer()
+        self.t = np.arange(44100) / 44100
+
+    def test_resolves_beat_pair(self):
+        """测试相距4Hz的拍现象分量被分辨"""
+        audio = 0.5 * np.sin(2 * np.pi * 440 * self.t) + 0.5 * np.sin(2 * np.pi * 444 * self.t)
+        peaks = self.analyzer.find_dominant_frequencies(audio, num_peaks=2, min_freq_distance=1.0)
+        self.assertEqual(len(peaks), 2)
+        np.testing.assert_allclose(sorted(f for f, _ in peaks), [440, 444], atol=0.05)
+        np.testing.assert_allclose([a for _, a in peaks], [0.25, 0.25], rtol=0.02)
+
+    def test_zoom_resolves_close_partials(self):
+        """测试相距1Hz、主瓣重叠的分量经chirp-z放大后被分辨"""
+        t = np.arange(3 * 44100) / 44100
+        audio = 0.5 * np.sin(2 * np.pi * 440 * t) + 0.5 * np.sin(2 * np.pi * 441 * t)
+
+        zoom_calls = []
+        zoom_peaks = self.analyzer._zoom_peaks
+
+        def spy(*args, **kwargs):
+            zoom_calls.append(args)
+            return zoom_peaks(*args, **kwargs)
+
+        self.analyzer._zoom_peaks = spy
+        peaks = self.analyzer.find_dominant_frequencies(audio, num_peaks=2, min_freq_distance=0.5)
+        self.assertEqual(len(zoom_calls), 1)
+        self.assertEqual(len(peaks), 2)
+        np.testing.assert_allclose(sorted(f for f, _ in peaks), [440, 441], atol=0.05)
+        np.testing.assert_allclose([a for _, a in peaks], [0.25, 0.25], rtol=0.02)
+
+    def test_sub_bin_frequency(self):
+        """测试非整数频点的频率和幅度插值"""
+        audio = 0.3 * np.sin(2 * np.pi * 261.63 * self.t) + 0.1 * np.sin(2 * np.pi * 392.0 * self.t)
+        peaks = self.analyzer.find_dominant_frequencies(audio, num_peaks=5)
+        self.assertEqual(len(peaks), 2)
+        self.assertAlmostEqual(peaks[0][0], 261.63, delta=0.05)
+        self.assertAlmostEqual(peaks[0][1], 0.15, delta=0.005)
+
+    def test_decomposition_keeps_phase(self):
+        """测试分解结果保留分量的初始相位"""
+        audio = 0.5 * np.sin(2 * np.pi * 440 * self.t + 0.7) + 0.3 * np.sin(2 * np.pi * 660 * self.t - 2.0)
+        motion = self.analyzer.decompose_to_harmonics(audio, num_components=2)
+        phases = {round(o.params.frequency): o.params.phase for o in motion.oscillators}
+        self.assertAlmostEqual(phases[440], 0.7, places=3)
+        self.assertAlmostEqual(phases[660], -2.0, places=3)
+
+
+class TestNoteIndex(unittest.TestCase):
+    """测试音符索引查找"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.analyzer = AudioAnalyzer()
+
+    def test_vectorized_lookup(self):
+        """测试二维峰值数组的音符、MIDI编号和音分偏差"""
+        freqs = np.array([[27.5, 261.63, 4186.01], [445.0, 452.0, 0.0]])
+        names, midi, cents = self.analyzer.lookup_notes(freqs)
+        self.assertEqual(names.shape, freqs.shape)
+        self.assertEqual(names.tolist(), [['A0', 'C4', 'C8'], ['A4', '未知', '未知']])
+        self.assertEqual(midi.tolist(), [[21, 60, 108], [69, -1, -1]])
+        self.assertAlmostEqual(cents[1, 0], 1200 * np.log2(445 / 440))
+
+    def test_chord_across_octaves(self):
+        """测试跨八度的和弦按音级识别"""
+        t = np.arange(44100) / 44100
+        audio = sum(0.3 * np.sin(2 * np.pi * f * t) for f in (349.23, 440.0, 523.25))
+        self.assertEqual(self.analyzer.analyze_chord(audio), 'F大三和弦')
+
+
+class TestChordTracking(unittest.TestCase):
+    """测试逐帧和弦跟踪"""
+
+    def _chord(self, frequencies, duration):
+        t = np.arange(int(44100 * duration)) / 44100
+        return sum(0.3 * np.sin(2 * np.pi * f * t) for f in frequencies)
+
+    def test_progression_segments(self):
+        """测试和弦进行被划分为带时间戳的和弦段"""
+        audio = np.concatenate([
+            self._chord((261.63, 329.63, 392.0), 2.0),
+            np.zeros(44100),
+            self._chord((220.0, 261.63, 329.63), 1.5),
+            self._chord((392.0, 493.88, 587.33), 2.0),
+        ])
+        segments = AudioAnalyzer().track_chords(audio)
+        self.assertEqual([s['chord'] for s in segments], ['C大三和弦', '未识别和弦', 'A小三和弦', 'G大三和弦'])
+        np.testing.assert_allclose([s['start'] for s in segments], [0.0, 2.0, 3.0, 4.5], atol=0.1)
+        self.assertEqual(segments[-1]['end'], 6.5)
+        self.assertEqual(segments[2]['notes'], ['A', 'C', 'E'])
+
+    def test_hysteresis_ignores_short_changes(self):
+        """测试短于保持帧数的和弦变化并入当前段"""
+        tracker = ChordTracker(0.05, min_frames=4)
+        c_major = np.zeros(12)
+        c_major[[0, 4, 7]] = 1.0
+        a_minor = np.zeros(12)
+        a_minor[[9, 0, 4]] = 1.0
+        frames = np.array([c_major] * 10 + [a_minor] * 3 + [c_major] * 10 + [a_minor] * 6)
+        segments = tracker.push(frames) + tracker.finish()
+        self.assertEqual([s['chord'] for s in segments], ['C大三和弦', 'A小三和弦'])
+        self.assertAlmostEqual(segments[1]['start'], 23 * 0.05)
+
+    def test_segment_stats_cover_whole_segment(self):
+        """测试每段的统计只来自该段的帧，且覆盖段内全部帧"""
+        tracker = ChordTracker(0.05, min_frames=4)
+        noise = np.ones(12)  # 与任何三和弦模板的匹配度都只有0.5
+        c_major = np.zeros(12)
+        c_major[[0, 4, 7]] = 1.0
+        a_minor = np.zeros(12)
+        a_minor[[9, 0, 4]] = 1.0
+        frames = np.array([noise] * 2 + [c_major] * 4 + [a_minor] * 8)
+        segments = tracker.push(frames) + tracker.finish()
+
+        self.assertEqual([s['chord'] for s in segments], ['C大三和弦', 'A小三和弦'])
+        # 第一段从第0帧开始，稳定前的2帧计入平均匹配度
+        self.assertAlmostEqual(segments[0]['start'], 0.0)
+        self.assertAlmostEqual(segments[0]['confidence'], (2 * 0.5 + 4 * 1.0) / 6)
+        self.assertAlmostEqual(segments[1]['confidence'], 1.0)
+
+        # 整段未稳定时，统计同样覆盖全部帧
+        segments = tracker.push(np.array([noise] * 2 + [c_major] * 2)) + tracker.finish()
+        self.assertEqual(len(segments), 1)
+        self.assertAlmostEqual(segments[0]['confidence'], 0.75)
+
+
+class TestBatchAnalysis(unittest.TestCase):
+    """测试进程池批量分析"""
+
+    def test_batch_matches_single_analysis(self):
+        """测试批量结果与逐段分析一致"""
+        t = np.arange(44100) / 44100
+        chord = sum(0.3 * np.sin(2 * np.pi * f * t) for f in (261.63, 329.63, 392.0))
+        silence = np.zeros(4410)
+        table = analyze_batch([chord, silence], num_components=3, max_workers=2, names=['chord', 'silence'])
+
+        rows = table[table['source'] == 'chord']
+        expected = AudioAnalyzer().identify_musical_notes(chord, num_notes=3)
+        self.assertEqual(list(rows['note']), [note for note, _, _ in expected])
+        np.testing.assert_allclose(rows['frequency'], [freq for _, freq, _ in expected])
+        self.assertTrue(np.all(rows['chord'] == 'C大三和弦'))
+        self.assertEqual(table[table['source'] == 'silence']['component'][0], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
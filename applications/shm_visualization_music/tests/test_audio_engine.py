@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+音频引擎测试
+验证流式生成与整段生成结果一致
+"""
+
+import sys
+import os
+import time
+import threading
+import unittest
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_engine import AudioEngine, WaveformCache, AudioRingBuffer, ArraySource
+
+
+class TestToneStream(unittest.TestCase):
+    """测试流式振荡器"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.engine = AudioEngine()
+
+    def _drain(self, stream, block_size):
+        """读取流直到结束"""
+        blocks = []
+        while not stream.finished:
+            blocks.append(stream.read(block_size))
+        return np.concatenate(blocks)
+
+    def test_beat_matches_full_render(self):
+        """测试流式拍现象与整段生成一致（相位跨块连续）"""
+        full = self.engine.generate_beat(440, 444, duration=1.0)
+        streamed = self._drain(self.engine.stream_beat(440, 444, duration=1.0), 1024)
+        np.testing.assert_allclose(streamed[:len(full)], full, atol=1e-6)
+        self.assertFalse(np.any(streamed[len(full):]))
+
+    def test_odd_block_size(self):
+        """测试任意块大小下的相位连续性"""
+        full = self.engine.generate_sine_wave(261.63, 0.5, 0.5, phase=0.3)
+        streamed = self._drain(self.engine.stream_sine_wave(261.63, 0.5, 0.5, phase=0.3), 333)
+        np.testing.assert_allclose(streamed[:len(full)], full, atol=1e-6)
+
+    def test_infinite_stream_stop(self):
+        """测试无限长音调的参数修改与淡出停止"""
+        stream = self.engine.stream_chord(['C4', 'E4', 'G4'])
+        for _ in range(10):
+            stream.read(512)
+        stream.set_frequencies([440.0, 550.0, 660.0])
+        self.assertGreater(np.max(np.abs(stream.read(512))), 0.0)
+
+        stream.stop()
+        for _ in range(3):
+            block = stream.read(256)
+        self.assertTrue(stream.finished)
+        self.assertFalse(np.any(block))
+
+
+    def test_parameter_change_outside_callback(self):
+        """测试修改频率时在调用线程上准备基础块，读取音频块时不再访问周期表"""
+        stream = self.engine.stream_chord(['C4', 'E4', 'G4'])
+        stream.read(512)
+        stream.set_frequencies([440.0, 550.0, 660.0])
+
+        table = self.engine._period_table
+        base_count = len(table._bases)
+        phases = stream._phases.copy()
+        block = stream.read(512)
+        self.assertEqual(len(table._bases), base_count)
+        self.assertEqual(len(table._periods), 0)
+
+        # 与直接计算一致：以当前相位继续新频率
+        omega = 2 * np.pi * np.array([440.0, 550.0, 660.0]) / 44100
+        expected = stream._amplitudes @ np.sin(phases[:, None] + omega[:, None] * np.arange(512))
+        np.testing.assert_allclose(block, expected, atol=1e-6)
+
+    def test_set_frequencies_length(self):
+        """测试参数数量与分量数不一致时报错"""
+        stream = self.engine.stream_chord(['C4', 'E4', 'G4'])
+        with self.assertRaises(ValueError):
+            stream.set_frequencies([440.0, 550.0])
+        with self.assertRaises(ValueError):
+            stream.set_amplitudes([0.1])
+
+class TestWaveformCache(unittest.TestCase):
+    """测试LRU波形缓存"""
+
+    def test_byte_budget_eviction(self):
+        """测试按字节预算淘汰最久未使用的条目"""
+        cache = WaveformCache(max_bytes=3 * 8000)
+        for i in range(3):
+            cache.put(cache.make_key('sine', i), np.zeros(1000))
+        cache.get(cache.make_key('sine', 0))  # 0 变为最近使用
+        cache.put(cache.make_key('sine', 3), np.zeros(1000))
+
+        self.assertIn(cache.make_key('sine', 0), cache)
+        self.assertNotIn(cache.make_key('sine', 1), cache)
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], 3 * 8000)
+
+    def test_quantized_keys(self):
+        """测试浮点误差不会产生不同的键"""
+        cache = WaveformCache()
+        self.assertEqual(cache.make_key('sine', 0.1 + 0.2, 1.0), cache.make_key('sine', 0.3, 1))
+
+    def test_engine_read_only_views(self):
+        """测试引擎返回的只读视图与副本"""
+        engine = AudioEngine(cache_bytes=16 * 1024 * 1024)
+        first = engine.generate_beat(440, 444, duration=0.5)
+        view = engine.generate_beat(440, 444, duration=0.5, copy=False)
+        self.assertFalse(view.flags.writeable)
+        self.assertTrue(first.flags.writeable)
+        np.testing.assert_array_equal(first, view)
+
+        stats = engine.cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    """测试播放环形缓冲区"""
+
+    def test_wrap_around(self):
+        """测试跨越缓冲区末尾的读写"""
+        ring = AudioRingBuffer(8)
+        out = np.empty(5, dtype=np.float32)
+        ring.write(np.arange(6, dtype=np.float32))
+        self.assertEqual(ring.read_into(out), 5)
+        self.assertEqual(ring.write(np.arange(6, 20, dtype=np.float32)), 7)  # 只写入剩余空间
+        self.assertEqual(ring.read_into(out), 5)
+        np.testing.assert_array_equal(out, np.arange(5, 10))
+
+        # 数据不足时以静音填充
+        self.assertEqual(ring.read_into(out), 3)
+        np.testing.assert_array_equal(out, [10, 11, 12, 0, 0])
+
+    def test_discard_on_switch(self):
+        """测试切换音源时跳过未播放的旧数据"""
+        ring = AudioRingBuffer(16)
+        out = np.empty(4, dtype=np.float32)
+        ring.write(np.ones(10, dtype=np.float32))
+        ring.discard_before(ring.write_position)
+        ring.write(np.full(3, 2.0, dtype=np.float32))
+        self.assertEqual(ring.available(), 3)
+        self.assertEqual(ring.read_into(out), 3)
+        np.testing.assert_array_equal(out, [2, 2, 2, 0])
+
+    def test_array_source_loop(self):
+        """测试循环播放源按取模位置读取"""
+        source = ArraySource(np.arange(5), loop=True)
+        np.testing.assert_array_equal(source.read(12), [0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1])
+        source.loop = False
+        np.testing.assert_array_equal(source.read(12), [2, 3, 4])
+        self.assertTrue(source.finished)
+
+    def test_array_source_loop_reuses_block(self):
+        """测试循环读取可多次绕回，并复用同一个输出块"""
+        source = ArraySource(np.arange(3), loop=True)
+        first = source.read(8)
+        np.testing.assert_array_equal(first, [0, 1, 2, 0, 1, 2, 0, 1])
+        second = source.read(4)
+        np.testing.assert_array_equal(second, [2, 0, 1, 2])
+        self.assertTrue(np.shares_memory(first, second))
+        self.assertEqual(source.position, 0)
+
+
+class _StubOutput:
+    """记录挂接情况的输出流替身，不打开音频设备"""
+
+    def __init__(self):
+        self.callback = None
+        self.attach_count = 0
+
+    def attach(self, callback, on_replaced=None):
+        self.callback = callback
+        self.attach_count += 1
+
+    def detach(self, callback):
+        if self.callback == callback:
+            self.callback = None
+
+
+class TestPlaybackWorker(unittest.TestCase):
+    """测试供给线程的挂接与休眠"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.engine = AudioEngine()
+        self.engine.stream = _StubOutput()
+
+    def tearDown(self):
+        self.engine.cleanup()
+
+    def _wait_for(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return condition()
+
+    def test_replay_same_stream_after_stop(self):
+        """测试停止后重新播放同一个未结束的流时重新挂接回调"""
+        stub = self.engine.stream
+        stream = self.engine.create_tone_stream([440.0], [0.5], None)
+        self.engine.play_stream(stream)
+        self.assertTrue(self._wait_for(lambda: stub.callback is not None))
+
+        self.engine.stop_audio()
+        self.assertIsNone(stub.callback)
+        self.engine.play_stream(stream)
+        self.assertTrue(self._wait_for(lambda: stub.callback is not None))
+        self.assertEqual(stub.attach_count, 2)
+
+    def test_idle_worker_sleeps(self):
+        """测试没有播放源时供给线程阻塞等待，不再周期性唤醒"""
+        stub = self.engine.stream
+        self.engine.play_stream(self.engine.create_tone_stream([440.0], [0.5], None))
+        self.assertTrue(self._wait_for(lambda: stub.callback is not None))
+        self.engine.stop_audio()
+        time.sleep(0.05)
+
+        waits = []
+
+        class CountingEvent(threading.Event):
+            def wait(self, timeout=None):
+                waits.append(timeout)
+                return super().wait(timeout)
+
+        idle_event = self.engine._feed_event
+        self.engine._feed_event = CountingEvent()
+        time.sleep(0.1)
+        self.assertEqual(waits, [])
+
+        # 唤醒后再次空闲时不带超时地等待
+        idle_event.set()
+        self.assertTrue(self._wait_for(lambda: len(waits) > 0))
+        self.assertEqual(waits, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+简谐振动核心引擎测试
+验证向量化计算与逐点计算结果一致
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harmonic_core import (
+    HarmonicMotion, HarmonicParams, HarmonicType, SuperpositionMotion, HarmonicToAudioMapper,
+    OscillatorBank
+)
+
+
+class TestVectorizedEvaluation(unittest.TestCase):
+    """测试时间数组的向量化计算"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.t = np.linspace(0, 2, 200)
+        self.oscillators = [
+            HarmonicMotion(HarmonicType.SINGLE, HarmonicParams(1.0, 3.0, 0.2, 0.0)),
+            HarmonicMotion(HarmonicType.SINGLE, HarmonicParams(0.5, 5.0, 1.1, 0.8)),
+            HarmonicMotion(HarmonicType.SINGLE, HarmonicParams(0.3, 7.5, -0.4, 0.0)),
+        ]
+
+    def test_single_oscillator_matches_scalar(self):
+        """测试单个振子数组计算与标量计算一致（含阻尼）"""
+        for osc in self.oscillators:
+            for method in ('position', 'velocity', 'acceleration'):
+                vectorized = getattr(osc, method)(self.t)
+                pointwise = np.array([getattr(osc, method)(float(x)) for x in self.t])
+                self.assertEqual(vectorized.shape, self.t.shape)
+                np.testing.assert_allclose(vectorized, pointwise, atol=1e-9)
+
+    def test_superposition_matches_sum(self):
+        """测试叠加振动等于各分量之和"""
+        superposition = SuperpositionMotion(self.oscillators)
+        for method in ('position', 'velocity', 'acceleration'):
+            expected = sum(getattr(osc, method)(self.t) for osc in self.oscillators)
+            np.testing.assert_allclose(getattr(superposition, method)(self.t), expected, atol=1e-9)
+
+    def test_damped_position(self):
+        """测试阻尼振动的解析解"""
+        osc = self.oscillators[1]
+        expected = 0.5 * np.exp(-0.8 * self.t) * np.sin(2 * np.pi * 5.0 * self.t + 1.1)
+        np.testing.assert_allclose(osc.position(self.t), expected, atol=1e-12)
+
+    def test_scalar_input_returns_scalar(self):
+        """测试标量输入仍返回标量"""
+        superposition = SuperpositionMotion(self.oscillators)
+        self.assertIsInstance(superposition.position(0.25), float)
+        self.assertEqual(SuperpositionMotion().position(0.25), 0.0)
+
+    def test_harmonic_to_audio_length(self):
+        """测试音频生成长度与归一化"""
+        mapper = HarmonicToAudioMapper(sample_rate=8000)
+        chord = mapper.create_chord_motion(['C4', 'E4', 'G4'])
+        audio = mapper.harmonic_to_audio(chord, 2.0)
+        self.assertEqual(len(audio), 16000)
+        self.assertAlmostEqual(np.max(np.abs(audio)), 1.0, places=6)
+
+
+class TestOscillatorBank(unittest.TestCase):
+    """测试数组形式的振子组"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.t = np.linspace(0, 1, 500)
+        self.superposition = HarmonicToAudioMapper().create_harmonic_series_motion(110.0, num_harmonics=6)
+        self.superposition.oscillators[2].params.damping = 1.5
+
+    def test_matches_superposition(self):
+        """测试振子组与叠加振动计算结果一致"""
+        bank = self.superposition.to_bank()
+        self.assertEqual(len(bank), 6)
+        for method in ('position', 'velocity', 'acceleration'):
+            np.testing.assert_allclose(getattr(bank, method)(self.t),
+                                       getattr(self.superposition, method)(self.t), atol=1e-6)
+        self.assertAlmostEqual(bank.energy(), self.superposition.energy())
+
+    def test_enable_mask_and_remove(self):
+        """测试启用掩码和删除振子"""
+        bank = self.superposition.to_bank()
+        bank.set_enabled([0, 1], False)
+        expected = sum(osc.position(self.t) for osc in self.superposition.oscillators[2:])
+        np.testing.assert_allclose(bank.position(self.t), expected, atol=1e-9)
+
+        bank.remove([0, 1])
+        self.assertEqual(len(bank), 4)
+        self.assertTrue(bank.enabled.all())
+        np.testing.assert_allclose(bank.position(self.t), expected, atol=1e-9)
+
+    def test_batch_add_grows_capacity(self):
+        """测试批量添加数千个分量"""
+        bank = OscillatorBank(capacity=4)
+        indices = bank.add(np.full(3000, 1e-3), np.arange(1, 3001) * 10.0)
+        self.assertEqual(len(bank), 3000)
+        np.testing.assert_array_equal(indices, np.arange(3000))
+        self.assertEqual(bank.frequency.dtype, np.float64)
+        self.assertEqual(bank.position(np.linspace(0, 0.01, 64)).shape, (64,))
+
+    def test_dict_round_trip(self):
+        """测试与to_dict/from_dict互相转换"""
+        bank = self.superposition.to_bank()
+        bank.set_enabled(3, False)
+        restored = OscillatorBank.from_dict(bank.to_dict())
+        np.testing.assert_array_equal(restored.frequency, bank.frequency)
+        np.testing.assert_array_equal(restored.damping, bank.damping)
+        np.testing.assert_array_equal(restored.enabled, bank.enabled)
+
+        # 兼容HarmonicMotion.to_dict组成的列表
+        from_motion_dicts = OscillatorBank.from_dict([osc.to_dict() for osc in self.superposition.oscillators])
+        np.testing.assert_array_equal(from_motion_dicts.amplitude, bank.amplitude)
+
+        # 每个条目都能被HarmonicMotion.from_dict读取
+        motions = [HarmonicMotion.from_dict(entry) for entry in bank.to_dict()['oscillators']]
+        self.assertEqual(len(SuperpositionMotion.from_bank(bank).oscillators), 5)
+        self.assertEqual(len(motions), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
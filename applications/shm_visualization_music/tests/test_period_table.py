@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+周期表振荡器测试
+验证平铺与相位递推结果与直接计算一致
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# 添加applications目录，周期表位于共享的audio_common包中
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from audio_common import PeriodTable
+
+
+class TestPeriodTable(unittest.TestCase):
+    """测试周期表振荡器"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.table = PeriodTable(44100)
+
+    def _direct(self, frequencies, amplitudes, n_samples, phases):
+        """逐分量直接计算"""
+        n = np.arange(n_samples)
+        return sum(a * np.sin(2 * np.pi * f * n / 44100 + p)
+                   for f, a, p in zip(frequencies, amplitudes, phases))
+
+    def test_period_length(self):
+        """测试精确周期计算"""
+        self.assertEqual(self.table.period_length([440.0]), 2205)
+        self.assertEqual(self.table.period_length([440.0, 444.0]), 11025)
+        self.assertIsNone(self.table.period_length([261.63]))
+
+    def test_tiled_beat(self):
+        """测试拍现象平铺后与直接计算一致"""
+        audio = self.table.render([440.0, 444.0], [0.5, 0.5], 44100 * 5 + 17)
+        expected = self._direct([440.0, 444.0], [0.5, 0.5], len(audio), [0.0, 0.0])
+        np.testing.assert_allclose(audio, expected, atol=1e-9)
+        self.assertTrue(audio.flags.writeable)
+
+    def test_rotated_blocks(self):
+        """测试无短周期时逐块旋转与直接计算一致"""
+        frequencies = [261.63, 329.63, 392.0]
+        phases = [0.1, 0.2, 0.3]
+        audio = self.table.render(frequencies, [0.3, 0.3, 0.3], 30000, phases)
+        expected = self._direct(frequencies, [0.3, 0.3, 0.3], 30000, phases)
+        np.testing.assert_allclose(audio, expected, atol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+实时频谱分析测试
+验证流式STFT帧与整段分析结果一致
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spectrum_stream import StreamingSpectrumAnalyzer
+from audio_analyzer import AudioAnalyzer
+
+
+class TestStreamingSpectrumAnalyzer(unittest.TestCase):
+    """测试流式STFT分析器"""
+
+    def setUp(self):
+        """测试前准备"""
+        t = np.arange(44100) / 44100
+        self.audio = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        self.analyzer = StreamingSpectrumAnalyzer(44100, fft_size=4096, hop_size=1024)
+
+    def test_frame_count_independent_of_block_size(self):
+        """测试帧数只取决于跳跃长度，与输入块大小无关"""
+        frames = []
+        for start in range(0, len(self.audio), 700):
+            frames += self.analyzer.push(self.audio[start:start + 700])
+        self.assertEqual(len(frames), (len(self.audio) - 4096) // 1024 + 1)
+        self.assertEqual(self.analyzer.overlap, 0.75)
+
+    def test_matches_whole_buffer_analysis(self):
+        """测试每帧与对同一窗口做整段分析一致"""
+        frames = self.analyzer.push(self.audio)
+        start = (len(frames) - 1) * 1024
+        _, expected = AudioAnalyzer(44100).analyze_frequency_content(self.audio[start:start + 4096])
+        np.testing.assert_allclose(frames[-1], expected, atol=1e-4)
+        self.assertAlmostEqual(self.analyzer.frequencies[np.argmax(frames[-1])], 440, delta=11)
+
+    def test_latest_requires_full_window(self):
+        """测试样本不足一帧时不输出频谱"""
+        self.analyzer.write(self.audio[:1000])
+        self.assertIsNone(self.analyzer.latest())
+        self.analyzer.write(self.audio[1000:5000])
+        self.assertEqual(len(self.analyzer.latest()), 2049)
+
+
+if __name__ == "__main__":
+    unittest.main()